@@ -12,7 +12,43 @@ class Settings(BaseSettings):
     bearer_token: str
     
     # Storage
+    storage_backend: str = "json"  # "json", "partitioned", "jsonl" or "sqlite"
     storage_file: str = "tasks.json"
+    jsonl_storage_file: str = "tasks.jsonl"
+    sqlite_storage_file: str = "tasks.db"
+    storage_compact_json: bool = False        # JSON stores without indentation (smaller, faster)
+    partition_hot_months: int = 2             # months kept uncompressed by the partitioned backend
+    compaction_dead_ratio: float = 0.3        # compact once this share of records is dead
+    compaction_interval_seconds: int = 60     # how often the background check runs (0 disables)
+    
+    # LLM
+    transcript_compaction: bool = True        # strip fillers, disfluencies and boilerplate before extraction
+    extraction_backend: str = "llm"          # "llm", or "rules" for the offline rule engine only
+    llm_fast_path_chars: int = 0              # notes up to this length skip OpenAI for the rule engine (0 disables)
+    llm_rule_fallback: bool = True            # use the rule engine while the OpenAI circuit breaker is open
+    llm_timeout_seconds: float = 45.0         # per call, and for extraction + summary together
+    llm_combined_mode: bool = False           # one completion for tasks + summary instead of two
+    llm_chunk_chars: int = 12000              # longer transcripts are extracted in chunks (0 disables)
+    llm_chunk_overlap_chars: int = 800        # context repeated at the start of the next chunk
+    llm_chunk_concurrency: int = 4            # chunk extraction calls in flight per note
+    openai_requests_per_minute: int = 500     # client-side request budget per worker (0 disables)
+    openai_tokens_per_minute: int = 200000    # estimated prompt + completion tokens per worker (0 disables)
+    llm_max_concurrency: int = 8              # OpenAI calls in flight per worker
+    llm_max_retries: int = 4                  # retries for 429s, 5xx, timeouts and dropped connections
+    llm_backoff_base_seconds: float = 1.0     # first backoff ceiling, doubled per retry (jittered)
+    llm_backoff_max_seconds: float = 30.0     # cap on any backoff, Retry-After included
+    llm_breaker_threshold: int = 5            # consecutive failures that open the circuit breaker (0 disables)
+    llm_breaker_reset_seconds: float = 30.0   # how long the open breaker fails calls fast
+    llm_cache_size: int = 256                 # validated LLM responses kept in memory (0 disables)
+    llm_cache_ttl_seconds: int = 604800       # cached responses expire after this long (0 = never)
+    llm_cache_file: str = ""                  # JSONL file persisting the cache across restarts (empty = memory only)
+    
+    # Idempotency
+    idempotency_cache_size: int = 1024        # processed notes remembered per worker (0 disables replays)
+    idempotency_ttl_seconds: int = 86400      # how long a processed note is answered from memory
+    
+    # Read endpoints
+    response_cache_size: int = 128            # encoded responses kept for polling clients (0 disables)
     
     # Optional
     environment: str = "production"
@@ -2,35 +2,98 @@
 Main FastAPI application with ALL FEATURES enabled.
 Includes both detailed endpoint and SpeakSpace-compatible endpoint.
 """
-from fastapi import FastAPI, Depends, HTTPException, status
-from fastapi.responses import JSONResponse
-from app.models import SpeakSpaceRequest, APIResponse, TaskListResponse, EnhancedTask
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, status
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple
+from itertools import islice
+from contextlib import asynccontextmanager, contextmanager
+import asyncio
+import time
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from urllib.parse import urlencode
+from app.models import SpeakSpaceRequest, APIResponse, TaskListResponse, EnhancedTask, ExtractedTask, MeetingSummary
 from app.auth import verify_token
-from app.services.llm_extractor import LLMExtractor
+from app.services.llm_extractor import LLMExtractor, track_degraded
+from app.services.llm_scheduler import LLMUnavailableError
 from app.services.validator import TaskValidator
-from app.services.json_storage import JSONStorage
+from app.services.storage_factory import create_storage
+from app.services.task_importer import TaskImporter
+from app.services.transcript_compactor import CompactionReport, TranscriptCompactor
 from app.services.priority_intelligence import PriorityIntelligenceEngine
 from app.services.owner_mapper import OwnerMapper
 from app.services.deadline_predictor import DeadlinePredictor
 from app.services.task_analyzer import TaskAnalyzer
 from app.utils.helpers import format_task_timeline, generate_instant_preview
 from app.config import get_settings
+from app.utils import codec
+from app.utils.responses import CodecJSONResponse
+from app.utils.response_cache import ResponseCache, etag_matches, make_etag
+from app.utils.idempotency import IdempotencyCache, idempotency_key
+
+async def compaction_loop():
+    """Periodically drop deleted records once enough of the store is dead."""
+    while True:
+        await asyncio.sleep(settings.compaction_interval_seconds)
+        try:
+            await asyncio.to_thread(json_storage.maybe_compact, settings.compaction_dead_ratio)
+        except Exception as e:
+            print(f"[STORAGE] ⚠️ Background compaction failed: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    compactor = None
+    if settings.compaction_interval_seconds > 0:
+        compactor = asyncio.create_task(compaction_loop())
+    yield
+    if compactor:
+        compactor.cancel()
 
 app = FastAPI(
     title="Voice Meeting Executor - Full Featured",
     description="AI-powered meeting task extractor with advanced features",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan,
+    default_response_class=CodecJSONResponse
 )
 
 # Initialize all services
 settings = get_settings()
 llm_extractor = LLMExtractor()
 validator = TaskValidator()
-json_storage = JSONStorage(settings.storage_file)
+json_storage = create_storage(settings)
 pie = PriorityIntelligenceEngine()
 owner_mapper = OwnerMapper()
 deadline_predictor = DeadlinePredictor()
 task_analyzer = TaskAnalyzer()
+response_cache = ResponseCache(settings.response_cache_size)
+processed_notes = IdempotencyCache(
+    settings.idempotency_cache_size,
+    settings.idempotency_ttl_seconds,
+    keep=lambda result: result.complete
+)
+transcript_compactor = TranscriptCompactor(settings.transcript_compaction)
+
+def conditional_response(request: Request, build: Callable[[], Any]) -> Response:
+    """
+    Serve a read endpoint with an ETag derived from the storage version.
+    A matching If-None-Match gets 304 without touching the data; otherwise
+    the encoded body comes from the response cache, and `build` only runs
+    on a miss.
+    """
+    version = json_storage.version
+    query = urlencode(sorted(request.query_params.multi_items()))
+    etag = make_etag(version, request.url.path, query)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        response_cache.record_not_modified()
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    body = response_cache.get_or_build(
+        (request.url.path, query, version),
+        lambda: codec.dumps(jsonable_encoder(build()))
+    )
+    return Response(content=body, media_type="application/json", headers=headers)
 
 @app.get("/")
 async def root():
@@ -51,10 +114,11 @@ async def root():
             "Meeting Summary Generator",
             "Task Timeline Visualizer"
         ],
-        "storage": "JSON",
+        "storage": json_storage.storage_type,
         "tasks_stored": json_storage.get_task_count(),
         "endpoints": {
             "detailed": "/process",
+            "streaming": "/process/stream",
             "speakspace": "/speakspace/process"
         }
     }
@@ -68,12 +132,205 @@ async def health_check():
         "status": "healthy",
         "environment": settings.environment,
         "openai_configured": bool(settings.openai_api_key),
-        "storage_type": "JSON",
-        "storage_file": settings.storage_file,
+        "storage_type": json_storage.storage_type,
+        "storage_file": str(json_storage.file_path),
         "tasks_count": json_storage.get_task_count(),
+        "compaction": json_storage.compaction_stats(),
+        "response_cache": response_cache.stats(),
+        "llm": llm_extractor.stats(),
+        "idempotency": processed_notes.stats(),
+        "transcript_compaction": transcript_compactor.stats(),
         "analytics": analytics
     }
 
+class PipelineResult(NamedTuple):
+    """Outcome of processing one meeting note."""
+    tasks: List[EnhancedTask]
+    summary: MeetingSummary
+    stored: int
+    failed: int
+    compaction: Optional[CompactionReport] = None
+    degraded: Tuple[str, ...] = ()  # extraction steps that fell back after an error
+    
+    @property
+    def complete(self) -> bool:
+        """
+        Safe to replay: no extraction step degraded and the batch write went
+        through. Batch writes are all or nothing, so failures alongside
+        stored tasks are rejected records, which a rerun would reject again
+        while storing the rest twice.
+        """
+        return not self.degraded and (self.stored > 0 or not self.failed)
+
+def enhance_task(task: ExtractedTask, validated_tasks: List[ExtractedTask], timestamp: str) -> EnhancedTask:
+    """Apply all advanced features to one validated task."""
+    # Priority Intelligence Engine
+    priority, _, confidence = pie.analyze_priority(
+        task.task_name, task.due_date, task.owner, task.priority
+    )
+    
+    # Smart Owner Mapping
+    _, mapped_owner = owner_mapper.map_owner(task.owner)
+    
+    # Deadline Prediction
+    normalized_date, predicted_date, _ = deadline_predictor.predict_deadline(
+        task.due_date, timestamp
+    )
+    
+    # Task Analysis
+    difficulty = task_analyzer.estimate_difficulty(task.task_name)
+    category = task_analyzer.classify_category(task.task_name)
+    has_dependency, dependency_info = task_analyzer.detect_dependency(
+        task.task_name, validated_tasks
+    )
+    risk_level, risk_desc = task_analyzer.assess_risk(
+        task.task_name, task.due_date, task.owner
+    )
+    progress = task_analyzer.estimate_progress(task.task_name)
+    
+    return EnhancedTask(
+        task_name=task.task_name,
+        owner=mapped_owner,
+        due_date=normalized_date,
+        priority=priority,
+        confidence_score=confidence,
+        difficulty=difficulty,
+        category=category,
+        predicted_deadline=predicted_date,
+        has_dependency=has_dependency,
+        dependency_info=dependency_info,
+        risk_level=risk_level,
+        risk_description=risk_desc,
+        progress_estimate=progress
+    )
+
+@contextmanager
+def llm_errors(tag: str):
+    """Turn LLM timeouts into 504 and an unavailable provider into 503."""
+    try:
+        yield
+    except asyncio.TimeoutError:
+        print(f"[{tag}] ⏱️ LLM calls timed out after {settings.llm_timeout_seconds}s")
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=f"LLM extraction timed out after {settings.llm_timeout_seconds}s"
+        )
+    except LLMUnavailableError as e:
+        print(f"[{tag}] 🚦 {e}")
+        headers = {"Retry-After": str(max(1, round(e.retry_after)))} if e.retry_after else None
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="LLM provider is rate limiting or unavailable; retry later",
+            headers=headers
+        )
+
+def compact_prompt(request: SpeakSpaceRequest, tag: str) -> Tuple[str, CompactionReport]:
+    """The note with fillers, disfluencies and boilerplate removed, and what that saved."""
+    prompt, report = transcript_compactor.run(
+        request.prompt, calls_per_note=1 if settings.llm_combined_mode else 2
+    )
+    print(
+        f"[{tag}] ✂️ Transcript compacted {report.tokens_before} → {report.tokens_after} tokens "
+        f"in {report.compaction_ms}ms (~{report.est_latency_saved_ms}ms LLM time saved)"
+    )
+    return prompt, report
+
+async def store_tasks(tasks: List[EnhancedTask], note_id: str, tag: str) -> tuple:
+    """One batch write in a worker thread; returns (successful, failed)."""
+    successful, failed = await asyncio.to_thread(json_storage.create_tasks_batch, tasks, note_id)
+    print(f"[{tag}] 💾 Stored {successful} tasks, {failed} failed")
+    return successful, failed
+
+async def run_pipeline(request: SpeakSpaceRequest, tag: str) -> PipelineResult:
+    """
+    Shared pipeline behind /process and /speakspace/process.
+    Extraction and summary run concurrently on the async client and the
+    batch write runs in a worker thread, so the event loop keeps serving
+    other requests while a note is in flight.
+    """
+    started = time.perf_counter()
+    prompt, compaction = compact_prompt(request, tag)
+    with llm_errors(tag), track_degraded() as degraded:
+        raw_tasks, meeting_summary = await llm_extractor.extract_and_summarize(prompt)
+    degraded = tuple(degraded)
+    print(f"[{tag}] 🤖 Extracted {len(raw_tasks)} raw tasks and summary in {time.perf_counter() - started:.2f}s")
+    
+    validated_tasks = validator.validate_and_filter(raw_tasks)
+    print(f"[{tag}] 🧹 {len(validated_tasks)} tasks passed validation")
+    if not validated_tasks:
+        return PipelineResult([], meeting_summary, 0, 0, compaction, degraded)
+    
+    enhanced_tasks = [
+        enhance_task(task, validated_tasks, request.timestamp)
+        for task in validated_tasks
+    ]
+    print(f"[{tag}] 🚀 Enhanced all {len(enhanced_tasks)} tasks")
+    
+    successful, failed = await store_tasks(enhanced_tasks, request.note_id, tag)
+    return PipelineResult(enhanced_tasks, meeting_summary, successful, failed, compaction, degraded)
+
+async def run_streaming_pipeline(
+    request: SpeakSpaceRequest,
+    tag: str,
+    on_task: Callable[[EnhancedTask], None]
+) -> PipelineResult:
+    """
+    run_pipeline() on a streamed extraction: each task is validated,
+    enhanced and handed to `on_task` as soon as it arrives. The tasks are
+    still stored in one batch at the end.
+    """
+    started = time.perf_counter()
+    prompt, compaction = compact_prompt(request, tag)
+    deadline = time.monotonic() + llm_extractor.timeout_for(llm_extractor.chunk(prompt))
+    items = llm_extractor.stream_extract_and_summarize(prompt, deadline)
+    validated_tasks: List[ExtractedTask] = []
+    enhanced_tasks: List[EnhancedTask] = []
+    meeting_summary = None
+    try:
+        with llm_errors(tag), track_degraded() as degraded:
+            while True:
+                try:
+                    item = await asyncio.wait_for(items.__anext__(), deadline - time.monotonic())
+                except StopAsyncIteration:
+                    break
+                if isinstance(item, MeetingSummary):
+                    meeting_summary = item
+                    continue
+                if not validator.is_valid_task(item):
+                    continue
+                task = validator.validate_task(item)
+                if validator.check_duplicate(task, validated_tasks):
+                    continue
+                validated_tasks.append(task)
+                enhanced_tasks.append(enhance_task(task, validated_tasks, request.timestamp))
+                if len(enhanced_tasks) == 1:
+                    print(f"[{tag}] ⚡ First task ready after {time.perf_counter() - started:.2f}s")
+                on_task(enhanced_tasks[-1])
+    finally:
+        await items.aclose()
+    print(f"[{tag}] 🤖 Streamed {len(enhanced_tasks)} tasks and summary in {time.perf_counter() - started:.2f}s")
+    degraded = tuple(degraded)
+    
+    if not enhanced_tasks:
+        return PipelineResult([], meeting_summary, 0, 0, compaction, degraded)
+    successful, failed = await store_tasks(enhanced_tasks, request.note_id, tag)
+    return PipelineResult(enhanced_tasks, meeting_summary, successful, failed, compaction, degraded)
+
+def sse_event(event: str, data: Any) -> bytes:
+    return f"event: {event}\ndata: ".encode("utf-8") + codec.dumps(jsonable_encoder(data)) + b"\n\n"
+
+async def process_note_once(request: SpeakSpaceRequest, tag: str) -> PipelineResult:
+    """
+    run_pipeline() at most once per note_id and content.
+    A retried note gets the stored result back instead of duplicating its
+    tasks, and concurrent requests for the same note wait on one run.
+    """
+    key = idempotency_key(request.note_id, request.prompt)
+    result, reused = await processed_notes.run(key, lambda: run_pipeline(request, tag))
+    if reused:
+        print(f"[{tag}] ♻️ Note {request.note_id} already processed, returning the stored result")
+    return result
+
 @app.post("/process", response_model=APIResponse)
 async def process_meeting_note(
     request: SpeakSpaceRequest,
@@ -94,19 +351,9 @@ async def process_meeting_note(
         print(f"⏰ Timestamp: {request.timestamp}")
         print(f"{'='*70}\n")
         
-        # STEP 1: Extract tasks with LLM
-        print("🤖 STEP 1: LLM Task Extraction")
-        print("-" * 70)
-        raw_tasks = llm_extractor.extract_tasks(request.prompt)
-        print(f"✓ Extracted {len(raw_tasks)} raw tasks\n")
-        
-        # STEP 2: Validate and clean
-        print("🧹 STEP 2: Validation & Cleanup")
-        print("-" * 70)
-        validated_tasks = validator.validate_and_filter(raw_tasks)
-        print(f"✓ {len(validated_tasks)} tasks passed validation\n")
+        result = await process_note_once(request, "PROCESS")
         
-        if not validated_tasks:
+        if not result.tasks:
             print("⚠️  No actionable tasks found\n")
             return APIResponse(
                 status="success",
@@ -114,101 +361,30 @@ async def process_meeting_note(
                 tasks_created=0
             )
         
-        # STEP 3: Generate meeting summary
-        print("📊 STEP 3: Meeting Summary Generation")
-        print("-" * 70)
-        meeting_summary = llm_extractor.generate_meeting_summary(request.prompt)
-        print(f"✓ Generated summary with {len(meeting_summary.key_decisions)} decisions\n")
-        
-        # STEP 4: Apply all advanced features
-        print("🚀 STEP 4: Applying Advanced Features")
-        print("-" * 70)
-        
-        enhanced_tasks = []
-        for task in validated_tasks:
-            print(f"\n  Processing: {task.task_name[:50]}...")
-            
-            # Priority Intelligence Engine
-            priority, priority_reason, confidence = pie.analyze_priority(
-                task.task_name, task.due_date, task.owner, task.priority
-            )
-            
-            # Smart Owner Mapping
-            original_owner, mapped_owner = owner_mapper.map_owner(task.owner)
-            
-            # Deadline Prediction
-            normalized_date, predicted_date, is_uncertain = deadline_predictor.predict_deadline(
-                task.due_date, request.timestamp
-            )
-            
-            # Task Analysis
-            difficulty = task_analyzer.estimate_difficulty(task.task_name)
-            category = task_analyzer.classify_category(task.task_name)
-            has_dependency, dependency_info = task_analyzer.detect_dependency(
-                task.task_name, validated_tasks
-            )
-            risk_level, risk_desc = task_analyzer.assess_risk(
-                task.task_name, task.due_date, task.owner
-            )
-            progress = task_analyzer.estimate_progress(task.task_name)
-            
-            # Create enhanced task
-            enhanced_task = EnhancedTask(
-                task_name=task.task_name,
-                owner=mapped_owner,
-                due_date=normalized_date,
-                priority=priority,
-                confidence_score=confidence,
-                difficulty=difficulty,
-                category=category,
-                predicted_deadline=predicted_date,
-                has_dependency=has_dependency,
-                dependency_info=dependency_info,
-                risk_level=risk_level,
-                risk_description=risk_desc,
-                progress_estimate=progress
-            )
-            
-            enhanced_tasks.append(enhanced_task)
-            print(f"  ✓ Enhanced: {priority} priority, {difficulty} difficulty, {category} category")
-        
-        print(f"\n✓ Enhanced all {len(enhanced_tasks)} tasks\n")
-        
-        # STEP 5: Store tasks
-        print("💾 STEP 5: Storing Tasks")
-        print("-" * 70)
-        successful, failed = json_storage.create_tasks_batch(
-            enhanced_tasks, 
-            request.note_id
-        )
-        print(f"✓ Stored {successful} tasks, {failed} failed\n")
-        
-        # STEP 6: Generate response
-        print("📤 STEP 6: Generating Response")
-        print("-" * 70)
-        
         # Create instant preview
-        preview = generate_instant_preview(enhanced_tasks)
+        preview = generate_instant_preview(result.tasks)
         
         # Get analytics
         analytics = json_storage.get_analytics()
         
         summary_data = {
-            "meeting_summary": meeting_summary.summary,
-            "key_decisions": meeting_summary.key_decisions,
-            "blockers": meeting_summary.blockers,
-            "risks": meeting_summary.risks,
-            "participants": meeting_summary.participants,
+            "meeting_summary": result.summary.summary,
+            "key_decisions": result.summary.key_decisions,
+            "blockers": result.summary.blockers,
+            "risks": result.summary.risks,
+            "participants": result.summary.participants,
             "tasks_preview": preview,
             "high_priority_count": analytics["by_priority"].get("High", 0),
             "high_risk_count": analytics["high_risk_count"],
-            "dependencies_count": analytics["with_dependencies"]
+            "dependencies_count": analytics["with_dependencies"],
+            "transcript_compaction": result.compaction.as_dict() if result.compaction else None
         }
         
         print(f"{'='*70}")
         print(f"✅ PROCESSING COMPLETE")
         print(f"{'='*70}\n")
         
+        successful = result.stored
         return APIResponse(
             status="success",
             message=f"✅ {successful} task{'s' if successful != 1 else ''} created successfully with advanced analysis",
@@ -257,67 +433,22 @@ async def process_for_speakspace(
         print(f"📏 Text length: {len(request.prompt)} characters")
         print(f"{'='*70}\n")
         
-        # STEP 1: Extract tasks
-        raw_tasks = llm_extractor.extract_tasks(request.prompt)
-        print(f"[SPEAKSPACE] Extracted {len(raw_tasks)} raw tasks")
+        result = await process_note_once(request, "SPEAKSPACE")
         
-        # STEP 2: Validate
-        validated_tasks = validator.validate_and_filter(raw_tasks)
-        print(f"[SPEAKSPACE] {len(validated_tasks)} tasks validated")
-        
-        if not validated_tasks:
+        if not result.tasks:
             print(f"[SPEAKSPACE] No actionable tasks found\n")
             return {
                 "status": "success",
                 "message": "No actionable tasks found in the meeting note"
             }
         
-        # STEP 3: Generate meeting summary
-        meeting_summary = llm_extractor.generate_meeting_summary(request.prompt)
-        
-        # STEP 4: Enhance all tasks
-        enhanced_tasks = []
-        for task in validated_tasks:
-            # Apply all features
-            priority, _, confidence = pie.analyze_priority(
-                task.task_name, task.due_date, task.owner, task.priority
-            )
-            _, mapped_owner = owner_mapper.map_owner(task.owner)
-            normalized_date, predicted_date, _ = deadline_predictor.predict_deadline(
-                task.due_date, request.timestamp
-            )
-            difficulty = task_analyzer.estimate_difficulty(task.task_name)
-            category = task_analyzer.classify_category(task.task_name)
-            has_dep, dep_info = task_analyzer.detect_dependency(task.task_name, validated_tasks)
-            risk_level, risk_desc = task_analyzer.assess_risk(task.task_name, task.due_date, task.owner)
-            progress = task_analyzer.estimate_progress(task.task_name)
-            
-            enhanced_tasks.append(EnhancedTask(
-                task_name=task.task_name,
-                owner=mapped_owner,
-                due_date=normalized_date,
-                priority=priority,
-                confidence_score=confidence,
-                difficulty=difficulty,
-                category=category,
-                predicted_deadline=predicted_date,
-                has_dependency=has_dep,
-                dependency_info=dep_info,
-                risk_level=risk_level,
-                risk_description=risk_desc,
-                progress_estimate=progress
-            ))
-        
-        # STEP 5: Store tasks
-        successful, failed = json_storage.create_tasks_batch(enhanced_tasks, request.note_id)
-        print(f"[SPEAKSPACE] Stored {successful} tasks, {failed} failed")
-        
         print(f"{'='*70}")
         print(f"✅ SPEAKSPACE PROCESSING COMPLETE")
         print(f"{'='*70}\n")
         
-        # STEP 6: Return SIMPLE response (SpeakSpace requirement)
+        # Return SIMPLE response (SpeakSpace requirement)
         # Do NOT return large payloads - only status and message
+        successful = result.stored
         return {
             "status": "success",
             "message": f"{successful} task{'s' if successful != 1 else ''} created successfully"
@@ -333,19 +464,130 @@ async def process_for_speakspace(
             detail=f"Failed to process meeting note: {str(e)}"
         )
 
+@app.post("/process/stream")
+async def process_meeting_note_stream(
+    request: SpeakSpaceRequest,
+    token: str = Depends(verify_token)
+):
+    """
+    /process as Server-Sent Events: each enhanced task is pushed as soon
+    as the streamed extraction has produced and enriched it.
+    
+    Events:
+      task     one EnhancedTask
+      summary  the MeetingSummary
+      done     {"tasks_created", "failed", "replayed", "transcript_compaction"}
+      error    {"status_code", "detail"}, in place of summary/done
+    
+    Shares idempotency with /process: a note already processed (or in
+    flight) is replayed from the stored result, all tasks at once.
+    """
+    print(f"\n[STREAM] 📝 Note {request.note_id}, {len(request.prompt)} characters")
+    queue: asyncio.Queue = asyncio.Queue()
+    key = idempotency_key(request.note_id, request.prompt)
+    run = asyncio.ensure_future(
+        processed_notes.run(key, lambda: run_streaming_pipeline(request, "STREAM", queue.put_nowait))
+    )
+    
+    def finished(future: asyncio.Future):
+        if not future.cancelled():
+            future.exception()  # reported as an event; don't warn if the client left
+        queue.put_nowait(None)
+    
+    run.add_done_callback(finished)
+    
+    async def events():
+        while (task := await queue.get()) is not None:
+            yield sse_event("task", task)
+        try:
+            result, reused = run.result()
+        except HTTPException as e:
+            yield sse_event("error", {"status_code": e.status_code, "detail": e.detail})
+            return
+        except Exception as e:
+            print(f"[STREAM] ❌ Error: {e}\n")
+            yield sse_event("error", {"status_code": 500, "detail": f"Failed to process meeting note: {str(e)}"})
+            return
+        if reused:
+            print(f"[STREAM] ♻️ Note {request.note_id} already processed, replaying the stored result")
+            for task in result.tasks:
+                yield sse_event("task", task)
+        yield sse_event("summary", result.summary)
+        yield sse_event("done", {
+            "tasks_created": result.stored,
+            "failed": result.failed,
+            "replayed": reused,
+            "transcript_compaction": result.compaction.as_dict() if result.compaction else None
+        })
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.get("/tasks", response_model=TaskListResponse)
-async def view_tasks(token: str = Depends(verify_token)):
-    """View all stored tasks with analytics."""
+async def view_tasks(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    after_id: Optional[int] = None,
+    include_analytics: bool = True,
+    owner: Optional[str] = None,
+    priority: Optional[str] = None,
+    category: Optional[str] = None,
+    risk_level: Optional[str] = None,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    note_id: Optional[str] = None,
+    token: str = Depends(verify_token)
+):
+    """
+    View stored tasks (newest first) with analytics.
+    Optional filters (e.g. ?owner=Riya Kumar&priority=High) are combined
+    with AND and answered from the storage indexes.
+    
+    Pagination: pass ?limit=N, then follow `next_after_id` as ?after_id=...
+    Send `Accept: application/x-ndjson` to stream one task per line instead.
+    Use ?include_analytics=false to skip the analytics block.
+    Responses carry an ETag; polls with a matching If-None-Match get 304.
+    """
     try:
-        tasks = json_storage.get_all_tasks()
-        analytics = json_storage.get_analytics()
-        
-        return TaskListResponse(
-            status="success",
-            count=len(tasks),
-            tasks=tasks,
-            analytics=analytics
+        records = json_storage.iter_tasks(
+            after_id=after_id,
+            owner=owner,
+            priority=priority,
+            category=category,
+            risk_level=risk_level,
+            status=status_filter,
+            note_id=note_id
         )
+        
+        if "application/x-ndjson" in request.headers.get("accept", ""):
+            if limit:
+                records = islice(records, limit)
+            return StreamingResponse(
+                (codec.dumps(record) + b"\n" for record in records),
+                media_type="application/x-ndjson"
+            )
+        
+        def build_page() -> TaskListResponse:
+            next_after_id = None
+            if limit:
+                page = list(islice(records, limit + 1))
+                if len(page) > limit:
+                    page = page[:limit]
+                    next_after_id = page[-1]["id"]
+            else:
+                page = list(records)
+            
+            return TaskListResponse(
+                status="success",
+                count=len(page),
+                tasks=page,
+                analytics=json_storage.get_analytics() if include_analytics else None,
+                next_after_id=next_after_id
+            )
+        
+        return conditional_response(request, build_page)
     except Exception as e:
         print(f"[ERROR] Failed to retrieve tasks: {e}")
         raise HTTPException(
@@ -353,6 +595,41 @@ async def view_tasks(token: str = Depends(verify_token)):
             detail="Failed to retrieve tasks"
         )
 
+@app.post("/tasks/import")
+async def import_tasks(
+    request: Request,
+    batch_size: int = Query(5000, ge=1, le=100000),
+    token: str = Depends(verify_token)
+):
+    """
+    Bulk import historical tasks.
+    FEATURE: Backfill
+    Send the file as the raw request body: JSONL (one task per line) or a
+    JSON array of stored-task objects. It is parsed as it streams in, each
+    row is validated against StoredTask, and valid rows are written in
+    batches of `batch_size`. Ids are reassigned.
+    """
+    importer = TaskImporter(json_storage, batch_size)
+    try:
+        async for chunk in request.stream():
+            for batch in await asyncio.to_thread(importer.feed, chunk):
+                await asyncio.to_thread(importer.write, batch)
+        for batch in await asyncio.to_thread(importer.finish):
+            await asyncio.to_thread(importer.write, batch)
+    except Exception as e:
+        print(f"[IMPORT] ❌ Import aborted: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Import aborted after {importer.imported} tasks: {str(e)}"
+        )
+    
+    report = importer.report()
+    print(f"[IMPORT] ✅ {report['imported']} imported, {report['rejected']} rejected ({report['rows_per_second']} rows/s)")
+    return {
+        "status": "success" if not report["rejected"] else "completed_with_errors",
+        **report
+    }
+
 @app.get("/tasks/{note_id}")
 async def view_tasks_by_note(note_id: str, token: str = Depends(verify_token)):
     """View tasks from a specific note."""
@@ -372,19 +649,29 @@ async def view_tasks_by_note(note_id: str, token: str = Depends(verify_token)):
         )
 
 @app.get("/timeline")
-async def view_timeline(token: str = Depends(verify_token)):
+async def view_timeline(
+    request: Request,
+    from_date: Optional[str] = Query(None, alias="from", pattern=r"^\d{4}-\d{2}-\d{2}$"),
+    to_date: Optional[str] = Query(None, alias="to", pattern=r"^\d{4}-\d{2}-\d{2}$"),
+    owner: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    token: str = Depends(verify_token)
+):
     """
     View task timeline.
     FEATURE: Task Timeline Visualizer
+    Optional ?from=YYYY-MM-DD&to=YYYY-MM-DD (inclusive), ?owner= and ?limit=.
+    Answered from the storage deadline index in deadline order.
     """
     try:
-        tasks = json_storage.get_all_tasks()
-        timeline = format_task_timeline(tasks)
+        def build_timeline() -> dict:
+            tasks = json_storage.get_timeline(from_date, to_date, owner, limit)
+            return {
+                "status": "success",
+                **format_task_timeline(tasks)
+            }
         
-        return {
-            "status": "success",
-            **timeline
-        }
+        return conditional_response(request, build_timeline)
     except Exception as e:
         print(f"[ERROR] Failed to generate timeline: {e}")
         raise HTTPException(
@@ -393,15 +680,24 @@ async def view_timeline(token: str = Depends(verify_token)):
         )
 
 @app.get("/analytics")
-async def view_analytics(token: str = Depends(verify_token)):
-    """View detailed analytics."""
+async def view_analytics(request: Request, verify: bool = False, token: str = Depends(verify_token)):
+    """
+    View detailed analytics.
+    Pass ?verify=true to recount from scratch and diff against the running counters
+    (never served from cache).
+    """
     try:
-        analytics = json_storage.get_analytics()
+        if not verify:
+            return conditional_response(request, lambda: {
+                "status": "success",
+                "analytics": json_storage.get_analytics()
+            })
         
-        return {
-            "status": "success",
-            "analytics": analytics
-        }
+        response = {"status": "success"}
+        response["verification"] = json_storage.verify_analytics()
+        response["analytics"] = json_storage.get_analytics()
+        
+        return response
     except Exception as e:
         print(f"[ERROR] Failed to retrieve analytics: {e}")
         raise HTTPException(
@@ -73,6 +73,7 @@ class TaskListResponse(BaseModel):
     count: int
     tasks: List[StoredTask]
     analytics: Optional[dict] = None
+    next_after_id: Optional[int] = None
 
 class MeetingSummary(BaseModel):
     """Meeting summary with key info"""
@@ -80,4 +81,8 @@ class MeetingSummary(BaseModel):
     key_decisions: List[str]
     blockers: List[str]
     risks: List[str]
-    participants: List[str]
\ No newline at end of file
+    participants: List[str]
+
+class CombinedExtractionResponse(MeetingSummary):
+    """Single-call response: tasks plus the meeting summary fields"""
+    tasks: List[ExtractedTask]
\ No newline at end of file
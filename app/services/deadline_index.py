@@ -0,0 +1,86 @@
+"""
+Sorted deadline index over stored tasks.
+Keeps (predicted_deadline, id) pairs ordered with bisect so timeline
+range queries slice the index instead of sorting every task.
+"""
+import bisect
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class DeadlineIndex:
+    """
+    (deadline, id) pairs in deadline order, overall and per owner.
+    Deadlines are ISO dates (YYYY-MM-DD), so string order is date order.
+    Tasks without a predicted deadline are not indexed.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self._entries: List[Tuple[str, int]] = []
+        self._by_owner: Dict[object, List[Tuple[str, int]]] = {}
+
+    @classmethod
+    def from_tasks(cls, tasks: Iterable[dict]) -> "DeadlineIndex":
+        """Build with one sort instead of an insort per task."""
+        index = cls()
+        for task in tasks:
+            entry = cls._entry(task)
+            if entry:
+                index._entries.append(entry)
+                index._by_owner.setdefault(cls._owner_key(task.get("owner_mapped")), []).append(entry)
+        index._entries.sort()
+        for entries in index._by_owner.values():
+            entries.sort()
+        return index
+
+    @staticmethod
+    def _entry(task: dict) -> Optional[Tuple[str, int]]:
+        deadline = task.get("predicted_deadline")
+        return (deadline, task["id"]) if deadline else None
+
+    @staticmethod
+    def _owner_key(owner):
+        return owner.casefold() if isinstance(owner, str) else owner
+
+    def add(self, task: dict):
+        entry = self._entry(task)
+        if not entry:
+            return
+        bisect.insort(self._entries, entry)
+        bisect.insort(self._by_owner.setdefault(self._owner_key(task.get("owner_mapped")), []), entry)
+
+    def remove(self, task: dict):
+        entry = self._entry(task)
+        if not entry:
+            return
+        owner_key = self._owner_key(task.get("owner_mapped"))
+        for entries in (self._entries, self._by_owner.get(owner_key)):
+            if not entries:
+                continue
+            position = bisect.bisect_left(entries, entry)
+            if position < len(entries) and entries[position] == entry:
+                del entries[position]
+        if not self._by_owner.get(owner_key, True):
+            del self._by_owner[owner_key]
+
+    def lookup(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        owner: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[int]:
+        """
+        Ids of tasks due between `start` and `end` (inclusive), earliest
+        first, optionally for one owner and at most `limit` of them.
+        Two bisects and a slice: O(log n + k).
+        """
+        entries = self._entries if owner is None else self._by_owner.get(self._owner_key(owner), [])
+        low = bisect.bisect_left(entries, (start,)) if start else 0
+        # (end, inf) sorts after every (end, id), so tasks due on `end` are included
+        high = bisect.bisect_right(entries, (end, float("inf"))) if end else len(entries)
+        if limit is not None:
+            high = min(high, low + limit)
+        return [task_id for _, task_id in entries[low:high]]
\ No newline at end of file
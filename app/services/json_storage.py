@@ -1,18 +1,98 @@
 """
 JSON file storage with enhanced task data.
+Safe for several worker processes sharing one file: writes hold an OS
+file lock, ids come from a persistent counter, and each worker notices
+the others' writes through the file signature.
+Deletes only append the id to a tombstone log; the store drops dead
+records on its next full rewrite or when compact() runs.
+In memory, tasks are compact TaskRecords; they become dicts or StoredTask
+models only when handed out.
 """
+import bisect
 import json
+import os
+import tempfile
 from pathlib import Path
 from datetime import datetime
 from app.models import EnhancedTask, StoredTask
-from typing import List
+from app.services.task_aggregates import TaskAggregates
+from app.services.task_indexes import SecondaryIndexes
+from app.services.deadline_index import DeadlineIndex
+from app.services.task_record import TaskRecord, aggregate
+from app.utils.file_lock import FileLock
+from app.utils import codec
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import threading
+import time
+
+
+def build_task_record(task: EnhancedTask, note_id: str, task_id: int) -> dict:
+    """Build the stored dict for an enhanced task."""
+    return {
+        "id": task_id,
+        "created_at": datetime.now().isoformat(),
+        "task_name": task.task_name,
+        "owner": task.owner,
+        "owner_mapped": task.owner,  # Already mapped
+        "due_date": task.due_date,
+        "predicted_deadline": task.predicted_deadline,
+        "priority": task.priority,
+        "priority_reason": f"Confidence: {task.confidence_score:.2f}",
+        "confidence_score": task.confidence_score,
+        "difficulty": task.difficulty,
+        "category": task.category,
+        "has_dependency": task.has_dependency,
+        "dependency_info": task.dependency_info,
+        "risk_level": task.risk_level,
+        "risk_description": task.risk_description,
+        "progress_estimate": task.progress_estimate,
+        "source_note_id": note_id,
+        "status": "pending"
+    }
+
 
 class JSONStorage:
     
-    def __init__(self, file_path: str = "tasks.json"):
+    storage_type = "JSON"
+    
+    def __init__(
+        self,
+        file_path: str = "tasks.json",
+        seq_path: Optional[str] = None,
+        lock_path: Optional[str] = None,
+        compact_json: bool = False
+    ):
+        """
+        `seq_path` and `lock_path` let several stores share one id counter
+        and write lock (used by the partitioned store's segments).
+        `compact_json` writes the store without indentation: smaller and
+        faster, but no longer meant for reading by hand.
+        """
         self.file_path = Path(file_path)
-        self.lock = threading.Lock()
+        self._encode = codec.dumps if compact_json else codec.dumps_pretty
+        self.stats_path = self.file_path.with_suffix(".stats.json")
+        self.seq_path = Path(seq_path) if seq_path else self.file_path.with_suffix(".seq")
+        self.tombstone_path = self.file_path.with_suffix(".tombstones")
+        self.file_lock = FileLock(lock_path or self.file_path.with_name(self.file_path.name + ".lock"))
+        self.lock = threading.RLock()
+        
+        # Parsed copy of the store; valid while the file signature matches
+        self._cache: Optional[List[TaskRecord]] = None
+        self._cache_signature: Optional[tuple] = None
+        self._version = 0
+        self._models_cache: Tuple[int, List[StoredTask]] = (-1, [])
+        
+        # Derived from the cache and kept in step with it on every write
+        self._aggregates = TaskAggregates()
+        self._indexes = SecondaryIndexes()
+        self._deadlines = DeadlineIndex()
+        self._by_id: Dict[int, TaskRecord] = {}
+        self._ids_ordered = True  # file order matches id order (always true for new stores)
+        self._dead: set = set()   # ids still in the cached file but tombstoned
+        
+        self._compactions = 0
+        self._last_compaction: Optional[dict] = None
+        
         self._ensure_file_exists()
         print(f"[STORAGE] Using JSON storage: {self.file_path.absolute()}")
     
@@ -22,184 +102,480 @@ class JSONStorage:
             self.file_path.write_text("[]")
             print(f"[STORAGE] Created new storage file: {self.file_path}")
     
-    def _read_tasks(self) -> List[dict]:
-        """Read all tasks from file."""
+    @property
+    def version(self) -> str:
+        """
+        Token that changes whenever the stored tasks change. Derived from
+        the file signature, so every worker reports the same value for the
+        same data (usable in an ETag).
+        """
         with self.lock:
+            self._read_tasks()
+            return "-".join(map(str, self._cache_signature or ()))
+    
+    def _file_signature(self) -> Optional[tuple]:
+        """
+        (mtime, size, inode) of the store plus the tombstone log, or None
+        if the store is missing. A delete by another worker only touches
+        the tombstone log, so both files are part of the signature.
+        """
+        try:
+            st = os.stat(self.file_path)
+        except OSError:
+            return None
+        try:
+            tomb = os.stat(self.tombstone_path)
+            tomb_signature = (tomb.st_mtime_ns, tomb.st_size, tomb.st_ino)
+        except OSError:
+            tomb_signature = (None, None, None)
+        return (st.st_mtime_ns, st.st_size, st.st_ino) + tomb_signature
+    
+    def _read_tombstones(self) -> set:
+        try:
+            content = self.tombstone_path.read_text()
+        except FileNotFoundError:
+            return set()
+        return {int(line) for line in content.split() if line.strip().isdigit()}
+    
+    def _set_cache(self, tasks: List[TaskRecord], signature: Optional[tuple]):
+        self._cache = tasks
+        self._cache_signature = signature
+        self._version += 1
+    
+    def _rebuild_derived(self, tasks: List[TaskRecord], aggregates: Optional[TaskAggregates] = None):
+        """Rebuild counters and indexes from a freshly loaded task list."""
+        self._aggregates = aggregates or aggregate(tasks)
+        self._indexes = SecondaryIndexes.from_tasks(tasks)
+        self._deadlines = DeadlineIndex.from_tasks(tasks)
+        self._by_id = {task.id: task for task in tasks}
+        self._ids_ordered = all(a.id < b.id for a, b in zip(tasks, tasks[1:]))
+    
+    def _apply_changes(self, added: Iterable[TaskRecord], removed: Iterable[TaskRecord]):
+        """Update counters and indexes for just the records that changed."""
+        for task in removed:
+            self._aggregates.remove(task)
+            self._indexes.remove(task)
+            self._deadlines.remove(task)
+            self._by_id.pop(task.id, None)
+        for task in added:
+            self._aggregates.add(task)
+            self._indexes.add(task)
+            self._deadlines.add(task)
+            self._by_id[task.id] = task
+    
+    def _load_aggregates(self, signature: Optional[tuple]) -> Optional[TaskAggregates]:
+        """Persisted counters, if they were written for this exact file."""
+        try:
+            data = json.loads(self.stats_path.read_text())
+            if tuple(data["signature"]) != signature:
+                return None
+            return TaskAggregates.from_dict(data["aggregates"])
+        except Exception:
+            return None
+    
+    def _save_aggregates(self, aggregates: TaskAggregates, signature: Optional[tuple]):
+        """
+        Persist counters next to the store, tagged with its signature.
+        Advisory only: a stale or missing file just means one recount on load.
+        """
+        try:
+            tmp_path = self.stats_path.with_name(self.stats_path.name + ".tmp")
+            tmp_path.write_text(json.dumps({
+                "signature": list(signature) if signature else None,
+                "aggregates": aggregates.to_dict()
+            }))
+            os.replace(tmp_path, self.stats_path)
+        except Exception as e:
+            print(f"[STORAGE] Warning: Could not persist analytics counters: {e}")
+    
+    def _read_tasks(self) -> List[TaskRecord]:
+        """
+        Return all records of the store file from the in-memory copy.
+        The file is only re-read when its mtime/size/inode changed,
+        i.e. when something other than this instance edited it.
+        The returned list is shared and must not be mutated, and may still
+        hold tombstoned records (see _live_tasks).
+        """
+        with self.lock:
+            signature = self._file_signature()
+            if self._cache is not None and signature == self._cache_signature:
+                return self._cache
+            
+            if self._cache is not None:
+                print("[STORAGE] Store changed on disk, reloading")
+            
+            # Anything other than undecodable JSON propagates: an empty list
+            # here would let the next write overwrite a store we failed to read
             try:
-                content = self.file_path.read_text()
-                return json.loads(content)
-            except json.JSONDecodeError:
+                raw = codec.loads(self.file_path.read_bytes())
+            except ValueError:
                 print("[STORAGE] Warning: Corrupted JSON, reinitializing")
-                return []
+                raw = []
             except Exception as e:
                 print(f"[STORAGE] Error reading tasks: {e}")
-                return []
+                raise
+            try:
+                tasks = [TaskRecord(task) for task in raw]
+            except Exception as e:
+                print(f"[STORAGE] Error reading tasks: invalid record ({e!r})")
+                raise
+            
+            tombstones = self._read_tombstones()
+            self._dead = {task.id for task in tasks if task.id in tombstones}
+            live = [task for task in tasks if task.id not in self._dead] if self._dead else tasks
+            self._rebuild_derived(live, self._load_aggregates(signature))
+            self._set_cache(tasks, signature)
+            return tasks
     
-    def _write_tasks(self, tasks: List[dict]):
-        """Write all tasks to file."""
+    def _live_tasks(self) -> List[TaskRecord]:
+        """All records that have not been deleted, in file order."""
+        tasks = self._read_tasks()
+        if not self._dead:
+            return tasks
+        return [task for task in tasks if task.id not in self._dead]
+    
+    def _write_tasks(
+        self,
+        tasks: List[TaskRecord],
+        added: Optional[List[TaskRecord]] = None,
+        removed: Optional[List[TaskRecord]] = None
+    ):
+        """
+        Write all tasks to file atomically.
+        Data goes to a temp file in the same directory, is fsynced,
+        then renamed over the store so readers never see a partial file.
+        `tasks` must be live records only; the tombstone log is dropped
+        afterwards, so every full rewrite doubles as a compaction.
+        When the caller says which records were added/removed, counters
+        and indexes are updated incrementally; otherwise they are rebuilt.
+        In-memory state only changes once the file is safely on disk.
+        """
         with self.lock:
+            tmp_path = None
             try:
-                self.file_path.write_text(
-                    json.dumps(tasks, indent=2, ensure_ascii=False)
+                fd, tmp_path = tempfile.mkstemp(
+                    dir=self.file_path.parent, prefix=f".{self.file_path.name}.", suffix=".tmp"
                 )
+                with os.fdopen(fd, "wb") as f:
+                    f.write(self._encode([task.to_dict() for task in tasks]))
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.file_path)
+                tmp_path = None
+                self._fsync_dir()
+                # Tombstones only name ids that are no longer in the file,
+                # so a crash before this unlink is harmless
+                self.tombstone_path.unlink(missing_ok=True)
+                self._dead = set()
+                signature = self._file_signature()
+                if added is None and removed is None:
+                    self._rebuild_derived(tasks)
+                else:
+                    self._apply_changes(added or [], removed or [])
+                self._save_aggregates(self._aggregates, signature)
+                self._set_cache(tasks, signature)
             except Exception as e:
                 print(f"[STORAGE] Error writing tasks: {e}")
                 raise
+            finally:
+                if tmp_path and os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+    
+    def _fsync_dir(self):
+        """Persist the rename itself (no-op where directories can't be opened)."""
+        try:
+            dir_fd = os.open(self.file_path.parent, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+    
+    def _allocate_ids(self, count: int) -> int:
+        """
+        Reserve `count` consecutive ids and return the first one.
+        The high-water mark lives in a sidecar file, so ids are never
+        reused, even after the newest task is deleted. Must be called with
+        the file lock held.
+        """
+        try:
+            high_water = int(self.seq_path.read_text().strip() or 0)
+        except (FileNotFoundError, ValueError):
+            high_water = 0
+        high_water = max(high_water, max(self._by_id, default=0))
+        
+        tmp_path = self.seq_path.with_name(self.seq_path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            f.write(str(high_water + count))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.seq_path)
+        
+        return high_water + 1
     
     def create_task(self, task: EnhancedTask, note_id: str) -> bool:
         """Add an enhanced task to JSON storage."""
-        try:
-            tasks = self._read_tasks()
-            
-            new_task = {
-                "id": len(tasks) + 1,
-                "created_at": datetime.now().isoformat(),
-                "task_name": task.task_name,
-                "owner": task.owner,
-                "owner_mapped": task.owner,  # Already mapped
-                "due_date": task.due_date,
-                "predicted_deadline": task.predicted_deadline,
-                "priority": task.priority,
-                "priority_reason": f"Confidence: {task.confidence_score:.2f}",
-                "confidence_score": task.confidence_score,
-                "difficulty": task.difficulty,
-                "category": task.category,
-                "has_dependency": task.has_dependency,
-                "dependency_info": task.dependency_info,
-                "risk_level": task.risk_level,
-                "risk_description": task.risk_description,
-                "progress_estimate": task.progress_estimate,
-                "source_note_id": note_id,
-                "status": "pending"
-            }
-            
-            tasks.append(new_task)
-            self._write_tasks(tasks)
-            
-            print(f"[STORAGE] ✓ Created task #{new_task['id']}: {task.task_name}")
-            return True
-            
-        except Exception as e:
-            print(f"[STORAGE] ✗ Failed to save task: {e}")
-            return False
+        successful, _ = self.create_tasks_batch([task], note_id)
+        return successful == 1
     
     def create_tasks_batch(self, tasks: List[EnhancedTask], note_id: str) -> tuple[int, int]:
-        """Add multiple tasks in batch."""
-        successful = 0
-        failed = 0
+        """
+        Add all tasks for a note in a single transaction.
+        Each task is built and validated individually; the valid ones are
+        committed together with one atomic rewrite. If that write fails,
+        nothing from the batch is stored.
+        """
+        if not tasks:
+            return 0, 0
         
+        new_tasks = []
+        failed = 0
         for task in tasks:
-            if self.create_task(task, note_id):
-                successful += 1
-            else:
+            try:
+                record = build_task_record(task, note_id, 0)
+                StoredTask(**record)
+            except Exception as e:
                 failed += 1
+                print(f"[STORAGE] ✗ Rejected task '{task.task_name}': {e}")
+                continue
+            new_tasks.append(record)
         
-        print(f"[STORAGE] Batch complete: {successful} succeeded, {failed} failed")
-        return successful, failed
+        if new_tasks:
+            try:
+                self._commit_batch(new_tasks)
+            except Exception as e:
+                print(f"[STORAGE] ✗ Batch write failed for note {note_id}: {e}")
+                return 0, len(tasks)
+        
+        for record in new_tasks:
+            print(f"[STORAGE] ✓ Created task #{record['id']}: {record['task_name']}")
+        print(f"[STORAGE] Batch complete: {len(new_tasks)} succeeded, {failed} failed")
+        return len(new_tasks), failed
+    
+    def _commit_batch(self, new_tasks: List[dict]):
+        """Assign ids to validated records and store them with one atomic rewrite."""
+        with self.lock, self.file_lock:
+            # Re-validates the cache, picking up other workers' writes
+            stored = self._live_tasks()
+            next_id = self._allocate_ids(len(new_tasks))
+            for offset, record in enumerate(new_tasks):
+                record["id"] = next_id + offset
+            records = [TaskRecord(record) for record in new_tasks]
+            self._write_tasks(stored + records, added=records)
+    
+    def import_tasks_batch(self, records: List[dict]) -> int:
+        """
+        Store already-validated task dicts (historical imports) in one
+        atomic write. Ids are reassigned; every other field is kept.
+        Returns the number stored; raises if the write fails.
+        """
+        if not records:
+            return 0
+        self._commit_batch([dict(record) for record in records])
+        return len(records)
     
     def get_all_tasks(self) -> List[StoredTask]:
-        """Retrieve all tasks."""
-        tasks = self._read_tasks()
-        return [StoredTask(**task) for task in reversed(tasks)]
+        """Retrieve all tasks (models are built once per store version)."""
+        with self.lock:
+            tasks = self._read_tasks()
+            version, models = self._models_cache
+            if version != self._version:
+                models = [task.to_model() for task in reversed(tasks) if task.id not in self._dead]
+                self._models_cache = (self._version, models)
+            return list(models)
+    
+    def get_task(self, task_id: int) -> Optional[StoredTask]:
+        """Fetch one task by id."""
+        with self.lock:
+            self._read_tasks()
+            task = self._by_id.get(task_id)
+            return task.to_model() if task else None
     
     def get_tasks_by_note(self, note_id: str) -> List[StoredTask]:
-        """Get tasks from specific note."""
-        all_tasks = self._read_tasks()
-        filtered = [t for t in all_tasks if t.get("source_note_id") == note_id]
-        return [StoredTask(**task) for task in filtered]
+        """Get tasks from specific note (index lookup, oldest first)."""
+        with self.lock:
+            self._read_tasks()
+            ids = self._indexes.lookup(note_id=note_id)
+            return [self._by_id[task_id].to_model() for task_id in sorted(ids)]
+    
+    def query_tasks(self, **filters) -> List[StoredTask]:
+        """
+        Get tasks matching all filters, newest first.
+        Filters: note_id, owner, priority, category, risk_level, status.
+        Answered by intersecting the secondary indexes, not by scanning.
+        """
+        with self.lock:
+            self._read_tasks()
+            ids = self._indexes.lookup(**filters)
+            if ids is None:
+                return self.get_all_tasks()
+            return [self._by_id[task_id].to_model() for task_id in sorted(ids, reverse=True)]
+    
+    def iter_tasks(self, after_id: Optional[int] = None, **filters) -> Iterator[dict]:
+        """
+        Yield stored task dicts newest first, optionally only ids below `after_id`
+        (keyset cursor) and matching the same filters as query_tasks().
+        Iterates a snapshot of the cache, so concurrent writes never disturb it.
+        """
+        with self.lock:
+            tasks = self._read_tasks()
+            ids = self._indexes.lookup(**filters)
+            if ids is not None:
+                tasks = [self._by_id[task_id] for task_id in sorted(ids)]
+            elif not self._ids_ordered:
+                tasks = sorted(tasks, key=lambda t: t.id)
+            dead = frozenset(self._dead)
+        
+        end = len(tasks)
+        if after_id is not None:
+            end = bisect.bisect_left(tasks, after_id, key=lambda t: t.id)
+        
+        for index in range(end - 1, -1, -1):
+            if tasks[index].id not in dead:
+                yield tasks[index].to_dict()
+    
+    def get_timeline(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        owner: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[dict]:
+        """
+        Stored task dicts due between `start` and `end` (inclusive), earliest
+        first. Sliced from the deadline index, not sorted per call.
+        """
+        with self.lock:
+            self._read_tasks()
+            ids = self._deadlines.lookup(start, end, owner, limit)
+            return [self._by_id[task_id].to_dict() for task_id in ids]
     
     def get_task_count(self) -> int:
         """Get total number of tasks."""
-        return len(self._read_tasks())
+        with self.lock:
+            self._read_tasks()
+            return len(self._by_id)
     
     def get_analytics(self) -> dict:
         """
         Get analytics about stored tasks.
         FEATURE: Data Intelligence
+        Served from running counters, so this is O(1).
         """
-        tasks = self._read_tasks()
-        
-        if not tasks:
-            return {
-                "total_tasks": 0,
-                "by_priority": {},
-                "by_category": {},
-                "by_difficulty": {},
-                "high_risk_count": 0,
-                "with_dependencies": 0
-            }
+        with self.lock:
+            self._read_tasks()
+            return self._aggregates.to_analytics()
+    
+    def get_aggregates(self) -> TaskAggregates:
+        """Snapshot of the running counters, for callers combining stores."""
+        with self.lock:
+            self._read_tasks()
+            return TaskAggregates.from_dict(self._aggregates.to_dict())
+    
+    def verify_analytics(self) -> dict:
+        """
+        Recount analytics from scratch and diff against the running counters.
+        Any difference is a bug; the recount is adopted so it self-heals.
+        """
+        with self.lock:
+            tasks = self._live_tasks()
+            recomputed = aggregate(tasks)
+            differences = self._aggregates.diff(recomputed)
+            if differences:
+                print(f"[STORAGE] ⚠️ Analytics counters drifted: {differences}")
+                self._aggregates = recomputed
+                self._save_aggregates(recomputed, self._cache_signature)
         
-        analytics = {
-            "total_tasks": len(tasks),
-            "by_priority": {},
-            "by_category": {},
-            "by_difficulty": {},
-            "by_risk": {},
-            "high_risk_count": 0,
-            "with_dependencies": 0,
-            "avg_confidence": 0.0
+        return {
+            "consistent": not differences,
+            "differences": differences
         }
-        
-        # Count by priority
-        for task in tasks:
-            priority = task.get("priority", "Medium")
-            analytics["by_priority"][priority] = analytics["by_priority"].get(priority, 0) + 1
-            
-            category = task.get("category", "General")
-            analytics["by_category"][category] = analytics["by_category"].get(category, 0) + 1
-            
-            difficulty = task.get("difficulty", "Medium")
-            analytics["by_difficulty"][difficulty] = analytics["by_difficulty"].get(difficulty, 0) + 1
-            
-            risk = task.get("risk_level", "Low")
-            analytics["by_risk"][risk] = analytics["by_risk"].get(risk, 0) + 1
-            
-            if risk == "High":
-                analytics["high_risk_count"] += 1
-            
-            if task.get("has_dependency", False):
-                analytics["with_dependencies"] += 1
-        
-        # Calculate average confidence
-        confidences = [t.get("confidence_score", 0.7) for t in tasks]
-        analytics["avg_confidence"] = sum(confidences) / len(confidences) if confidences else 0.0
-        
-        return analytics
     
     def clear_all_tasks(self) -> bool:
         """Clear all tasks (for testing)."""
         try:
-            self._write_tasks([])
+            with self.lock, self.file_lock:
+                self._read_tasks()
+                self._allocate_ids(0)  # pin the high-water mark before the ids disappear
+                self._write_tasks([])
             print("[STORAGE] All tasks cleared")
             return True
         except Exception as e:
             print(f"[STORAGE] Failed to clear tasks: {e}")
             return False
     def delete_task(self, task_id: int) -> bool:
-        """Delete a single task by ID."""
+        """
+        Delete a single task by ID.
+        Appends the id to the tombstone log and drops it from the in-memory
+        indexes: O(1), no rewrite of the store.
+        """
         try:
-            tasks = self._read_tasks()
-            
-            # Find task with matching ID
-            task_to_delete = None
-            for task in tasks:
-                if task.get("id") == task_id:
-                    task_to_delete = task
-                    break
-            
-            if not task_to_delete:
-                print(f"[STORAGE] Task #{task_id} not found")
-                return False
-            
-            # Remove the task
-            tasks.remove(task_to_delete)
-            
-            # Write back to file
-            self._write_tasks(tasks)
+            with self.lock, self.file_lock:
+                self._read_tasks()
+                
+                task_to_delete = self._by_id.get(task_id)
+                if not task_to_delete:
+                    print(f"[STORAGE] Task #{task_id} not found")
+                    return False
+                
+                with open(self.tombstone_path, "a") as f:
+                    f.write(f"{task_id}\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                
+                self._dead.add(task_id)
+                self._apply_changes([], [task_to_delete])
+                signature = self._file_signature()
+                self._save_aggregates(self._aggregates, signature)
+                self._set_cache(self._cache, signature)
             
             print(f"[STORAGE] ✅ Deleted task #{task_id}: {task_to_delete.get('task_name', 'Unknown')}")
             return True
             
         except Exception as e:
             print(f"[STORAGE] ❌ Failed to delete task #{task_id}: {e}")
-            return False
\ No newline at end of file
+            return False
+    
+    def compaction_stats(self) -> dict:
+        """Dead-record bookkeeping for /health."""
+        with self.lock:
+            tasks = self._read_tasks()
+            dead = len(self._dead)
+            return {
+                "live_records": len(tasks) - dead,
+                "dead_records": dead,
+                "dead_ratio": round(dead / len(tasks), 4) if tasks else 0.0,
+                "compactions": self._compactions,
+                "last_compaction": self._last_compaction
+            }
+    
+    def compact(self) -> dict:
+        """Rewrite the store without tombstoned records."""
+        with self.lock, self.file_lock:
+            tasks = self._read_tasks()
+            dead = len(self._dead)
+            started = time.perf_counter()
+            # Derived state already excludes dead records, so nothing to re-add
+            self._write_tasks(self._live_tasks(), added=[], removed=[])
+            
+            self._compactions += 1
+            self._last_compaction = {
+                "at": datetime.now().isoformat(),
+                "removed_records": dead,
+                "remaining_records": len(tasks) - dead,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 2)
+            }
+        
+        print(f"[STORAGE] Compacted store: dropped {dead} dead records")
+        return self._last_compaction
+    
+    def maybe_compact(self, dead_ratio_threshold: float) -> bool:
+        """Compact if the share of dead records reached the threshold."""
+        stats = self.compaction_stats()
+        if stats["dead_records"] and stats["dead_ratio"] >= dead_ratio_threshold:
+            self.compact()
+            return True
+        return False
\ No newline at end of file
@@ -0,0 +1,428 @@
+"""
+Append-only JSONL storage engine.
+Each task is one line in the log; an in-memory id → offset index
+is rebuilt at startup so writes never rewrite the file.
+Several processes may share one log: writes take an OS file lock and
+every operation first replays whatever other workers appended.
+Superseded lines and tombstones pile up as dead space until compact()
+rewrites the log with only live records.
+"""
+import bisect
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from app.models import EnhancedTask, StoredTask
+from app.services.json_storage import build_task_record
+from app.services.task_aggregates import TaskAggregates
+from app.services.task_indexes import SecondaryIndexes
+from app.services.deadline_index import DeadlineIndex
+from app.utils.file_lock import FileLock
+from app.utils import codec
+
+
+class JSONLStorage:
+
+    storage_type = "JSONL"
+
+    def __init__(self, file_path: str = "tasks.jsonl"):
+        self.file_path = Path(file_path)
+        self.lock = threading.Lock()
+        self.file_lock = FileLock(self.file_path.with_name(self.file_path.name + ".lock"))
+        self._reset_state()
+        self._ensure_file_exists()
+        
+        self._compactions = 0
+        self._last_compaction: Optional[dict] = None
+        
+        # Holding the file lock guarantees no other worker is halfway through
+        # an append, so anything past the last complete line is torn
+        with self.lock, self.file_lock:
+            self._sync()
+            self._truncate_torn_tail()
+        print(f"[STORAGE] Using JSONL storage: {self.file_path.absolute()} ({len(self._offsets)} tasks)")
+
+    def _ensure_file_exists(self):
+        """Create file if it doesn't exist."""
+        if not self.file_path.exists():
+            self.file_path.touch()
+            print(f"[STORAGE] Created new storage file: {self.file_path}")
+
+    def _reset_state(self):
+        self._offsets: Dict[int, int] = {}  # task id → byte offset of its line
+        self._next_id = 1
+        self._aggregates = TaskAggregates()
+        self._indexes = SecondaryIndexes()
+        self._deadlines = DeadlineIndex()
+        self._end = 0        # log bytes already replayed into the index
+        self._lines = 0      # complete lines replayed
+        self._dead_lines = 0 # superseded records and the tombstones that deleted them
+        self._inode = None   # changes when the log is replaced (clear/compaction)
+
+    @property
+    def version(self) -> str:
+        """Log identity and replayed length: changes on every append, same in every worker."""
+        with self.lock:
+            self._sync()
+            return f"{self._inode}-{self._end}"
+
+    def _sync(self):
+        """
+        Bring the in-memory index up to date with the log on disk.
+        Other workers append to the same file, so before every operation
+        the unseen tail is replayed; a replaced or shrunk file triggers a
+        full rebuild. Called with self.lock held.
+        """
+        try:
+            st = os.stat(self.file_path)
+        except FileNotFoundError:
+            self._reset_state()
+            return
+
+        if st.st_ino != self._inode or st.st_size < self._end:
+            if self._inode is not None:
+                print("[STORAGE] Log replaced by another process, rebuilding index")
+            self._reset_state()
+            self._inode = st.st_ino
+
+        if st.st_size > self._end:
+            self._replay(self._end)
+
+    def _replay(self, start: int):
+        """
+        Apply log lines from `start` to the index, counters and id high-water mark.
+        Deletes are tombstone lines, so the last record for an id wins.
+        Stops at an incomplete final line (an append still in flight).
+        """
+        with open(self.file_path, "rb") as f, open(self.file_path, "rb") as lookup:
+            f.seek(start)
+            offset = start
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                line_end = offset + len(line)
+                try:
+                    record = codec.loads(line)
+                    task_id = record["id"]
+                except (ValueError, KeyError, TypeError):
+                    print(f"[STORAGE] Warning: Skipping unreadable record at offset {offset}")
+                    offset = line_end
+                    continue
+
+                self._next_id = max(self._next_id, task_id + 1)
+                self._lines += 1
+                previous = self._offsets.pop(task_id, None)
+                if previous is not None:
+                    old = self._read_at(lookup, previous)
+                    self._aggregates.remove(old)
+                    self._indexes.remove(old)
+                    self._deadlines.remove(old)
+                    # The superseded line, plus a tombstone that deleted it
+                    self._dead_lines += 2 if record.get("_deleted") else 1
+                if not record.get("_deleted"):
+                    self._offsets[task_id] = offset
+                    self._aggregates.add(record)
+                    self._indexes.add(record)
+                    self._deadlines.add(record)
+                offset = line_end
+
+        self._end = offset
+
+    def _truncate_torn_tail(self):
+        """
+        Cut off a partial last line left by a crashed writer. Needs the file
+        lock and a fresh _sync(), so self._end is the last complete line.
+        """
+        if self.file_path.stat().st_size > self._end:
+            with open(self.file_path, "r+b") as f:
+                f.truncate(self._end)
+            print(f"[STORAGE] Truncated torn tail at offset {self._end}")
+
+    @staticmethod
+    def _encode(record: dict) -> bytes:
+        return codec.dumps(record) + b"\n"
+
+    def _append(self, records: List[dict]):
+        """
+        Append records in a single write, then replay them into the index.
+        Called with self.lock and the file lock held, after _sync().
+        A torn line left by a worker that crashed mid-append is cut off
+        first, or the new records would be glued onto it and lost.
+        """
+        self._truncate_torn_tail()
+        with open(self.file_path, "ab") as f:
+            f.write(b"".join(self._encode(r) for r in records))
+            f.flush()
+            os.fsync(f.fileno())
+        self._sync()
+
+    def _read_at(self, f, offset: int) -> dict:
+        f.seek(offset)
+        return codec.loads(f.readline())
+
+    def _iter_live(self) -> Iterator[dict]:
+        """Yield live records in insertion order with one sequential read."""
+        with self.lock:
+            self._sync()
+            live = set(self._offsets.values())
+            with open(self.file_path, "rb") as f:
+                offset = 0
+                for line in f:
+                    if offset in live:
+                        yield codec.loads(line)
+                    offset += len(line)
+
+    def create_task(self, task: EnhancedTask, note_id: str) -> bool:
+        """Append an enhanced task to the log."""
+        successful, _ = self.create_tasks_batch([task], note_id)
+        return successful == 1
+
+    def create_tasks_batch(self, tasks: List[EnhancedTask], note_id: str) -> Tuple[int, int]:
+        """Append all tasks for a note in one write."""
+        if not tasks:
+            return 0, 0
+
+        try:
+            with self.lock, self.file_lock:
+                # Catch up first so ids continue from other workers' writes
+                self._sync()
+                records = []
+                for task in tasks:
+                    records.append(build_task_record(task, note_id, self._next_id))
+                    self._next_id += 1
+
+                self._append(records)
+
+            for record in records:
+                print(f"[STORAGE] ✓ Created task #{record['id']}: {record['task_name']}")
+            print(f"[STORAGE] Batch complete: {len(records)} succeeded, 0 failed")
+            return len(records), 0
+
+        except Exception as e:
+            print(f"[STORAGE] ✗ Failed to append batch: {e}")
+            return 0, len(tasks)
+
+    def import_tasks_batch(self, records: List[dict]) -> int:
+        """
+        Append already-validated task dicts (historical imports) in one
+        write. Ids are reassigned; every other field is kept.
+        Returns the number stored; raises if the write fails.
+        """
+        if not records:
+            return 0
+        with self.lock, self.file_lock:
+            self._sync()
+            records = [dict(record, id=self._next_id + offset) for offset, record in enumerate(records)]
+            self._next_id += len(records)
+            self._append(records)
+        return len(records)
+
+    def get_task(self, task_id: int) -> Optional[StoredTask]:
+        """Fetch one task by id with a single seek."""
+        with self.lock:
+            self._sync()
+            offset = self._offsets.get(task_id)
+            if offset is None:
+                return None
+            with open(self.file_path, "rb") as f:
+                return StoredTask(**self._read_at(f, offset))
+
+    def get_all_tasks(self) -> List[StoredTask]:
+        """Retrieve all tasks, newest first."""
+        tasks = [StoredTask(**record) for record in self._iter_live()]
+        tasks.reverse()
+        return tasks
+
+    def _read_ids(self, ids: List[int]) -> List[StoredTask]:
+        """Materialize tasks by id, one seek each."""
+        with self.lock:
+            self._sync()
+            with open(self.file_path, "rb") as f:
+                return [StoredTask(**self._read_at(f, self._offsets[task_id])) for task_id in ids]
+
+    def get_tasks_by_note(self, note_id: str) -> List[StoredTask]:
+        """Get tasks from specific note (index lookup, oldest first)."""
+        with self.lock:
+            self._sync()
+            ids = sorted(self._indexes.lookup(note_id=note_id))
+        return self._read_ids(ids)
+
+    def query_tasks(self, **filters) -> List[StoredTask]:
+        """
+        Get tasks matching all filters, newest first.
+        Filters: note_id, owner, priority, category, risk_level, status.
+        """
+        with self.lock:
+            self._sync()
+            ids = self._indexes.lookup(**filters)
+        if ids is None:
+            return self.get_all_tasks()
+        return self._read_ids(sorted(ids, reverse=True))
+
+    def iter_tasks(self, after_id: Optional[int] = None, **filters) -> Iterator[dict]:
+        """
+        Yield stored task dicts newest first, optionally only ids below `after_id`
+        (keyset cursor) and matching the same filters as query_tasks().
+        Only (id, offset) pairs are snapshotted; records are read one at a
+        time through a handle opened under the lock.
+        """
+        with self.lock:
+            self._sync()
+            ids = self._indexes.lookup(**filters)
+            ids = list(self._offsets) if ids is None else sorted(ids)
+            if after_id is not None:
+                ids = ids[:bisect.bisect_left(ids, after_id)]
+            offsets = [self._offsets[task_id] for task_id in ids]
+            f = open(self.file_path, "rb")
+
+        with f:
+            for offset in reversed(offsets):
+                f.seek(offset)
+                line = f.readline()
+                if not line:
+                    return
+                yield codec.loads(line)
+
+    def get_timeline(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        owner: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[dict]:
+        """
+        Stored task dicts due between `start` and `end` (inclusive), earliest
+        first. Sliced from the deadline index, one seek per task.
+        """
+        with self.lock:
+            self._sync()
+            ids = self._deadlines.lookup(start, end, owner, limit)
+            with open(self.file_path, "rb") as f:
+                return [self._read_at(f, self._offsets[task_id]) for task_id in ids]
+
+    def get_task_count(self) -> int:
+        """Get total number of tasks."""
+        with self.lock:
+            self._sync()
+            return len(self._offsets)
+
+    def get_analytics(self) -> dict:
+        """
+        Get analytics about stored tasks.
+        FEATURE: Data Intelligence
+        Served from running counters, so this is O(1).
+        """
+        with self.lock:
+            self._sync()
+            return self._aggregates.to_analytics()
+
+    def verify_analytics(self) -> dict:
+        """Recount analytics from the log and diff against the running counters."""
+        recomputed = TaskAggregates.from_tasks(self._iter_live())
+        with self.lock:
+            differences = self._aggregates.diff(recomputed)
+            if differences:
+                print(f"[STORAGE] ⚠️ Analytics counters drifted: {differences}")
+                self._aggregates = recomputed
+
+        return {
+            "consistent": not differences,
+            "differences": differences
+        }
+
+    def _replace_log(self, records: Iterator[dict], keeps_newest: bool):
+        """
+        Atomically swap the log for one holding `records`. Unless they
+        include the newest id (`keeps_newest`), a tombstone for it is written
+        first so the high-water mark survives and ids are never reused. Replacing (rather than
+        truncating) gives other workers a new inode, so they rebuild.
+        Called with self.lock and the file lock held, after _sync().
+        """
+        high_water = self._next_id - 1
+        tmp_path = self.file_path.with_name(self.file_path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            if high_water and not keeps_newest:
+                f.write(self._encode({"id": high_water, "_deleted": True}))
+            for record in records:
+                f.write(self._encode(record))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.file_path)
+        self._reset_state()
+        self._sync()
+    
+    def compaction_stats(self) -> dict:
+        """Dead-line bookkeeping for /health."""
+        with self.lock:
+            self._sync()
+            return {
+                "live_records": len(self._offsets),
+                "dead_records": self._dead_lines,
+                "dead_ratio": round(self._dead_lines / self._lines, 4) if self._lines else 0.0,
+                "compactions": self._compactions,
+                "last_compaction": self._last_compaction
+            }
+    
+    def compact(self) -> dict:
+        """Rewrite the log with only live records, oldest first."""
+        with self.lock, self.file_lock:
+            self._sync()
+            dead = self._dead_lines
+            started = time.perf_counter()
+            offsets = sorted(self._offsets.items())
+            with open(self.file_path, "rb") as f:
+                self._replace_log(
+                    (self._read_at(f, offset) for _, offset in offsets),
+                    keeps_newest=(self._next_id - 1) in self._offsets
+                )
+            
+            self._compactions += 1
+            self._last_compaction = {
+                "at": datetime.now().isoformat(),
+                "removed_records": dead - self._dead_lines,
+                "remaining_records": len(self._offsets),
+                "duration_ms": round((time.perf_counter() - started) * 1000, 2)
+            }
+        
+        print(f"[STORAGE] Compacted log: dropped {self._last_compaction['removed_records']} dead lines")
+        return self._last_compaction
+    
+    def maybe_compact(self, dead_ratio_threshold: float) -> bool:
+        """Compact if the share of dead lines reached the threshold."""
+        stats = self.compaction_stats()
+        if stats["dead_records"] and stats["dead_ratio"] >= dead_ratio_threshold:
+            self.compact()
+            return True
+        return False
+    
+    def clear_all_tasks(self) -> bool:
+        """Clear all tasks (for testing). Ids keep counting up."""
+        try:
+            with self.lock, self.file_lock:
+                self._sync()
+                self._replace_log(iter(()), keeps_newest=False)
+            print("[STORAGE] All tasks cleared")
+            return True
+        except Exception as e:
+            print(f"[STORAGE] Failed to clear tasks: {e}")
+            return False
+
+    def delete_task(self, task_id: int) -> bool:
+        """Delete a single task by appending a tombstone."""
+        try:
+            with self.lock, self.file_lock:
+                self._sync()
+                if task_id not in self._offsets:
+                    print(f"[STORAGE] Task #{task_id} not found")
+                    return False
+
+                self._append([{"id": task_id, "_deleted": True}])
+
+            print(f"[STORAGE] ✅ Deleted task #{task_id}")
+            return True
+
+        except Exception as e:
+            print(f"[STORAGE] ❌ Failed to delete task #{task_id}: {e}")
+            return False
\ No newline at end of file
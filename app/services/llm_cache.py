@@ -0,0 +1,153 @@
+"""
+Content-addressed cache of LLM responses.
+FEATURE: LLM Response Cache
+Keys hash the normalized transcript with the model, temperature and
+prompt version, so a retried or re-sent note is answered without a new
+OpenAI call while any prompt change misses. Entries live in a bounded
+LRU, expire after a TTL and can be persisted to an append-only JSONL
+file that is reloaded at startup.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+from app.utils.file_lock import FileLock
+from app.utils import codec
+
+
+def normalize_transcript(text: str) -> str:
+    """Collapse whitespace so formatting-only differences share a key."""
+    return " ".join(text.split())
+
+
+def prompt_version(*templates: str) -> str:
+    """Short digest of prompt templates; changes whenever a prompt is edited."""
+    digest = hashlib.sha1()
+    for template in templates:
+        digest.update(template.encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+
+class LLMResponseCache:
+    """
+    Thread-safe LRU of raw completion contents with a TTL.
+    Only responses that passed validation should be put, so a malformed
+    completion is never replayed. Stats are exposed on /health.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: int = 604800, file_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.file_path = Path(file_path) if file_path else None
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+        if self.file_path and self.max_entries > 0:
+            self.file_lock = FileLock(self.file_path.with_name(self.file_path.name + ".lock"))
+            with self.file_lock:
+                self._load()
+            print(f"[LLM] Response cache loaded {len(self._entries)} entries from {self.file_path}")
+
+    @staticmethod
+    def make_key(purpose: str, model: str, temperature: float, version: str, transcript: str) -> str:
+        material = "\x1f".join([purpose, model, repr(temperature), version, normalize_transcript(transcript)])
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _is_fresh(self, stored_at: float, now: float) -> bool:
+        return self.ttl_seconds <= 0 or now - stored_at < self.ttl_seconds
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached content for `key`, or None on a miss or expired entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._is_fresh(entry[0], time.time()):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+                self.expired += 1
+            self.misses += 1
+            return None
+
+    def put(self, key: str, content: str):
+        if self.max_entries <= 0:
+            return
+        stored_at = time.time()
+        with self._lock:
+            self._remember(key, stored_at, content)
+        if self.file_path:
+            self._append(key, stored_at, content)
+
+    def _remember(self, key: str, stored_at: float, content: str):
+        self._entries[key] = (stored_at, content)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _append(self, key: str, stored_at: float, content: str):
+        line = codec.dumps({"key": key, "stored_at": stored_at, "content": content}) + b"\n"
+        try:
+            with self.file_lock, open(self.file_path, "ab") as f:
+                f.write(line)
+        except OSError as e:
+            print(f"[LLM] Warning: Could not persist cache entry: {e}")
+
+    def _load(self):
+        """
+        Rebuild the LRU from the cache file, oldest first so the most
+        recent entries survive the size bound. Expired and superseded
+        lines are dropped, and the file is rewritten once they outnumber
+        the live ones. Called with the file lock held.
+        """
+        if not self.file_path.exists():
+            return
+        now = time.time()
+        latest = {}
+        lines = 0
+        with open(self.file_path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                lines += 1
+                try:
+                    record = codec.loads(line)
+                    key, stored_at, content = record["key"], record["stored_at"], record["content"]
+                except (ValueError, KeyError, TypeError):
+                    continue
+                latest.pop(key, None)
+                if self._is_fresh(stored_at, now):
+                    latest[key] = (stored_at, content)
+
+        live = sorted(latest.items(), key=lambda item: item[1][0])[-self.max_entries:]
+        for key, (stored_at, content) in live:
+            self._remember(key, stored_at, content)
+
+        if lines - len(live) > len(live):
+            tmp_path = self.file_path.with_name(self.file_path.name + ".tmp")
+            with open(tmp_path, "wb") as f:
+                for key, (stored_at, content) in live:
+                    f.write(codec.dumps({"key": key, "stored_at": stored_at, "content": content}) + b"\n")
+            os.replace(tmp_path, self.file_path)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "persistent": self.file_path is not None,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired
+            }
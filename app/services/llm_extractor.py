@@ -1,25 +1,52 @@
 """
 OpenAI-powered task extraction from meeting notes.
 Enhanced with meeting summary generation.
+FEATURE: Non-blocking extraction
+Calls go through the AsyncOpenAI client, so a slow completion never
+blocks the event loop, and extract_and_summarize() runs both calls
+concurrently: a note costs about as long as the slower of the two.
+With LLM_COMBINED_MODE on, a single completion returns both instead.
+Validated responses are cached by transcript, so a re-sent note costs
+no OpenAI call, and identical calls already in flight share one request.
+Transcripts longer than LLM_CHUNK_CHARS are split into overlapping
+chunks whose tasks are extracted concurrently and merged (map-reduce),
+so long meetings are neither truncated nor one very slow completion.
+Every call goes through LLMScheduler (rate limits, concurrency cap,
+backoff, circuit breaker); when OpenAI stays unavailable extraction
+raises LLMUnavailableError rather than reporting no tasks.
+RuleBasedExtractor answers instead of OpenAI for short notes
+(LLM_FAST_PATH_CHARS), while the circuit breaker is open, or always
+with EXTRACTION_BACKEND=rules.
+stream_extract_and_summarize() streams the extraction completion and
+yields each task as soon as its JSON object is complete.
+Steps that fall back to no tasks or the placeholder summary after an
+error are reported through track_degraded(), so such a result is never
+kept as the note's final answer.
 """
-from openai import OpenAI
-from app.config import get_settings
-from app.models import ExtractedTask, TaskExtractionResponse, MeetingSummary
+import asyncio
 import json
+import math
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Callable, Iterator, List, Optional, Tuple, TypeVar, Union
+from openai import AsyncOpenAI
+from app.config import get_settings
+from app.models import ExtractedTask, TaskExtractionResponse, MeetingSummary, CombinedExtractionResponse
+from app.services.llm_metrics import LLMMetrics
+from app.services.llm_cache import LLMResponseCache, prompt_version
+from app.services.llm_scheduler import LLMScheduler, LLMUnavailableError, estimate_tokens, retry_after_seconds, with_deadline
+from app.services.rule_extractor import RuleBasedExtractor
+from app.services.task_importer import RecordParser
+from app.services.transcript_chunker import chunk_transcript
+from app.services.validator import TaskValidator
+from app.utils.idempotency import SingleFlight
 
-class LLMExtractor:
-    def __init__(self):
-        settings = get_settings()
-        self.client = OpenAI(api_key=settings.openai_api_key)
-    
-    def extract_tasks(self, meeting_text: str) -> list[ExtractedTask]:
-        """
-        Extract structured tasks from meeting text.
-        """
-        
-        system_prompt = """You are a precise task extraction AI. Extract actionable tasks from meeting notes.
+MODEL = "gpt-4o-mini"
 
-EXTRACTION RULES:
+EXTRACTION_RULES = """EXTRACTION RULES:
 1. Extract ONLY actionable tasks (things that need to be done)
 2. Ignore general discussion, decisions, or background info
 3. For each task, identify:
@@ -47,7 +74,11 @@ OWNER DETECTION:
 - "I will", "I'll", "I need to" → "Self"
 - "We need to", "Someone should" → "Self"
 - "Team will" → "Team"
-- Unclear → "Self"
+- Unclear → "Self\""""
+
+EXTRACTION_SYSTEM_PROMPT = """You are a precise task extraction AI. Extract actionable tasks from meeting notes.
+
+""" + EXTRACTION_RULES + """
 
 OUTPUT FORMAT:
 Return ONLY valid JSON:
@@ -64,45 +95,19 @@ Return ONLY valid JSON:
 
 If no tasks found, return: {"tasks": []}"""
 
-        user_prompt = f"""Extract all actionable tasks from this meeting summary:
+EXTRACTION_USER_TEMPLATE = """Extract all actionable tasks from this meeting summary:
 
 {meeting_text}
 
 Remember: Return ONLY the JSON object, nothing else."""
 
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.3,
-                max_tokens=2000
-            )
-            
-            content = response.choices[0].message.content
-            parsed = json.loads(content)
-            extraction = TaskExtractionResponse(**parsed)
-            
-            print(f"[LLM] Extracted {len(extraction.tasks)} tasks")
-            return extraction.tasks
-            
-        except json.JSONDecodeError as e:
-            print(f"[ERROR] JSON parsing error: {e}")
-            return []
-        except Exception as e:
-            print(f"[ERROR] OpenAI extraction error: {e}")
-            return []
-    
-    def generate_meeting_summary(self, meeting_text: str) -> MeetingSummary:
-        """
-        Generate a comprehensive meeting summary.
-        FEATURE: Meeting Summary Generator
-        """
-        
-        system_prompt = """You are a meeting summarization expert. Generate a crisp meeting summary.
+CHUNK_USER_TEMPLATE = """Extract all actionable tasks from this excerpt of a longer meeting. It may begin with a few lines repeated from the previous excerpt.
+
+{meeting_text}
+
+Remember: Return ONLY the JSON object, nothing else."""
+
+SUMMARY_SYSTEM_PROMPT = """You are a meeting summarization expert. Generate a crisp meeting summary.
 
 Extract:
 1. Summary: 2-3 sentence overview of the meeting
@@ -120,28 +125,608 @@ Return JSON format:
   "participants": ["string"]
 }"""
 
+SUMMARY_USER_TEMPLATE = "Summarize this meeting:\n\n{meeting_text}"
+
+# FEATURE: Combined mode - tasks and summary from one completion
+COMBINED_SYSTEM_PROMPT = """You are a precise meeting analyst. From the meeting notes, extract the actionable tasks and a crisp meeting summary.
+
+""" + EXTRACTION_RULES + """
+
+SUMMARY:
+- summary: 2-3 sentence overview of the meeting
+- key_decisions: Important decisions made
+- blockers: Any obstacles or blockers mentioned
+- risks: Potential risks or concerns
+- participants: People mentioned in the meeting
+
+OUTPUT FORMAT:
+Return ONLY valid JSON:
+{
+  "tasks": [
+    {
+      "task_name": "string",
+      "owner": "string",
+      "due_date": "string",
+      "priority": "High|Medium|Low"
+    }
+  ],
+  "summary": "string",
+  "key_decisions": ["string"],
+  "blockers": ["string"],
+  "risks": ["string"],
+  "participants": ["string"]
+}
+
+If no tasks found, use "tasks": []"""
+
+COMBINED_USER_TEMPLATE = """Extract all actionable tasks from these meeting notes and summarize the meeting:
+
+{meeting_text}
+
+Remember: Return ONLY the JSON object, nothing else."""
+
+# Part of every cache key: editing a prompt invalidates its cached responses
+PROMPT_VERSIONS = {
+    "extract": prompt_version(EXTRACTION_SYSTEM_PROMPT, EXTRACTION_USER_TEMPLATE),
+    "extract_chunk": prompt_version(EXTRACTION_SYSTEM_PROMPT, CHUNK_USER_TEMPLATE),
+    "summary": prompt_version(SUMMARY_SYSTEM_PROMPT, SUMMARY_USER_TEMPLATE),
+    "combined": prompt_version(COMBINED_SYSTEM_PROMPT, COMBINED_USER_TEMPLATE),
+}
+
+T = TypeVar("T")
+
+
+def parse_task_rows(content: str) -> Tuple[List[ExtractedTask], int]:
+    """
+    Tasks of an extraction response and how many rows were skipped for
+    failing validation, as the stream parser skips them. Raises
+    ValueError unless the content is a JSON object with a tasks list.
+    """
+    data = json.loads(content)
+    rows = data.get("tasks") if isinstance(data, dict) else None
+    if not isinstance(rows, list):
+        raise ValueError("response has no tasks list")
+    tasks = []
+    for row in rows:
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"Summarize this meeting:\n\n{meeting_text}"}
-                ],
-                response_format={"type": "json_object"},
+            tasks.append(ExtractedTask(**row))
+        except (ValueError, TypeError):
+            continue
+    return tasks, len(rows) - len(tasks)
+
+
+def merge_chunk_tasks(chunk_results: List[List[ExtractedTask]]) -> List[ExtractedTask]:
+    """
+    Tasks from all chunks in transcript order, dropping the ones already
+    seen in an earlier chunk (overlap repeats them).
+    """
+    merged: List[ExtractedTask] = []
+    for tasks in chunk_results:
+        for task in tasks:
+            if not TaskValidator.check_duplicate(task, merged):
+                merged.append(task)
+    return merged
+
+
+class TaskStreamParser:
+    """
+    Task objects from a streamed {"tasks": [...]} completion, each as soon
+    as it is complete. Once the array opens, the rest is fed to the
+    importer's RecordParser. A response laid out differently yields
+    nothing here and is parsed whole at the end instead.
+    """
+
+    PREFIX = re.compile(r'\s*\{\s*"tasks"\s*:\s*(?=\[)')
+
+    def __init__(self):
+        self._head = ""
+        self._rows: Optional[RecordParser] = None
+
+    def feed(self, text: str) -> List[dict]:
+        if self._rows is None:
+            self._head += text
+            match = self.PREFIX.match(self._head)
+            if not match:
+                return []
+            self._rows = RecordParser()
+            text, self._head = self._head[match.end():], ""
+        return [value for _, value in self._rows.feed(text.encode("utf-8")) if isinstance(value, dict)]
+
+
+# Steps of the current note that degraded after an error; see track_degraded()
+degraded_steps: ContextVar[Optional[List[str]]] = ContextVar("degraded_steps", default=None)
+
+
+@contextmanager
+def track_degraded() -> Iterator[List[str]]:
+    """
+    Collect the extraction steps run inside this block (tasks started
+    from it included) that answered with no tasks or the placeholder
+    summary because of an error.
+    """
+    steps: List[str] = []
+    token = degraded_steps.set(steps)
+    try:
+        yield steps
+    finally:
+        degraded_steps.reset(token)
+
+
+def mark_degraded(step: str):
+    steps = degraded_steps.get()
+    if steps is not None:
+        steps.append(step)
+
+
+def unavailable_summary() -> MeetingSummary:
+    """Placeholder used when the summary call fails."""
+    return MeetingSummary(
+        summary="Summary unavailable",
+        key_decisions=[],
+        blockers=[],
+        risks=[],
+        participants=[]
+    )
+
+
+class LLMExtractor:
+    def __init__(self):
+        settings = get_settings()
+        self.timeout = settings.llm_timeout_seconds
+        self.combined_mode = settings.llm_combined_mode
+        self.backend = settings.extraction_backend
+        self.fast_path_chars = settings.llm_fast_path_chars
+        self.rule_fallback = settings.llm_rule_fallback
+        self.rules = RuleBasedExtractor()
+        self.chunk_chars = settings.llm_chunk_chars
+        self.chunk_overlap_chars = settings.llm_chunk_overlap_chars
+        self.chunk_concurrency = max(1, settings.llm_chunk_concurrency)
+        # Retries are the scheduler's job, so the client doesn't add its own
+        self.client = AsyncOpenAI(api_key=settings.openai_api_key, timeout=self.timeout, max_retries=0)
+        self.scheduler = LLMScheduler(
+            requests_per_minute=settings.openai_requests_per_minute,
+            tokens_per_minute=settings.openai_tokens_per_minute,
+            max_concurrency=settings.llm_max_concurrency,
+            max_retries=settings.llm_max_retries,
+            backoff_base_seconds=settings.llm_backoff_base_seconds,
+            backoff_max_seconds=settings.llm_backoff_max_seconds,
+            breaker_threshold=settings.llm_breaker_threshold,
+            breaker_reset_seconds=settings.llm_breaker_reset_seconds
+        )
+        self.metrics = LLMMetrics()
+        self.cache = LLMResponseCache(
+            max_entries=settings.llm_cache_size,
+            ttl_seconds=settings.llm_cache_ttl_seconds,
+            file_path=settings.llm_cache_file or None
+        )
+        self.single_flight = SingleFlight()
+
+    async def _complete(
+        self,
+        purpose: str,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        max_tokens: int
+    ) -> str:
+        """
+        One JSON-mode chat completion, scheduled; returns the message content.
+        Completion tokens count against the token budget too, so the
+        estimate includes max_tokens.
+        """
+        started = time.perf_counter()
+        try:
+            response = await self.scheduler.run(
+                estimate_tokens(system_prompt, user_prompt) + max_tokens,
+                lambda: self.client.chat.completions.create(
+                    model=MODEL,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    response_format={"type": "json_object"},
+                    temperature=temperature,
+                    max_tokens=max_tokens
+                )
+            )
+        except Exception:
+            self.metrics.record_call(purpose, time.perf_counter() - started, failed=True)
+            raise
+        self.metrics.record_call(purpose, time.perf_counter() - started, response.usage)
+        return response.choices[0].message.content
+
+    async def _complete_cached(
+        self,
+        purpose: str,
+        system_prompt: str,
+        user_template: str,
+        meeting_text: str,
+        temperature: float,
+        max_tokens: int,
+        parse: Callable[[str], T]
+    ) -> T:
+        """
+        Parsed completion for `meeting_text`, served from the cache when an
+        identical request was answered before, or shared with an identical
+        request still in flight. Content is only cached once `parse`
+        accepts it; parse and API errors propagate to every caller.
+        """
+        key = self.cache.make_key(purpose, MODEL, temperature, PROMPT_VERSIONS[purpose], meeting_text)
+        content = self.cache.get(key)
+        if content is not None:
+            return parse(content)
+
+        async def complete() -> T:
+            content = await self._complete(
+                purpose,
+                system_prompt,
+                user_template.format(meeting_text=meeting_text),
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+            result = parse(content)
+            self.cache.put(key, content)
+            return result
+
+        result, _ = await self.single_flight.run(key, complete)
+        return result
+
+    def chunk(self, meeting_text: str) -> List[str]:
+        """The transcript as extraction chunks; a single one unless it is long."""
+        if self.chunk_chars <= 0:
+            return [meeting_text]
+        return chunk_transcript(meeting_text, self.chunk_chars, self.chunk_overlap_chars)
+
+    async def extract_tasks(self, meeting_text: str, chunks: Optional[List[str]] = None) -> List[ExtractedTask]:
+        """
+        Extract structured tasks from meeting text.
+        Long transcripts are extracted chunk by chunk, at most
+        LLM_CHUNK_CONCURRENCY calls at a time, and the results merged.
+        """
+        chunks = chunks or self.chunk(meeting_text)
+        if len(chunks) == 1:
+            return await self._extract("extract", EXTRACTION_USER_TEMPLATE, meeting_text)
+
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.chunk_concurrency)
+
+        async def extract_chunk(chunk: str) -> List[ExtractedTask]:
+            async with semaphore:
+                return await self._extract("extract_chunk", CHUNK_USER_TEMPLATE, chunk)
+
+        results = await asyncio.gather(*(extract_chunk(chunk) for chunk in chunks))
+        tasks = merge_chunk_tasks(results)
+        print(
+            f"[LLM] Merged {sum(len(r) for r in results)} tasks from {len(chunks)} chunks "
+            f"into {len(tasks)} in {time.perf_counter() - started:.2f}s"
+        )
+        return tasks
+
+    async def _extract(self, purpose: str, user_template: str, text: str) -> List[ExtractedTask]:
+        """
+        One extraction call; failures log and yield no tasks, except
+        LLMUnavailableError, which must not pass for an empty note.
+        """
+        try:
+            extraction = await self._complete_cached(
+                purpose,
+                EXTRACTION_SYSTEM_PROMPT,
+                user_template,
+                text,
+                temperature=0.3,
+                max_tokens=2000,
+                parse=lambda content: TaskExtractionResponse(**json.loads(content))
+            )
+
+            print(f"[LLM] Extracted {len(extraction.tasks)} tasks")
+            return extraction.tasks
+
+        except json.JSONDecodeError as e:
+            print(f"[ERROR] JSON parsing error: {e}")
+            mark_degraded(purpose)
+            return []
+        except LLMUnavailableError:
+            raise
+        except Exception as e:
+            print(f"[ERROR] OpenAI extraction error: {e}")
+            mark_degraded(purpose)
+            return []
+
+    async def generate_meeting_summary(self, meeting_text: str) -> MeetingSummary:
+        """
+        Generate a comprehensive meeting summary.
+        FEATURE: Meeting Summary Generator
+        """
+        try:
+            return await self._complete_cached(
+                "summary",
+                SUMMARY_SYSTEM_PROMPT,
+                SUMMARY_USER_TEMPLATE,
+                meeting_text,
                 temperature=0.4,
-                max_tokens=1000
+                max_tokens=1000,
+                parse=lambda content: MeetingSummary(**json.loads(content))
             )
-            
-            content = response.choices[0].message.content
-            parsed = json.loads(content)
-            return MeetingSummary(**parsed)
-            
+
         except Exception as e:
             print(f"[ERROR] Summary generation error: {e}")
-            return MeetingSummary(
-                summary="Summary unavailable",
-                key_decisions=[],
-                blockers=[],
-                risks=[],
-                participants=[]
-            )
\ No newline at end of file
+            mark_degraded("summary")
+            return unavailable_summary()
+
+    async def extract_combined(self, meeting_text: str) -> Optional[Tuple[List[ExtractedTask], MeetingSummary]]:
+        """
+        Tasks and summary from a single completion.
+        Returns None when the response doesn't validate, so the caller can
+        fall back to separate calls; other API errors degrade like the
+        separate calls do (no tasks, placeholder summary).
+        """
+        try:
+            combined = await self._complete_cached(
+                "combined",
+                COMBINED_SYSTEM_PROMPT,
+                COMBINED_USER_TEMPLATE,
+                meeting_text,
+                temperature=0.3,
+                max_tokens=3000,
+                parse=lambda content: CombinedExtractionResponse(**json.loads(content))
+            )
+        except (ValueError, TypeError) as e:
+            # JSON and validation errors; OpenAI's own errors aren't ValueErrors
+            print(f"[LLM] ⚠️ Combined response invalid, falling back to separate calls: {e}")
+            return None
+        except LLMUnavailableError:
+            raise
+        except Exception as e:
+            print(f"[ERROR] OpenAI combined extraction error: {e}")
+            mark_degraded("combined")
+            return [], unavailable_summary()
+
+        print(f"[LLM] Extracted {len(combined.tasks)} tasks and summary in one call")
+        return combined.tasks, MeetingSummary(**combined.model_dump(exclude={"tasks"}))
+
+    async def _extract_and_summarize(
+        self,
+        meeting_text: str,
+        chunks: List[str]
+    ) -> Tuple[List[ExtractedTask], MeetingSummary]:
+        started = time.perf_counter()
+        mode = "separate" if len(chunks) == 1 else "chunked"
+        # A combined call would truncate a long transcript's task list
+        if self.combined_mode and len(chunks) == 1:
+            result = await self.extract_combined(meeting_text)
+            if result is not None:
+                self.metrics.record_note("combined", time.perf_counter() - started)
+                return result
+            mode = "fallback"
+
+        tasks, summary = await asyncio.gather(
+            self.extract_tasks(meeting_text, chunks),
+            self.generate_meeting_summary(meeting_text)
+        )
+        self.metrics.record_note(mode, time.perf_counter() - started)
+        return tasks, summary
+
+    async def extract_and_summarize(self, meeting_text: str) -> Tuple[List[ExtractedTask], MeetingSummary]:
+        """
+        Tasks and summary for one note: from the rule engine when the
+        backend, fast path or open breaker calls for it, otherwise one
+        combined call when LLM_COMBINED_MODE is on, or both calls
+        concurrently.
+        Raises asyncio.TimeoutError if that takes longer than the
+        configured timeout, allowed once per round of concurrent chunk
+        calls for a long transcript. Retries stop at that same deadline,
+        raising LLMUnavailableError first when a backoff would outlast it.
+        Calls still in flight then run on (each is bounded by the client
+        timeout) so other callers sharing them and a retry hitting the
+        cache still get their result.
+        """
+        rules_mode = self._rules_mode(meeting_text)
+        if rules_mode:
+            return await self._extract_with_rules(meeting_text, rules_mode)
+
+        chunks = self.chunk(meeting_text)
+        timeout = self.timeout_for(chunks)
+        try:
+            return await asyncio.wait_for(
+                with_deadline(time.monotonic() + timeout, self._extract_and_summarize(meeting_text, chunks)),
+                timeout=timeout
+            )
+        except LLMUnavailableError:
+            # Only an open breaker; retries running out alone still surfaces
+            if self.rule_fallback and self.scheduler.breaker.state == "open":
+                return await self._extract_with_rules(meeting_text, "rules_fallback")
+            raise
+
+    def timeout_for(self, chunks: List[str]) -> float:
+        """The note timeout, allowed once per round of concurrent chunk calls."""
+        return self.timeout * math.ceil(len(chunks) / self.chunk_concurrency)
+
+    def _rules_mode(self, meeting_text: str) -> Optional[str]:
+        """Why this note goes to the rule engine, or None for OpenAI."""
+        if self.backend == "rules":
+            return "rules"
+        if len(meeting_text) <= self.fast_path_chars:
+            return "fast_path"
+        if self.rule_fallback and self.scheduler.breaker.state == "open":
+            return "rules_fallback"
+        return None
+
+    async def _extract_with_rules(self, meeting_text: str, mode: str) -> Tuple[List[ExtractedTask], MeetingSummary]:
+        started = time.perf_counter()
+        tasks, summary = await self.rules.extract_and_summarize(meeting_text)
+        self.metrics.record_note(mode, time.perf_counter() - started)
+        print(f"[LLM] Rule engine ({mode}) extracted {len(tasks)} tasks")
+        return tasks, summary
+
+    async def stream_tasks(self, meeting_text: str, deadline: Optional[float] = None) -> AsyncIterator[ExtractedTask]:
+        """
+        Extract tasks with a streamed completion, yielding each task as soon
+        as its object has arrived. A cached response is replayed instead.
+        A stream that breaks off after the request was accepted counts as a
+        failure for the circuit breaker and raises LLMUnavailableError, as
+        does a completed response that isn't a valid extraction, so a
+        partial task list is never taken for the whole note.
+        """
+        key = self.cache.make_key("extract", MODEL, 0.3, PROMPT_VERSIONS["extract"], meeting_text)
+        content = self.cache.get(key)
+        if content is not None:
+            for task in parse_task_rows(content)[0]:
+                yield task
+            return
+
+        user_prompt = EXTRACTION_USER_TEMPLATE.format(meeting_text=meeting_text)
+        started = time.perf_counter()
+        parser = TaskStreamParser()
+        parts: List[str] = []
+        usage = None
+        yielded: Counter = Counter()  # field values of each task already yielded
+        stream = None
+        try:
+            stream = await self.scheduler.run(
+                estimate_tokens(EXTRACTION_SYSTEM_PROMPT, user_prompt) + 2000,
+                lambda: self.client.chat.completions.create(
+                    model=MODEL,
+                    messages=[
+                        {"role": "system", "content": EXTRACTION_SYSTEM_PROMPT},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    response_format={"type": "json_object"},
+                    temperature=0.3,
+                    max_tokens=2000,
+                    stream=True,
+                    stream_options={"include_usage": True}
+                ),
+                deadline=deadline
+            )
+            async for chunk in stream:
+                if chunk.usage:
+                    usage = chunk.usage
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                parts.append(chunk.choices[0].delta.content)
+                for row in parser.feed(parts[-1]):
+                    try:
+                        task = ExtractedTask(**row)
+                    except (ValueError, TypeError):
+                        continue
+                    yielded[tuple(task.model_dump().values())] += 1
+                    yield task
+        except LLMUnavailableError:
+            self.metrics.record_call("extract_stream", time.perf_counter() - started, failed=True)
+            raise
+        except Exception as e:
+            self.metrics.record_call("extract_stream", time.perf_counter() - started, failed=True)
+            if stream is None:
+                # Rejected outright (bad request, auth): no tasks, like _extract()
+                print(f"[ERROR] OpenAI streaming extraction error: {e}")
+                mark_degraded("extract_stream")
+                return
+            self.scheduler.breaker.record_failure()
+            raise LLMUnavailableError(
+                f"OpenAI stream failed after {yielded.total()} tasks: {e!r}",
+                retry_after=retry_after_seconds(e)
+            ) from e
+        finally:
+            if stream is not None:
+                await stream.close()  # releases the connection if the caller stopped early
+        self.metrics.record_call("extract_stream", time.perf_counter() - started, usage)
+
+        content = "".join(parts)
+        try:
+            tasks, skipped = parse_task_rows(content)
+        except ValueError as e:
+            print(f"[ERROR] Streamed extraction invalid: {e}")
+            raise LLMUnavailableError(f"OpenAI streamed an invalid extraction after {yielded.total()} tasks: {e}") from e
+        if not skipped:
+            # Only what extract_tasks() would accept too; it shares the entry
+            self.cache.put(key, content)
+        # Whatever the incremental parser couldn't see (unexpected layout)
+        for task in tasks:
+            identity = tuple(task.model_dump().values())
+            if yielded[identity]:
+                yielded[identity] -= 1
+                continue
+            yield task
+        print(f"[LLM] Streamed {len(tasks)} tasks in {time.perf_counter() - started:.2f}s")
+
+    async def _stream_chunked(self, chunks: List[str], deadline: Optional[float] = None) -> AsyncIterator[ExtractedTask]:
+        """Chunk extractions as they finish (not in transcript order), deduplicated."""
+        semaphore = asyncio.Semaphore(self.chunk_concurrency)
+
+        async def extract_chunk(chunk: str) -> List[ExtractedTask]:
+            async with semaphore:
+                return await self._extract("extract_chunk", CHUNK_USER_TEMPLATE, chunk)
+
+        pending = [asyncio.ensure_future(with_deadline(deadline, extract_chunk(chunk))) for chunk in chunks]
+        seen: List[ExtractedTask] = []
+        try:
+            for finished in asyncio.as_completed(pending):
+                for task in await finished:
+                    if not TaskValidator.check_duplicate(task, seen):
+                        seen.append(task)
+                        yield task
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def stream_extract_and_summarize(
+        self,
+        meeting_text: str,
+        deadline: Optional[float] = None
+    ) -> AsyncIterator[Union[ExtractedTask, MeetingSummary]]:
+        """
+        Yield each ExtractedTask as soon as it is available, then the
+        MeetingSummary last. The summary call runs alongside the stream.
+        Long transcripts stream per finished chunk; rule-engine notes
+        yield everything at once. Callers enforce the timeout
+        (timeout_for) between items and pass the matching `deadline`
+        (time.monotonic()), after which OpenAI calls stop retrying.
+        If the circuit breaker opens mid-note, the rule engine's tasks
+        follow whatever was already yielded; callers drop the duplicates.
+        """
+        rules_mode = self._rules_mode(meeting_text)
+        if rules_mode:
+            tasks, summary = await self._extract_with_rules(meeting_text, rules_mode)
+            for task in tasks:
+                yield task
+            yield summary
+            return
+
+        started = time.perf_counter()
+        chunks = self.chunk(meeting_text)
+        summary_task = asyncio.ensure_future(with_deadline(deadline, self.generate_meeting_summary(meeting_text)))
+        try:
+            if len(chunks) == 1:
+                source = self.stream_tasks(meeting_text, deadline)
+            else:
+                source = self._stream_chunked(chunks, deadline)
+            async for task in source:
+                yield task
+            summary = await summary_task
+        except LLMUnavailableError:
+            # Only an open breaker; retries running out alone still surfaces
+            if not (self.rule_fallback and self.scheduler.breaker.state == "open"):
+                raise
+            summary = None
+        finally:
+            summary_task.cancel()
+
+        if summary is None:
+            tasks, summary = await self._extract_with_rules(meeting_text, "rules_fallback")
+            for task in tasks:
+                yield task
+        else:
+            self.metrics.record_note("streamed", time.perf_counter() - started)
+        yield summary
+
+    def stats(self) -> dict:
+        """Current mode plus per-call and per-note metrics for /health."""
+        return {
+            "backend": self.backend,
+            "mode": "combined" if self.combined_mode else "separate",
+            "fast_path_chars": self.fast_path_chars,
+            **self.metrics.stats(),
+            "cache": self.cache.stats(),
+            "single_flight": self.single_flight.stats(),
+            "scheduler": self.scheduler.stats()
+        }
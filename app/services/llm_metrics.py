@@ -0,0 +1,67 @@
+"""
+Token and latency counters for LLM calls.
+FEATURE: Extraction Mode Metrics
+Calls are counted per purpose (extract, summary, combined) and notes per
+extraction mode, so /health can compare what a note costs with two calls
+against one combined call.
+"""
+from typing import Dict, Optional
+
+
+class LLMMetrics:
+    """In-process counters; reset when the worker restarts."""
+
+    def __init__(self):
+        self.calls: Dict[str, dict] = {}
+        self.notes: Dict[str, dict] = {}
+
+    def record_call(self, purpose: str, seconds: float, usage=None, failed: bool = False):
+        entry = self.calls.setdefault(purpose, {
+            "calls": 0, "failures": 0, "prompt_tokens": 0, "completion_tokens": 0, "seconds": 0.0
+        })
+        entry["calls"] += 1
+        entry["seconds"] += seconds
+        if failed:
+            entry["failures"] += 1
+        if usage is not None:
+            entry["prompt_tokens"] += usage.prompt_tokens or 0
+            entry["completion_tokens"] += usage.completion_tokens or 0
+
+    def record_note(self, mode: str, seconds: float):
+        entry = self.notes.setdefault(mode, {"notes": 0, "seconds": 0.0})
+        entry["notes"] += 1
+        entry["seconds"] += seconds
+
+    def _avg_tokens(self, purpose: str) -> Optional[float]:
+        entry = self.calls.get(purpose)
+        if not entry or not entry["calls"]:
+            return None
+        return (entry["prompt_tokens"] + entry["completion_tokens"]) / entry["calls"]
+
+    def _avg_latency_ms(self, mode: str) -> Optional[float]:
+        entry = self.notes.get(mode)
+        if not entry or not entry["notes"]:
+            return None
+        return round(entry["seconds"] / entry["notes"] * 1000, 1)
+
+    def stats(self) -> dict:
+        """Raw counters plus per-note averages for each mode."""
+        extract, summary = self._avg_tokens("extract"), self._avg_tokens("summary")
+        combined = self._avg_tokens("combined")
+        return {
+            "calls": {
+                purpose: {**entry, "seconds": round(entry["seconds"], 3)}
+                for purpose, entry in self.calls.items()
+            },
+            "notes": {mode: entry["notes"] for mode, entry in self.notes.items()},
+            "comparison": {
+                "separate": {
+                    "avg_tokens_per_note": round(extract + summary) if extract is not None and summary is not None else None,
+                    "avg_latency_ms": self._avg_latency_ms("separate")
+                },
+                "combined": {
+                    "avg_tokens_per_note": round(combined) if combined is not None else None,
+                    "avg_latency_ms": self._avg_latency_ms("combined")
+                }
+            }
+        }
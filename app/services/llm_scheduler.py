@@ -0,0 +1,299 @@
+"""
+Client-side scheduling of OpenAI calls.
+FEATURE: Rate limiting and backoff
+Every call waits for request and token budget (token buckets refilled
+per minute), runs under a concurrency cap, and on a rate limit or
+transient error is retried with jittered exponential backoff that
+honors Retry-After. A 429 pauses all callers, not just the one that
+got it. After repeated failures a circuit breaker fails calls fast
+until a cool-down has passed. Giving up raises LLMUnavailableError,
+so callers can tell "OpenAI is unavailable" from "no tasks found".
+Retries and budget waits also stop at the caller's deadline (see
+with_deadline), so a note gets its 503 and Retry-After before its own
+timeout turns it into a 504, and no call keeps waiting for a request
+that is gone.
+"""
+import asyncio
+import random
+import time
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Optional, TypeVar
+import openai
+
+T = TypeVar("T")
+
+# time.monotonic() by which the current note must be answered, if any;
+# inherited by tasks started under with_deadline()
+call_deadline: ContextVar[Optional[float]] = ContextVar("call_deadline", default=None)
+
+
+class LLMUnavailableError(Exception):
+    """OpenAI could not be reached within the retry budget, or the breaker is open."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+async def with_deadline(deadline: Optional[float], awaitable: Awaitable[T]) -> T:
+    """Await `awaitable` with every LLMScheduler.run() inside it retrying only until `deadline`."""
+    token = call_deadline.set(deadline)
+    try:
+        return await awaitable
+    finally:
+        call_deadline.reset(token)
+
+
+def estimate_tokens(*texts: str) -> int:
+    """Rough prompt size: about four characters per token."""
+    return sum(len(text) for text in texts) // 4 + 1
+
+
+def is_retryable(error: Exception) -> bool:
+    """Rate limits, server errors, timeouts and dropped connections."""
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in (408, 409, 429) or error.status_code >= 500
+    return False
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Delay the server asked for via retry-after-ms or Retry-After, if any."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    `per_minute` units refilled continuously; acquire() waits for enough.
+    A limit of 0 disables the bucket.
+    """
+
+    def __init__(self, per_minute: int):
+        self.capacity = per_minute
+        self.rate = per_minute / 60
+        self.available = float(per_minute)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float, deadline: Optional[float] = None) -> float:
+        """
+        Take `amount` (capped at the capacity); returns seconds waited.
+        Raises LLMUnavailableError rather than wait past `deadline`
+        (time.monotonic()), whether queued behind other waiters or for refill.
+        """
+        if self.capacity <= 0:
+            return 0.0
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        # One waiter at a time, so a large request isn't starved by small ones
+        if deadline is None or not self._lock.locked():
+            await self._lock.acquire()
+        else:
+            try:
+                await asyncio.wait_for(self._lock.acquire(), max(0.0, deadline - time.monotonic()))
+            except asyncio.TimeoutError:
+                raise LLMUnavailableError("OpenAI rate budget queue runs past the request deadline") from None
+        try:
+            self._refill()
+            while self.available < amount:
+                delay = (amount - self.available) / self.rate
+                if deadline is not None and time.monotonic() + delay >= deadline:
+                    raise LLMUnavailableError(
+                        "OpenAI rate budget exhausted past the request deadline",
+                        retry_after=delay
+                    )
+                await asyncio.sleep(delay)
+                waited += delay
+                self._refill()
+            self.available -= amount
+        finally:
+            self._lock.release()
+        return waited
+
+
+class CircuitBreaker:
+    """
+    Opens after `threshold` consecutive failures and rejects calls for
+    `reset_seconds`; then lets calls through again (half-open) and
+    closes on the first success. A threshold of 0 disables it.
+    """
+
+    def __init__(self, threshold: int = 5, reset_seconds: float = 30.0):
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "open" if self._remaining() > 0 else "half-open"
+
+    def _remaining(self) -> float:
+        return self.opened_at + self.reset_seconds - time.monotonic()
+
+    def check(self):
+        """Raise LLMUnavailableError while the breaker is open."""
+        if self.opened_at is not None and self._remaining() > 0:
+            raise LLMUnavailableError(
+                "OpenAI circuit breaker is open after repeated failures",
+                retry_after=self._remaining()
+            )
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.threshold > 0 and self.failures >= self.threshold:
+            if self.opened_at is None or self._remaining() <= 0:
+                self.trips += 1
+                print(f"[LLM] ⚠️ Circuit breaker open for {self.reset_seconds}s after {self.failures} failures")
+            self.opened_at = time.monotonic()
+
+
+class LLMScheduler:
+    """
+    Wraps each OpenAI call in rate limiting, a concurrency cap, retries
+    and a circuit breaker. Limits are per worker process.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = 500,
+        tokens_per_minute: int = 200000,
+        max_concurrency: int = 8,
+        max_retries: int = 4,
+        backoff_base_seconds: float = 1.0,
+        backoff_max_seconds: float = 30.0,
+        breaker_threshold: int = 5,
+        breaker_reset_seconds: float = 30.0
+    ):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max(1, max_concurrency)
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.breaker = CircuitBreaker(breaker_threshold, breaker_reset_seconds)
+        self._paused_until = 0.0
+        self.in_flight = 0
+        self.throttled_seconds = 0.0
+        self.retries = 0
+        self.rate_limited = 0
+        self.gave_up = 0
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """Retry-After when given, else full-jitter exponential backoff."""
+        requested = retry_after_seconds(error)
+        if requested is not None:
+            return min(requested, self.backoff_max_seconds)
+        ceiling = min(self.backoff_max_seconds, self.backoff_base_seconds * 2 ** attempt)
+        return random.uniform(0, ceiling)
+
+    async def _wait_for_budget(self, estimated_tokens: int, deadline: Optional[float]):
+        pause = self._paused_until - time.monotonic()
+        if pause > 0:
+            if deadline is not None and time.monotonic() + pause >= deadline:
+                raise LLMUnavailableError("OpenAI rate limited past the request deadline", retry_after=pause)
+            await asyncio.sleep(pause)
+            self.throttled_seconds += pause
+        self.throttled_seconds += await self.requests.acquire(1, deadline)
+        self.throttled_seconds += await self.tokens.acquire(estimated_tokens, deadline)
+
+    async def run(
+        self,
+        estimated_tokens: int,
+        call: Callable[[], Awaitable[T]],
+        deadline: Optional[float] = None
+    ) -> T:
+        """
+        Result of `call()` once budget allows, retrying transient errors.
+        Non-retryable errors (bad request, auth) propagate unchanged;
+        exhausting the retries, an open breaker, or a wait that would run
+        past `deadline` (time.monotonic(); defaults to call_deadline)
+        raises LLMUnavailableError.
+        """
+        if deadline is None:
+            deadline = call_deadline.get()
+        attempt = 0
+        while True:
+            self.breaker.check()
+            try:
+                await self._wait_for_budget(estimated_tokens, deadline)
+            except LLMUnavailableError:
+                self.gave_up += 1
+                raise
+            async with self.semaphore:
+                self.in_flight += 1
+                try:
+                    result = await call()
+                except Exception as e:
+                    if not is_retryable(e):
+                        raise
+                    error = e
+                else:
+                    self.breaker.record_success()
+                    return result
+                finally:
+                    self.in_flight -= 1
+
+            self.breaker.record_failure()
+            delay = self._backoff(attempt, error)
+            if getattr(error, "status_code", None) == 429:
+                self.rate_limited += 1
+                # Everyone backs off, not only the caller that was told to
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            out_of_time = deadline is not None and time.monotonic() + delay >= deadline
+            if attempt >= self.max_retries or out_of_time:
+                self.gave_up += 1
+                raise LLMUnavailableError(
+                    f"OpenAI unavailable after {attempt + 1} attempts"
+                    f"{' (next retry would pass the deadline)' if out_of_time else ''}: {error}",
+                    retry_after=delay
+                ) from error
+            attempt += 1
+            self.retries += 1
+            print(f"[LLM] ⏳ {type(error).__name__}, retry {attempt}/{self.max_retries} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "throttled_seconds": round(self.throttled_seconds, 3),
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "gave_up": self.gave_up,
+            "breaker": {
+                "state": self.breaker.state,
+                "consecutive_failures": self.breaker.failures,
+                "trips": self.breaker.trips
+            }
+        }
@@ -0,0 +1,561 @@
+"""
+Time-partitioned JSON storage.
+Tasks are split into one segment per `created_at` month. Recent months
+are ordinary JSONStorage files kept hot in memory; older months are
+gzip-compressed and only opened on demand, located through a small
+manifest (id range, note ids and counters per archived segment).
+Hot-path work therefore scales with recent volume, not total history.
+"""
+import gzip
+import heapq
+import json
+import os
+import re
+import tempfile
+import threading
+from datetime import datetime
+from itertools import count, islice
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from app.models import EnhancedTask, StoredTask
+from app.services.json_storage import JSONStorage
+from app.services.task_aggregates import TaskAggregates
+from app.services.task_indexes import SecondaryIndexes
+from app.utils.file_lock import FileLock
+from app.utils import codec
+
+SEGMENT_NAME = re.compile(r"^(\d{4}-\d{2})\.json$")
+
+
+def month_key(created_at: str) -> str:
+    """Segment a task belongs to: the 'YYYY-MM' of its creation time."""
+    return created_at[:7]
+
+
+def months_back(month: str, count: int) -> str:
+    """The month `count` months before `month` (both 'YYYY-MM')."""
+    year, mon = map(int, month.split("-"))
+    index = year * 12 + (mon - 1) - count
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+class PartitionedJSONStorage:
+
+    storage_type = "JSON (partitioned)"
+
+    # Decompressed archives kept around for repeated lookups
+    ARCHIVE_CACHE_SIZE = 2
+
+    def __init__(self, file_path: str = "tasks.json", hot_months: int = 2, compact_json: bool = False):
+        legacy_path = Path(file_path)
+        self.compact_json = compact_json
+        self.file_path = legacy_path.with_name(legacy_path.stem + "_segments")
+        self.file_path.mkdir(parents=True, exist_ok=True)
+        self.hot_months = max(1, hot_months)
+        self.manifest_path = self.file_path / "manifest.json"
+        self.seq_path = self.file_path / "ids.seq"
+        self.segment_lock_path = self.file_path / "segments.lock"
+        # Segments share one id counter and one write lock; the manifest
+        # lock is always taken before the segment lock, never the other way.
+        self.manifest_lock = FileLock(self.file_path / "manifest.lock")
+        self.segment_lock = FileLock(self.segment_lock_path)
+        self.lock = threading.RLock()
+
+        self._segments: Dict[str, JSONStorage] = {}  # hot month → store
+        self._manifest: dict = {"archived": {}}
+        self._manifest_mtime = None
+        self._archive_cache: Dict[str, Tuple[int, List[dict], SecondaryIndexes]] = {}
+
+        with self.lock, self.manifest_lock:
+            if not self.manifest_path.exists():
+                self._import_legacy(legacy_path)
+            self._archive_cold_segments()
+        self._refresh()
+        print(
+            f"[STORAGE] Using partitioned JSON storage: {self.file_path.absolute()} "
+            f"({len(self._segments)} hot, {len(self._manifest['archived'])} archived segments)"
+        )
+
+    # ---- manifest and segments -------------------------------------------
+
+    def _read_manifest(self) -> dict:
+        try:
+            return json.loads(self.manifest_path.read_text())
+        except FileNotFoundError:
+            return {"archived": {}}
+
+    def _write_manifest(self, manifest: dict):
+        """Atomically replace the manifest. Needs the manifest lock."""
+        tmp_path = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            f.write(json.dumps(manifest, indent=2))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.manifest_path)
+        self._manifest = manifest
+        self._manifest_mtime = self.manifest_path.stat().st_mtime_ns
+
+    def _open_segment(self, month: str) -> JSONStorage:
+        return JSONStorage(
+            str(self.file_path / f"{month}.json"),
+            seq_path=str(self.seq_path),
+            lock_path=str(self.segment_lock_path),
+            compact_json=self.compact_json
+        )
+
+    def _refresh(self):
+        """Pick up manifest changes and segments created or archived by other workers."""
+        with self.lock:
+            try:
+                mtime = self.manifest_path.stat().st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+            if mtime != self._manifest_mtime:
+                self._manifest = self._read_manifest()
+                self._manifest_mtime = mtime
+
+            months = {
+                match.group(1)
+                for match in (SEGMENT_NAME.match(path.name) for path in self.file_path.iterdir())
+                if match
+            }
+            months -= set(self._manifest["archived"])
+            for month in set(self._segments) - months:
+                del self._segments[month]
+            for month in months - set(self._segments):
+                self._segments[month] = self._open_segment(month)
+
+    def _current_segment(self) -> JSONStorage:
+        with self.lock:
+            self._refresh()
+            month = datetime.now().strftime("%Y-%m")
+            if month not in self._segments:
+                self._segments[month] = self._open_segment(month)
+            return self._segments[month]
+
+    def _sources(self) -> List[Tuple[str, Optional[JSONStorage], Optional[dict]]]:
+        """(month, hot segment, archive entry) for every segment, newest month first."""
+        with self.lock:
+            self._refresh()
+            sources = [(month, segment, None) for month, segment in self._segments.items()]
+            sources += [(month, None, entry) for month, entry in self._manifest["archived"].items()]
+        return sorted(sources, key=lambda source: source[0], reverse=True)
+
+    @property
+    def version(self) -> str:
+        """Manifest stamp plus every hot segment's version."""
+        hot = [f"{month}:{segment.version}" for month, segment, _ in self._sources() if segment]
+        return "|".join([str(self._manifest_mtime)] + hot)
+
+    # ---- archives ---------------------------------------------------------
+
+    def _write_archive(self, month: str, records: List[dict]) -> dict:
+        """Write one gzip segment atomically and return its manifest entry."""
+        path = self.file_path / f"{month}.json.gz"
+        fd, tmp_path = tempfile.mkstemp(dir=self.file_path, prefix=f".{month}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw:
+                with gzip.GzipFile(fileobj=raw, mode="wb") as f:
+                    f.write(codec.dumps(records))
+                raw.flush()
+                os.fsync(raw.fileno())
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        self._archive_cache.pop(month, None)
+        deadlines = sorted(record["predicted_deadline"] for record in records if record["predicted_deadline"])
+        return {
+            "file": path.name,
+            "min_id": records[0]["id"],
+            "max_id": records[-1]["id"],
+            "count": len(records),
+            "note_ids": sorted({record["source_note_id"] for record in records}),
+            "min_deadline": deadlines[0] if deadlines else None,
+            "max_deadline": deadlines[-1] if deadlines else None,
+            "aggregates": TaskAggregates.from_tasks(records).to_dict()
+        }
+
+    def _load_archive(self, month: str) -> Tuple[List[dict], SecondaryIndexes]:
+        """Decompress an archived segment (cached per file mtime)."""
+        path = self.file_path / self._manifest["archived"][month]["file"]
+        mtime = path.stat().st_mtime_ns
+        cached = self._archive_cache.get(month)
+        if cached and cached[0] == mtime:
+            return cached[1], cached[2]
+
+        with gzip.open(path, "rb") as f:
+            records = codec.loads(f.read())
+        indexes = SecondaryIndexes.from_tasks(records)
+
+        while len(self._archive_cache) >= self.ARCHIVE_CACHE_SIZE:
+            self._archive_cache.pop(next(iter(self._archive_cache)))
+        self._archive_cache[month] = (mtime, records, indexes)
+        return records, indexes
+
+    def _archive_cold_segments(self) -> int:
+        """
+        Compress hot segments that fell out of the hot window.
+        Called with self.lock and the manifest lock held.
+        Order is archive → manifest → delete hot file, so a crash at any
+        point leaves every task readable (duplicates are merged by id).
+        """
+        cutoff = months_back(datetime.now().strftime("%Y-%m"), self.hot_months - 1)
+        manifest = self._read_manifest()
+        archived = 0
+
+        for path in sorted(self.file_path.glob("*.json")):
+            match = SEGMENT_NAME.match(path.name)
+            if not match or match.group(1) >= cutoff:
+                continue
+            month = match.group(1)
+
+            segment = self._segments.pop(month, None) or self._open_segment(month)
+            with segment.lock, self.segment_lock:
+                records = {task["id"]: task for task in segment.iter_tasks()}
+                if month in manifest["archived"]:
+                    self._manifest = manifest
+                    existing, _ = self._load_archive(month)
+                    records.update((task["id"], task) for task in existing)
+
+                if records:
+                    ordered = [records[task_id] for task_id in sorted(records)]
+                    manifest["archived"][month] = self._write_archive(month, ordered)
+                    self._write_manifest(manifest)
+
+                for leftover in (path, segment.stats_path, segment.tombstone_path):
+                    leftover.unlink(missing_ok=True)
+
+            archived += 1
+            print(f"[STORAGE] Archived segment {month} ({len(records)} tasks)")
+
+        self._manifest = manifest
+        return archived
+
+    def _import_legacy(self, legacy_path: Path):
+        """Split an existing single-file store into monthly segments (runs once)."""
+        records = []
+        high_water = 0
+        if legacy_path.exists():
+            legacy = JSONStorage(str(legacy_path))
+            records = sorted(legacy.iter_tasks(), key=lambda task: task["id"])
+            try:
+                high_water = int(legacy.seq_path.read_text().strip() or 0)
+            except (FileNotFoundError, ValueError):
+                pass
+
+        by_month: Dict[str, List[dict]] = {}
+        for record in records:
+            by_month.setdefault(month_key(record["created_at"]), []).append(record)
+        for month, tasks in by_month.items():
+            encode = codec.dumps if self.compact_json else codec.dumps_pretty
+            (self.file_path / f"{month}.json").write_bytes(encode(tasks))
+
+        high_water = max([high_water] + [record["id"] for record in records])
+        if high_water:
+            self.seq_path.write_text(str(high_water))
+
+        self._write_manifest({
+            "archived": {},
+            "imported_from": legacy_path.name if records else None,
+            "imported_at": datetime.now().isoformat()
+        })
+        if records:
+            print(f"[STORAGE] Imported {len(records)} tasks from {legacy_path} into {len(by_month)} segments")
+
+    def _archive_records(self, month: str, entry: dict, filters: dict) -> List[dict]:
+        """Records of an archived segment matching `filters`, oldest first."""
+        if filters.get("note_id") is not None and filters["note_id"] not in entry["note_ids"]:
+            return []
+        with self.lock:
+            records, indexes = self._load_archive(month)
+            ids = indexes.lookup(**filters)
+        if ids is None:
+            return records
+        return [record for record in records if record["id"] in ids]
+
+    # ---- storage interface ------------------------------------------------
+
+    def create_task(self, task: EnhancedTask, note_id: str) -> bool:
+        """Add an enhanced task to the current month's segment."""
+        successful, _ = self.create_tasks_batch([task], note_id)
+        return successful == 1
+
+    def create_tasks_batch(self, tasks: List[EnhancedTask], note_id: str) -> Tuple[int, int]:
+        """Add all tasks for a note to the current month's segment."""
+        return self._current_segment().create_tasks_batch(tasks, note_id)
+
+    def get_task(self, task_id: int) -> Optional[StoredTask]:
+        """Fetch one task by id, reaching into archives via their id ranges."""
+        for month, segment, entry in self._sources():
+            if segment:
+                task = segment.get_task(task_id)
+                if task:
+                    return task
+            elif entry["min_id"] <= task_id <= entry["max_id"]:
+                for record in self._archive_records(month, entry, {}):
+                    if record["id"] == task_id:
+                        return StoredTask(**record)
+        return None
+
+    def import_tasks_batch(self, records: List[dict]) -> int:
+        """
+        Store already-validated task dicts (historical imports) in the
+        segment of their created_at month. Ids are reassigned, so old months
+        can end up holding newer ids. Months outside the hot window are
+        written as segments and archived straight away.
+        Returns the number stored; raises if a write fails.
+        """
+        by_month: Dict[str, List[dict]] = {}
+        for record in records:
+            by_month.setdefault(month_key(record["created_at"]), []).append(record)
+
+        with self.lock, self.manifest_lock:
+            self._refresh()
+            for month in sorted(by_month):
+                segment = self._segments.get(month) or self._open_segment(month)
+                segment.import_tasks_batch(by_month[month])
+            self._archive_cold_segments()
+        return len(records)
+
+    def get_all_tasks(self) -> List[StoredTask]:
+        """Retrieve all tasks, newest first."""
+        return [StoredTask(**record) for record in self.iter_tasks()]
+
+    def get_tasks_by_note(self, note_id: str) -> List[StoredTask]:
+        """Get tasks from specific note (oldest first)."""
+        tasks = []
+        for month, segment, entry in self._sources():
+            if segment:
+                tasks.extend(segment.get_tasks_by_note(note_id))
+            else:
+                tasks.extend(StoredTask(**record) for record in self._archive_records(month, entry, {"note_id": note_id}))
+        return sorted(tasks, key=lambda task: task.id)
+
+    def query_tasks(self, **filters) -> List[StoredTask]:
+        """
+        Get tasks matching all filters, newest first.
+        Filters: note_id, owner, priority, category, risk_level, status.
+        """
+        return [StoredTask(**record) for record in self.iter_tasks(**filters)]
+
+    def iter_tasks(self, after_id: Optional[int] = None, **filters) -> Iterator[dict]:
+        """
+        Yield stored task dicts newest first, optionally only ids below `after_id`
+        (keyset cursor) and matching the same filters as query_tasks().
+        Segments are merged by id (imports can give an old month newer ids).
+        An archive is only decompressed once the merge reaches its id range,
+        and skipped outright when its id range or note ids rule it out.
+        """
+        def archived(month: str, entry: dict) -> Iterator[dict]:
+            for record in reversed(self._archive_records(month, entry, filters)):
+                if after_id is None or record["id"] < after_id:
+                    yield record
+
+        # (highest id the stream can yield, stream factory), highest first
+        pending = []
+        for month, segment, entry in self._sources():
+            if segment:
+                pending.append((float("inf"), lambda segment=segment: segment.iter_tasks(after_id, **filters)))
+            elif after_id is None or entry["min_id"] < after_id:
+                pending.append((entry["max_id"], lambda month=month, entry=entry: archived(month, entry)))
+        pending.sort(key=lambda stream: stream[0], reverse=True)
+
+        heap = []
+        order = count()
+
+        def advance(stream: Iterator[dict]):
+            record = next(stream, None)
+            if record is not None:
+                heapq.heappush(heap, (-record["id"], next(order), record, stream))
+
+        while pending or heap:
+            while pending and (not heap or pending[0][0] >= -heap[0][0]):
+                advance(pending.pop(0)[1]())
+            if not heap:
+                break
+            _, _, record, stream = heapq.heappop(heap)
+            yield record
+            advance(stream)
+
+    def get_timeline(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        owner: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[dict]:
+        """
+        Stored task dicts due between `start` and `end` (inclusive), earliest
+        first. Each hot segment slices its deadline index; archives are only
+        opened when their deadline range overlaps the query.
+        """
+        timelines = []
+        for month, segment, entry in self._sources():
+            if segment:
+                timelines.append(segment.get_timeline(start, end, owner, limit))
+                continue
+            if "min_deadline" in entry and (
+                entry["min_deadline"] is None
+                or (end and entry["min_deadline"] > end)
+                or (start and entry["max_deadline"] < start)
+            ):
+                continue
+            filters = {"owner": owner} if owner is not None else {}
+            timelines.append(sorted(
+                (
+                    record for record in self._archive_records(month, entry, filters)
+                    if record["predicted_deadline"]
+                    and (not start or record["predicted_deadline"] >= start)
+                    and (not end or record["predicted_deadline"] <= end)
+                ),
+                key=lambda record: (record["predicted_deadline"], record["id"])
+            ))
+
+        merged = heapq.merge(*timelines, key=lambda record: (record["predicted_deadline"], record["id"]))
+        return list(islice(merged, limit))
+
+    def get_task_count(self) -> int:
+        """Get total number of tasks."""
+        return sum(
+            segment.get_task_count() if segment else entry["count"]
+            for _, segment, entry in self._sources()
+        )
+
+    def get_analytics(self) -> dict:
+        """
+        Get analytics about stored tasks.
+        FEATURE: Data Intelligence
+        Hot segments keep running counters and archived ones carry theirs
+        in the manifest, so no segment is read.
+        """
+        aggregates = TaskAggregates()
+        for _, segment, entry in self._sources():
+            if segment:
+                aggregates.merge(segment.get_aggregates())
+            else:
+                aggregates.merge(TaskAggregates.from_dict(entry["aggregates"]))
+        return aggregates.to_analytics()
+
+    def verify_analytics(self) -> dict:
+        """Recount every segment and diff against its stored counters (self-healing)."""
+        differences = {}
+        for month, segment, entry in self._sources():
+            if segment:
+                result = segment.verify_analytics()
+                if not result["consistent"]:
+                    differences[month] = result["differences"]
+                continue
+
+            recomputed = TaskAggregates.from_tasks(self._archive_records(month, entry, {}))
+            drift = TaskAggregates.from_dict(entry["aggregates"]).diff(recomputed)
+            if drift:
+                print(f"[STORAGE] ⚠️ Archived counters for {month} drifted: {drift}")
+                differences[month] = drift
+                with self.lock, self.manifest_lock:
+                    manifest = self._read_manifest()
+                    if month in manifest["archived"]:
+                        manifest["archived"][month]["aggregates"] = recomputed.to_dict()
+                        self._write_manifest(manifest)
+
+        return {
+            "consistent": not differences,
+            "differences": differences
+        }
+
+    def clear_all_tasks(self) -> bool:
+        """Clear all tasks (for testing). Ids keep counting up."""
+        try:
+            with self.lock, self.manifest_lock:
+                self._refresh()
+                for segment in self._segments.values():
+                    segment.clear_all_tasks()
+                manifest = self._read_manifest()
+                for entry in manifest["archived"].values():
+                    (self.file_path / entry["file"]).unlink(missing_ok=True)
+                manifest["archived"] = {}
+                self._write_manifest(manifest)
+                self._archive_cache.clear()
+            print("[STORAGE] All tasks cleared")
+            return True
+        except Exception as e:
+            print(f"[STORAGE] Failed to clear tasks: {e}")
+            return False
+
+    def delete_task(self, task_id: int) -> bool:
+        """
+        Delete a single task by ID.
+        Hot segments write a tombstone; an archived segment is rewritten
+        (rare, and only that one month).
+        """
+        for month, segment, entry in self._sources():
+            if segment:
+                if segment.get_task(task_id):
+                    return segment.delete_task(task_id)
+                continue
+            if not entry["min_id"] <= task_id <= entry["max_id"]:
+                continue
+
+            try:
+                with self.lock, self.manifest_lock:
+                    self._refresh()
+                    records, _ = self._load_archive(month)
+                    remaining = [record for record in records if record["id"] != task_id]
+                    if len(remaining) == len(records):
+                        continue
+
+                    manifest = self._read_manifest()
+                    if remaining:
+                        manifest["archived"][month] = self._write_archive(month, remaining)
+                        self._write_manifest(manifest)
+                    else:
+                        del manifest["archived"][month]
+                        self._write_manifest(manifest)
+                        (self.file_path / entry["file"]).unlink(missing_ok=True)
+                        self._archive_cache.pop(month, None)
+                print(f"[STORAGE] ✅ Deleted archived task #{task_id} from segment {month}")
+                return True
+            except Exception as e:
+                print(f"[STORAGE] ❌ Failed to delete task #{task_id}: {e}")
+                return False
+
+        print(f"[STORAGE] Task #{task_id} not found")
+        return False
+
+    def compaction_stats(self) -> dict:
+        """Dead-record bookkeeping of the hot segments, plus segment counts."""
+        stats = {"live_records": 0, "dead_records": 0}
+        hot = 0
+        for _, segment, entry in self._sources():
+            if not segment:
+                stats["live_records"] += entry["count"]
+                continue
+            hot += 1
+            segment_stats = segment.compaction_stats()
+            stats["live_records"] += segment_stats["live_records"]
+            stats["dead_records"] += segment_stats["dead_records"]
+
+        total = stats["live_records"] + stats["dead_records"]
+        stats["dead_ratio"] = round(stats["dead_records"] / total, 4) if total else 0.0
+        stats["hot_segments"] = hot
+        stats["archived_segments"] = len(self._manifest["archived"])
+        return stats
+
+    def compact(self) -> dict:
+        """Compact every hot segment."""
+        with self.lock:
+            self._refresh()
+            segments = dict(self._segments)
+        return {month: segment.compact() for month, segment in segments.items()}
+
+    def maybe_compact(self, dead_ratio_threshold: float) -> bool:
+        """Archive months that left the hot window, then compact hot segments as needed."""
+        with self.lock, self.manifest_lock:
+            archived = self._archive_cold_segments()
+        with self.lock:
+            self._refresh()
+            segments = list(self._segments.values())
+        compacted = [segment.maybe_compact(dead_ratio_threshold) for segment in segments]
+        return bool(archived) or any(compacted)
\ No newline at end of file
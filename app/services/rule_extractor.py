@@ -0,0 +1,203 @@
+"""
+Offline rule-based task extraction.
+FEATURE: Zero-latency extraction
+Finds action sentences ("Riya will...", "I'll...", "Arjun, can you...",
+"Action item: ..."), their owners and deadline phrases with precompiled
+patterns, and builds the summary fields from decision, blocker and risk
+keywords. Deterministic, no network, well under a millisecond for a
+typical note. Same interface as LLMExtractor, so it can serve as the
+fast path for short notes, the fallback while the OpenAI circuit
+breaker is open, or the whole backend for hermetic benchmarks.
+"""
+import re
+from typing import List, Optional, Tuple
+from app.models import ExtractedTask, MeetingSummary
+from app.services.priority_intelligence import PriorityIntelligenceEngine
+from app.services.task_analyzer import TaskAnalyzer
+
+SPEAKER = re.compile(r"^\s*(?:\[[^\]]{1,12}\]\s*)?(?P<speaker>[A-Z][\w.']*(?: [A-Z][\w.']*){0,2})\s*[:\-]\s+")
+SENTENCE_END = re.compile(r"(?<=[.!?;])\s+")
+# "..., and Arjun will ..." starts a second action in the same sentence
+CLAUSE_SPLIT = re.compile(r",?\s+and\s+(?=(?:I|we|[A-Z][a-z]+)(?:'ll|\s+(?:will|needs? to|has to|should|must)\b))")
+
+MODALS = r"(?:'ll|\s+(?i:will|shall|needs? to|has to|have to|must|should|is going to|are going to|am going to|is supposed to|can|could))"
+ACTION = re.compile(
+    r"^(?P<addressee>[A-Z][a-z]+),\s+(?i:please|can you|could you|would you)\s+(?P<request>.+)"
+    r"|^(?i:please)\s+(?P<please>.+)"
+    r"|^(?i:action items?|todo|to-do|follow[- ]up)\s*[:\-]\s*(?P<item>.+)"
+    r"|^(?i:let's|lets)\s+(?P<lets>.+)"
+    r"|(?:^|(?<=\s))(?P<subject>I|[Ww]e|[Yy]ou|[Ss]omeone|(?:[Tt]he )?[Tt]eam|[A-Z][a-z]+(?: [A-Z][a-z]+)?)"
+    + MODALS + r"\s+(?P<action>.+)"
+)
+NOT_PEOPLE = {"It", "This", "That", "There", "What", "Which", "Nothing", "Everything", "Something", "Who", "He", "She", "They"}
+NOT_ACTIONS = re.compile(r"^(?:be|not|probably|also be|have been|see|think)\b", re.I)
+
+WEEKDAYS = r"(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday)"
+MONTHS = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+DEADLINE = re.compile(
+    r"\s*\b(?:(?:by|before|on|until|due|for)\s+)?(?:the\s+)?(?P<phrase>"
+    r"today|tonight|tomorrow|asap|immediately|eod|eow|end of (?:the )?(?:day|week|month)"
+    r"|this week|next week|this month|next month"
+    rf"|(?:next |this )?{WEEKDAYS}(?: morning| afternoon| evening)?"
+    rf"|{MONTHS}\s+\d{{1,2}}(?:st|nd|rd|th)?"
+    r")\b",
+    re.I
+)
+DEADLINE_ALIASES = {
+    "eod": "Today", "tonight": "Today", "end of day": "Today", "end of the day": "Today",
+    "eow": "This Week", "end of week": "This Week", "end of the week": "This Week",
+    "end of month": "This Month", "end of the month": "This Month", "immediately": "ASAP", "asap": "ASAP",
+}
+
+DECISION_KEYWORDS = ["decided", "agreed", "approved", "decision", "we'll go with", "going with", "signed off", "finalized"]
+BLOCKER_KEYWORDS = ["blocked", "blocker", "waiting for", "waiting on", "stuck", "depends on", "can't proceed"]
+RISK_KEYWORDS = ["risk", "concern", "worried", "might slip", "may slip", "delay", "tight deadline", "uncertain", "behind schedule"]
+URGENT_DEADLINES = {"Today", "ASAP"}
+
+
+def _capitalize_words(phrase: str) -> str:
+    return " ".join(word[:1].upper() + word[1:].lower() for word in phrase.split())
+
+
+def _contains(text: str, keywords: List[str]) -> bool:
+    return any(keyword in text for keyword in keywords)
+
+
+class RuleBasedExtractor:
+
+    @staticmethod
+    def split_sentences(meeting_text: str) -> List[Tuple[Optional[str], str]]:
+        """(speaker, sentence) pairs; speaker is None when the line has no label."""
+        sentences = []
+        for line in meeting_text.splitlines():
+            speaker = None
+            match = SPEAKER.match(line)
+            if match and match.group("speaker") not in NOT_PEOPLE:
+                speaker = match.group("speaker")
+                line = line[match.end():]
+            for sentence in SENTENCE_END.split(line.strip()):
+                sentence = sentence.strip(" ;")
+                if sentence:
+                    sentences.append((speaker, sentence))
+        return sentences
+
+    @staticmethod
+    def parse_deadline(text: str) -> Tuple[str, str]:
+        """(due_date, text without the deadline phrase); due_date is "Needs Review" if none."""
+        match = DEADLINE.search(text)
+        if not match:
+            return "Needs Review", text
+        phrase = match.group("phrase").lower()
+        due_date = DEADLINE_ALIASES.get(phrase) or _capitalize_words(phrase)
+        return due_date, text[:match.start()] + text[match.end():]
+
+    @staticmethod
+    def resolve_owner(subject: str, speaker: Optional[str]) -> str:
+        """Same conventions as the LLM prompt: I → speaker or Self, we/unclear → Self."""
+        lowered = subject.lower()
+        if lowered == "i":
+            return speaker or "Self"
+        if lowered in ("team", "the team"):
+            return "Team"
+        if lowered in ("we", "you", "someone"):
+            return "Self"
+        return subject
+
+    @classmethod
+    def priority_for(cls, sentence: str, due_date: str) -> str:
+        lowered = sentence.lower()
+        if due_date in URGENT_DEADLINES or _contains(lowered, PriorityIntelligenceEngine.HIGH_PRIORITY_KEYWORDS):
+            return "High"
+        if _contains(lowered, PriorityIntelligenceEngine.LOW_PRIORITY_KEYWORDS):
+            return "Low"
+        return "Medium"
+
+    @classmethod
+    def parse_action(cls, clause: str, speaker: Optional[str]) -> Optional[ExtractedTask]:
+        """The task stated by one clause, or None if it isn't an action."""
+        match = ACTION.search(clause)
+        if not match:
+            return None
+        groups = match.groupdict()
+        if groups["request"]:
+            owner, action = groups["addressee"], groups["request"]
+        elif groups["action"]:
+            if groups["subject"] in NOT_PEOPLE:
+                return None
+            owner, action = cls.resolve_owner(groups["subject"], speaker), groups["action"]
+        else:
+            owner = "Self"
+            action = groups["please"] or groups["item"] or groups["lets"]
+        if NOT_ACTIONS.match(action):
+            return None
+
+        due_date, action = cls.parse_deadline(action)
+        task_name = " ".join(action.split()).rstrip(".!?,;:")
+        if task_name.lower().startswith("to "):
+            task_name = task_name[3:]
+        if len(task_name) < 5:
+            return None
+        return ExtractedTask(
+            task_name=task_name[0].upper() + task_name[1:],
+            owner=owner,
+            due_date=due_date,
+            priority=cls.priority_for(clause, due_date)
+        )
+
+    @classmethod
+    def analyze(cls, meeting_text: str) -> Tuple[List[ExtractedTask], MeetingSummary]:
+        """Tasks and summary in one pass over the sentences."""
+        tasks: List[ExtractedTask] = []
+        participants: List[str] = []
+        decisions, blockers, risks, context = [], [], [], []
+
+        for speaker, sentence in cls.split_sentences(meeting_text):
+            if speaker and speaker not in participants:
+                participants.append(speaker)
+            is_action = False
+            for clause in CLAUSE_SPLIT.split(sentence):
+                task = cls.parse_action(clause, speaker)
+                if task is None:
+                    continue
+                is_action = True
+                tasks.append(task)
+                if task.owner not in ("Self", "Team") and task.owner not in participants:
+                    participants.append(task.owner)
+
+            lowered = sentence.lower()
+            if _contains(lowered, DECISION_KEYWORDS):
+                decisions.append(sentence)
+            if _contains(lowered, BLOCKER_KEYWORDS) or _contains(lowered, TaskAnalyzer.PROGRESS_KEYWORDS["Blocked"]):
+                blockers.append(sentence)
+            if _contains(lowered, RISK_KEYWORDS):
+                risks.append(sentence)
+            if not is_action and not context:
+                context.append(sentence)
+
+        overview = f"{len(tasks)} action item{'s' if len(tasks) != 1 else ''} identified"
+        if decisions:
+            overview += f", {len(decisions)} decision{'s' if len(decisions) != 1 else ''}"
+        if blockers:
+            overview += f", {len(blockers)} blocker{'s' if len(blockers) != 1 else ''}"
+        summary_text = f"{overview[0].upper()}{overview[1:]}."
+        if context:
+            lead = context[0][:200]
+            summary_text = f"{lead}{'' if lead.endswith(('.', '!', '?')) else '.'} {summary_text}"
+
+        summary = MeetingSummary(
+            summary=summary_text,
+            key_decisions=decisions,
+            blockers=blockers,
+            risks=risks,
+            participants=participants
+        )
+        return tasks, summary
+
+    async def extract_tasks(self, meeting_text: str) -> List[ExtractedTask]:
+        return self.analyze(meeting_text)[0]
+
+    async def generate_meeting_summary(self, meeting_text: str) -> MeetingSummary:
+        return self.analyze(meeting_text)[1]
+
+    async def extract_and_summarize(self, meeting_text: str) -> Tuple[List[ExtractedTask], MeetingSummary]:
+        return self.analyze(meeting_text)
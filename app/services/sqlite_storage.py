@@ -0,0 +1,401 @@
+"""
+SQLite storage backend (WAL mode).
+Same interface as JSONStorage; safe to share between uvicorn workers.
+"""
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+from app.models import EnhancedTask, StoredTask
+from app.services.json_storage import build_task_record
+from app.services.task_indexes import SecondaryIndexes
+from app.utils import codec
+
+COLUMNS = [
+    "id", "created_at", "task_name", "owner", "owner_mapped", "due_date",
+    "predicted_deadline", "priority", "priority_reason", "confidence_score",
+    "difficulty", "category", "has_dependency", "dependency_info", "risk_level",
+    "risk_description", "progress_estimate", "source_note_id", "status",
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT NOT NULL,
+    task_name TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    owner_mapped TEXT NOT NULL,
+    due_date TEXT NOT NULL,
+    predicted_deadline TEXT,
+    priority TEXT NOT NULL,
+    priority_reason TEXT NOT NULL,
+    confidence_score REAL NOT NULL,
+    difficulty TEXT NOT NULL,
+    category TEXT NOT NULL,
+    has_dependency INTEGER NOT NULL,
+    dependency_info TEXT,
+    risk_level TEXT NOT NULL,
+    risk_description TEXT,
+    progress_estimate TEXT NOT NULL,
+    source_note_id TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending'
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_note ON tasks (source_note_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_owner ON tasks (owner_mapped COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks (priority COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_tasks_category ON tasks (category COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_tasks_risk ON tasks (risk_level COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_tasks_deadline ON tasks (predicted_deadline);
+
+-- Change counter behind SQLiteStorage.version; the random epoch tells a
+-- recreated database apart from the old one.
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('epoch', lower(hex(randomblob(8))));
+INSERT OR IGNORE INTO meta (key, value) VALUES ('version', 0);
+CREATE TRIGGER IF NOT EXISTS tasks_version_insert AFTER INSERT ON tasks
+BEGIN UPDATE meta SET value = value + 1 WHERE key = 'version'; END;
+CREATE TRIGGER IF NOT EXISTS tasks_version_update AFTER UPDATE ON tasks
+BEGIN UPDATE meta SET value = value + 1 WHERE key = 'version'; END;
+CREATE TRIGGER IF NOT EXISTS tasks_version_delete AFTER DELETE ON tasks
+BEGIN UPDATE meta SET value = value + 1 WHERE key = 'version'; END;
+"""
+
+# Statements are constant strings so sqlite3's statement cache reuses
+# the prepared form on every call.
+INSERT_SQL = f"INSERT INTO tasks ({', '.join(COLUMNS[1:])}) VALUES ({', '.join('?' * (len(COLUMNS) - 1))})"
+INSERT_WITH_ID_SQL = f"INSERT OR IGNORE INTO tasks ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+SELECT_SQL = f"SELECT {', '.join(COLUMNS)} FROM tasks"
+
+
+class SQLiteStorage:
+
+    storage_type = "SQLite"
+
+    # Grouped counters reported by get_analytics()
+    GROUPED = {
+        "by_priority": "priority",
+        "by_category": "category",
+        "by_difficulty": "difficulty",
+        "by_risk": "risk_level",
+    }
+
+    def __init__(self, file_path: str = "tasks.db"):
+        self.file_path = Path(file_path)
+        self._local = threading.local()
+        self._compactions = 0
+        self._last_compaction: Optional[dict] = None
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+        print(f"[STORAGE] Using SQLite storage (WAL): {self.file_path.absolute()}")
+
+    def _connect(self) -> sqlite3.Connection:
+        """One connection per thread; WAL lets readers run alongside a writer."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.file_path, timeout=30, cached_statements=256)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    @property
+    def version(self) -> str:
+        """Database epoch plus the change counter kept by the triggers in SCHEMA."""
+        return self._connect().execute(
+            "SELECT (SELECT value FROM meta WHERE key = 'epoch') || '-' || "
+            "(SELECT value FROM meta WHERE key = 'version')"
+        ).fetchone()[0]
+
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> dict:
+        record = dict(row)
+        record["has_dependency"] = bool(record["has_dependency"])
+        return record
+
+    @staticmethod
+    def _record_values(record: dict, with_id: bool = False) -> tuple:
+        columns = COLUMNS if with_id else COLUMNS[1:]
+        return tuple(record.get(column) for column in columns)
+
+    def create_task(self, task: EnhancedTask, note_id: str) -> bool:
+        """Add an enhanced task."""
+        successful, _ = self.create_tasks_batch([task], note_id)
+        return successful == 1
+
+    def create_tasks_batch(self, tasks: List[EnhancedTask], note_id: str) -> Tuple[int, int]:
+        """Add all tasks for a note in one transaction."""
+        if not tasks:
+            return 0, 0
+
+        records = []
+        failed = 0
+        for task in tasks:
+            try:
+                record = build_task_record(task, note_id, 0)
+                StoredTask(**record)
+                records.append(record)
+            except Exception as e:
+                failed += 1
+                print(f"[STORAGE] ✗ Rejected task '{task.task_name}': {e}")
+
+        try:
+            conn = self._connect()
+            with conn:
+                ids = [conn.execute(INSERT_SQL, self._record_values(r)).lastrowid for r in records]
+        except Exception as e:
+            print(f"[STORAGE] ✗ Batch write failed for note {note_id}: {e}")
+            return 0, len(tasks)
+
+        for task_id, record in zip(ids, records):
+            print(f"[STORAGE] ✓ Created task #{task_id}: {record['task_name']}")
+        print(f"[STORAGE] Batch complete: {len(records)} succeeded, {failed} failed")
+        return len(records), failed
+
+    def import_tasks_batch(self, records: List[dict]) -> int:
+        """
+        Insert already-validated task dicts (historical imports) in one
+        transaction. Ids are reassigned; every other field is kept.
+        Returns the number stored; raises if the write fails.
+        """
+        conn = self._connect()
+        with conn:
+            conn.executemany(INSERT_SQL, (self._record_values(record) for record in records))
+        return len(records)
+
+    def _select(self, where: str = "", params: tuple = (), order: str = "id DESC") -> List[StoredTask]:
+        rows = self._connect().execute(f"{SELECT_SQL} {where} ORDER BY {order}", params)
+        return [StoredTask(**self._row_to_dict(row)) for row in rows]
+
+    def get_all_tasks(self) -> List[StoredTask]:
+        """Retrieve all tasks, newest first."""
+        return self._select()
+
+    def get_tasks_by_note(self, note_id: str) -> List[StoredTask]:
+        """Get tasks from specific note."""
+        return self._select("WHERE source_note_id = ?", (note_id,), order="id ASC")
+
+    def query_tasks(self, **filters) -> List[StoredTask]:
+        """
+        Get tasks matching all filters, newest first.
+        Filters: note_id, owner, priority, category, risk_level, status.
+        """
+        clauses, params = self._filter_clauses(filters)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._select(where, tuple(params))
+
+    def _filter_clauses(self, filters: dict) -> Tuple[List[str], List]:
+        clauses = []
+        params = []
+        for name, value in filters.items():
+            if value is None:
+                continue
+            if name not in SecondaryIndexes.FIELDS:
+                raise ValueError(f"Unknown filter: {name}")
+            column = SecondaryIndexes.FIELDS[name]
+            if column == "source_note_id":
+                clauses.append(f"{column} = ?")
+            else:
+                clauses.append(f"{column} = ? COLLATE NOCASE")
+            params.append(value)
+        return clauses, params
+
+    def iter_tasks(self, after_id: Optional[int] = None, page_size: int = 500, **filters) -> Iterator[dict]:
+        """
+        Yield stored task dicts newest first, optionally only ids below `after_id`.
+        Walks the primary key in pages (keyset pagination), so memory stays
+        bounded by `page_size` however large the table is.
+        """
+        clauses, params = self._filter_clauses(filters)
+        cursor = after_id
+
+        while True:
+            page_clauses = clauses + (["id < ?"] if cursor is not None else [])
+            page_params = params + ([cursor] if cursor is not None else [])
+            where = f"WHERE {' AND '.join(page_clauses)}" if page_clauses else ""
+            rows = self._connect().execute(
+                f"{SELECT_SQL} {where} ORDER BY id DESC LIMIT ?",
+                (*page_params, page_size)
+            ).fetchall()
+
+            for row in rows:
+                yield self._row_to_dict(row)
+
+            if len(rows) < page_size:
+                return
+            cursor = rows[-1]["id"]
+
+    def get_timeline(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        owner: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[dict]:
+        """
+        Stored task dicts due between `start` and `end` (inclusive), earliest
+        first, walked in order on idx_tasks_deadline.
+        """
+        clauses = ["predicted_deadline IS NOT NULL", "predicted_deadline != ''"]
+        params = []
+        if start:
+            clauses.append("predicted_deadline >= ?")
+            params.append(start)
+        if end:
+            clauses.append("predicted_deadline <= ?")
+            params.append(end)
+        if owner is not None:
+            clauses.append("owner_mapped = ? COLLATE NOCASE")
+            params.append(owner)
+        rows = self._connect().execute(
+            f"{SELECT_SQL} WHERE {' AND '.join(clauses)} ORDER BY predicted_deadline, id LIMIT ?",
+            (*params, -1 if limit is None else limit)
+        )
+        return [self._row_to_dict(row) for row in rows]
+
+    def get_task_count(self) -> int:
+        """Get total number of tasks."""
+        return self._connect().execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+    def get_analytics(self) -> dict:
+        """
+        Get analytics about stored tasks.
+        FEATURE: Data Intelligence
+        Computed as SQL aggregates over the indexed columns.
+        """
+        conn = self._connect()
+        total, high_risk, with_dependencies, avg_confidence = conn.execute(
+            "SELECT COUNT(*), "
+            "COALESCE(SUM(risk_level = 'High'), 0), "
+            "COALESCE(SUM(has_dependency), 0), "
+            "COALESCE(AVG(confidence_score), 0.0) "
+            "FROM tasks"
+        ).fetchone()
+
+        analytics = {"total_tasks": total}
+        for key, column in self.GROUPED.items():
+            rows = conn.execute(f"SELECT {column}, COUNT(*) FROM tasks GROUP BY {column}")
+            analytics[key] = {value: count for value, count in rows}
+        analytics["high_risk_count"] = high_risk
+        analytics["with_dependencies"] = with_dependencies
+        analytics["avg_confidence"] = avg_confidence
+        return analytics
+
+    def verify_analytics(self) -> dict:
+        """Analytics are always recomputed by SQL, so there is nothing to drift."""
+        return {
+            "consistent": True,
+            "differences": {}
+        }
+
+    def compaction_stats(self) -> dict:
+        """
+        Free-page bookkeeping for /health. SQLite reuses the pages of
+        deleted rows itself; VACUUM only gives them back to the filesystem.
+        """
+        conn = self._connect()
+        pages = conn.execute("PRAGMA page_count").fetchone()[0]
+        free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return {
+            "live_records": self.get_task_count(),
+            "free_pages": free,
+            "dead_ratio": round(free / pages, 4) if pages else 0.0,
+            "compactions": self._compactions,
+            "last_compaction": self._last_compaction
+        }
+
+    def compact(self) -> dict:
+        """VACUUM the database file."""
+        conn = self._connect()
+        free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        started = time.perf_counter()
+        conn.execute("VACUUM")
+
+        self._compactions += 1
+        self._last_compaction = {
+            "at": datetime.now().isoformat(),
+            "freed_pages": free,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+        print(f"[STORAGE] Vacuumed database: freed {free} pages")
+        return self._last_compaction
+
+    def maybe_compact(self, dead_ratio_threshold: float) -> bool:
+        """Vacuum if the share of free pages reached the threshold."""
+        stats = self.compaction_stats()
+        if stats["free_pages"] and stats["dead_ratio"] >= dead_ratio_threshold:
+            self.compact()
+            return True
+        return False
+
+    def clear_all_tasks(self) -> bool:
+        """Clear all tasks (for testing). AUTOINCREMENT keeps ids from being reused."""
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM tasks")
+            print("[STORAGE] All tasks cleared")
+            return True
+        except Exception as e:
+            print(f"[STORAGE] Failed to clear tasks: {e}")
+            return False
+
+    def delete_task(self, task_id: int) -> bool:
+        """Delete a single task by ID."""
+        try:
+            conn = self._connect()
+            with conn:
+                deleted = conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,)).rowcount
+
+            if not deleted:
+                print(f"[STORAGE] Task #{task_id} not found")
+                return False
+
+            print(f"[STORAGE] ✅ Deleted task #{task_id}")
+            return True
+
+        except Exception as e:
+            print(f"[STORAGE] ❌ Failed to delete task #{task_id}: {e}")
+            return False
+
+    def migrate_from_json(self, json_path: str) -> Tuple[int, int]:
+        """
+        One-shot import of an existing tasks.json.
+        Ids are kept, and rows that already exist are skipped, so running it
+        twice is harmless. Returns (imported, skipped).
+        """
+        tasks = codec.loads(Path(json_path).read_bytes())
+
+        records = []
+        skipped = 0
+        for task in tasks:
+            try:
+                records.append(StoredTask(**task).model_dump())
+            except Exception as e:
+                skipped += 1
+                print(f"[STORAGE] ✗ Skipping invalid task #{task.get('id', '?')}: {e}")
+
+        conn = self._connect()
+        with conn:
+            # rowcount, not total_changes: the version triggers' meta updates count there too
+            cursor = conn.executemany(INSERT_WITH_ID_SQL, (self._record_values(r, with_id=True) for r in records))
+            imported = max(cursor.rowcount, 0)
+
+        skipped += len(records) - imported
+        print(f"[STORAGE] Migrated {imported} tasks from {json_path} ({skipped} skipped)")
+        return imported, skipped
+
+
+if __name__ == "__main__":
+    # Usage: python -m app.services.sqlite_storage tasks.json tasks.db
+    import sys
+
+    if len(sys.argv) != 3:
+        print("Usage: python -m app.services.sqlite_storage <tasks.json> <tasks.db>")
+        sys.exit(1)
+
+    SQLiteStorage(sys.argv[2]).migrate_from_json(sys.argv[1])
\ No newline at end of file
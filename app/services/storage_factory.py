@@ -0,0 +1,21 @@
+"""
+Storage backend selection, shared by the API and the command-line tools.
+"""
+from app.config import Settings
+from app.services.json_storage import JSONStorage
+from app.services.partitioned_storage import PartitionedJSONStorage
+from app.services.jsonl_storage import JSONLStorage
+from app.services.sqlite_storage import SQLiteStorage
+
+
+def create_storage(settings: Settings):
+    """Build the backend named by STORAGE_BACKEND (defaults to the JSON file)."""
+    if settings.storage_backend == "jsonl":
+        return JSONLStorage(settings.jsonl_storage_file)
+    if settings.storage_backend == "partitioned":
+        return PartitionedJSONStorage(
+            settings.storage_file, settings.partition_hot_months, settings.storage_compact_json
+        )
+    if settings.storage_backend == "sqlite":
+        return SQLiteStorage(settings.sqlite_storage_file)
+    return JSONStorage(settings.storage_file, compact_json=settings.storage_compact_json)
\ No newline at end of file
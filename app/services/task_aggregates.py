@@ -0,0 +1,115 @@
+"""
+Running analytics counters for stored tasks.
+FEATURE: Data Intelligence (O(1) analytics)
+"""
+from typing import Iterable
+
+
+class TaskAggregates:
+    """
+    Counters behind get_analytics(), updated as tasks are added and removed.
+    Confidence is summed in integer micro-units so add/remove never drifts.
+    """
+
+    COUNTERS = {
+        "by_priority": ("priority", "Medium"),
+        "by_category": ("category", "General"),
+        "by_difficulty": ("difficulty", "Medium"),
+        "by_risk": ("risk_level", "Low"),
+    }
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.total = 0
+        self.counts = {name: {} for name in self.COUNTERS}
+        self.high_risk = 0
+        self.with_dependencies = 0
+        self.confidence_micros = 0
+
+    @classmethod
+    def from_tasks(cls, tasks: Iterable[dict]) -> "TaskAggregates":
+        """Recompute everything with a full scan."""
+        aggregates = cls()
+        for task in tasks:
+            aggregates.add(task)
+        return aggregates
+
+    def _apply(self, task: dict, delta: int):
+        self.total += delta
+
+        for name, (field, default) in self.COUNTERS.items():
+            bucket = self.counts[name]
+            key = task.get(field, default)
+            count = bucket.get(key, 0) + delta
+            if count > 0:
+                bucket[key] = count
+            else:
+                bucket.pop(key, None)
+
+        if task.get("risk_level", "Low") == "High":
+            self.high_risk += delta
+        if task.get("has_dependency", False):
+            self.with_dependencies += delta
+        self.confidence_micros += delta * round(task.get("confidence_score", 0.7) * 1_000_000)
+
+    def add(self, task: dict):
+        self._apply(task, 1)
+
+    def remove(self, task: dict):
+        self._apply(task, -1)
+
+    def merge(self, other: "TaskAggregates"):
+        """Add another set of counters into this one (e.g. per-segment totals)."""
+        self.total += other.total
+        for name, bucket in other.counts.items():
+            mine = self.counts[name]
+            for key, count in bucket.items():
+                mine[key] = mine.get(key, 0) + count
+        self.high_risk += other.high_risk
+        self.with_dependencies += other.with_dependencies
+        self.confidence_micros += other.confidence_micros
+
+    def to_analytics(self) -> dict:
+        """Analytics payload in the shape the API has always returned."""
+        return {
+            "total_tasks": self.total,
+            "by_priority": dict(self.counts["by_priority"]),
+            "by_category": dict(self.counts["by_category"]),
+            "by_difficulty": dict(self.counts["by_difficulty"]),
+            "by_risk": dict(self.counts["by_risk"]),
+            "high_risk_count": self.high_risk,
+            "with_dependencies": self.with_dependencies,
+            "avg_confidence": self.confidence_micros / 1_000_000 / self.total if self.total else 0.0
+        }
+
+    def to_dict(self) -> dict:
+        """Serializable form for persisting next to the store."""
+        return {
+            "total": self.total,
+            "counts": self.counts,
+            "high_risk": self.high_risk,
+            "with_dependencies": self.with_dependencies,
+            "confidence_micros": self.confidence_micros
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TaskAggregates":
+        aggregates = cls()
+        aggregates.total = data["total"]
+        aggregates.counts = {name: dict(data["counts"].get(name, {})) for name in cls.COUNTERS}
+        aggregates.high_risk = data["high_risk"]
+        aggregates.with_dependencies = data["with_dependencies"]
+        aggregates.confidence_micros = data["confidence_micros"]
+        return aggregates
+
+    def diff(self, other: "TaskAggregates") -> dict:
+        """Fields whose values differ, as {field: {"running": ..., "recomputed": ...}}."""
+        mine = self.to_analytics()
+        theirs = other.to_analytics()
+        return {
+            key: {"running": mine[key], "recomputed": theirs[key]}
+            for key in mine
+            if mine[key] != theirs[key]
+        }
\ No newline at end of file
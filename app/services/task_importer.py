@@ -0,0 +1,251 @@
+"""
+Bulk import of historical tasks.
+FEATURE: Backfill
+Parses a JSONL or JSON-array upload incrementally (never holding the
+whole file), validates every record against StoredTask, and writes the
+valid ones in large batches through the storage batch path. Ids are
+reassigned by the store; everything else is kept.
+
+Used by POST /tasks/import, and from the command line:
+    python -m app.services.task_importer history.jsonl [--batch-size 5000]
+"""
+import codecs
+import json
+import time
+from typing import Any, BinaryIO, List, Optional, Tuple
+from pydantic import ValidationError
+from app.models import StoredTask
+from app.utils import codec
+
+CHUNK_SIZE = 1 << 16
+
+
+class RecordParser:
+    """
+    Push parser: feed() raw byte chunks and get back (row, value) pairs as
+    soon as each record is complete. The format is picked from the first
+    non-blank byte: '[' means a JSON array, anything else JSONL.
+    A row that does not parse comes back as (row, ValueError).
+    """
+
+    # An array element still incomplete after this many buffered chars is malformed
+    MAX_PENDING_CHARS = 16 * 1024 * 1024
+
+    def __init__(self):
+        self.format: Optional[str] = None   # "jsonl" or "array"
+        self.row = 0
+        self.stopped: Optional[str] = None  # why array parsing gave up, if it did
+        self._bytes = b""
+        self._text = ""
+        self._state = "open"                # array: open → first/value/next → closed
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+
+    def feed(self, chunk: bytes) -> List[Tuple[int, Any]]:
+        if self.format is None:
+            self._bytes += chunk
+            head = self._bytes.lstrip()
+            if not head:
+                return []
+            self.format = "array" if head[:1] == b"[" else "jsonl"
+            chunk, self._bytes = self._bytes, b""
+
+        if self.format == "jsonl":
+            return self._feed_lines(chunk)
+        return self._feed_array(self._utf8.decode(chunk))
+
+    def close(self) -> List[Tuple[int, Any]]:
+        """Flush whatever is left once the input has ended."""
+        if self.format == "jsonl":
+            return self._feed_lines(b"", final=True)
+        if self.format == "array":
+            rows = self._feed_array(self._utf8.decode(b"", final=True), final=True)
+            if self._state != "closed" and not self.stopped:
+                self._stop("input ended before the closing ']'", rows)
+            return rows
+        return []
+
+    def _feed_lines(self, chunk: bytes, final: bool = False) -> List[Tuple[int, Any]]:
+        lines = (self._bytes + chunk).split(b"\n")
+        self._bytes = b"" if final else lines.pop()
+
+        rows = []
+        for line in lines:
+            if not line.strip():
+                continue
+            self.row += 1
+            try:
+                rows.append((self.row, codec.loads(line)))
+            except ValueError as e:
+                rows.append((self.row, ValueError(f"invalid JSON: {e}")))
+        return rows
+
+    def _stop(self, reason: str, rows: List[Tuple[int, Any]]):
+        self.stopped = reason
+        self._state = "closed"
+        rows.append((self.row + 1, ValueError(f"{reason}; import stopped")))
+
+    def _feed_array(self, text: str, final: bool = False) -> List[Tuple[int, Any]]:
+        text = self._text + text
+        pos, end = 0, len(text)
+        rows = []
+
+        while self._state != "closed":
+            while pos < end and text[pos] in " \t\r\n":
+                pos += 1
+            if pos >= end:
+                break
+            char = text[pos]
+
+            if self._state == "open":
+                if char != "[":
+                    self._stop("expected '['", rows)
+                    break
+                pos += 1
+                self._state = "first"
+            elif self._state in ("first", "next") and char == "]":
+                pos += 1
+                self._state = "closed"
+            elif self._state == "next":
+                if char != ",":
+                    self._stop(f"expected ',' or ']' after row {self.row}", rows)
+                    break
+                pos += 1
+                self._state = "value"
+            else:
+                try:
+                    value, pos = self._json.raw_decode(text, pos)
+                except json.JSONDecodeError as e:
+                    # Usually the element just continues in the next chunk
+                    if not final and end - pos < self.MAX_PENDING_CHARS:
+                        break
+                    self._stop(f"invalid JSON in row {self.row + 1}: {e.msg}", rows)
+                    break
+                self.row += 1
+                rows.append((self.row, value))
+                self._state = "next"
+
+        self._text = text[pos:] if self._state != "closed" else ""
+        return rows
+
+
+class TaskImporter:
+    """
+    Validates parsed rows and groups them into storage batches.
+    feed()/finish() return batches ready to write and write() stores one,
+    so the same importer can be driven synchronously (CLI) or from an
+    async request stream (the endpoint writes batches off the event loop).
+    """
+
+    MAX_REPORTED_ERRORS = 100
+
+    def __init__(self, storage, batch_size: int = 5000):
+        self.storage = storage
+        self.batch_size = batch_size
+        self.parser = RecordParser()
+        self.rows = 0
+        self.imported = 0
+        self.rejected = 0
+        self.errors: List[dict] = []
+        self._batch: List[dict] = []
+        self._started = time.perf_counter()
+
+    def _reject(self, row: int, error: str, count: int = 1):
+        self.rejected += count
+        if len(self.errors) < self.MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "error": error})
+
+    def _validate(self, row: int, value: Any) -> Optional[dict]:
+        if isinstance(value, ValueError):
+            self._reject(row, str(value))
+            return None
+        if not isinstance(value, dict):
+            self._reject(row, "expected a JSON object")
+            return None
+        try:
+            record = StoredTask(**{**value, "id": 0}).model_dump()
+        except ValidationError as e:
+            self._reject(row, "; ".join(
+                f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors()
+            ))
+            return None
+        del record["id"]
+        return record
+
+    def _collect(self, rows: List[Tuple[int, Any]]) -> List[List[dict]]:
+        batches = []
+        for row, value in rows:
+            self.rows = max(self.rows, row)
+            record = self._validate(row, value)
+            if record is None:
+                continue
+            self._batch.append(record)
+            if len(self._batch) >= self.batch_size:
+                batches.append(self._batch)
+                self._batch = []
+        return batches
+
+    def feed(self, chunk: bytes) -> List[List[dict]]:
+        return self._collect(self.parser.feed(chunk))
+
+    def finish(self) -> List[List[dict]]:
+        batches = self._collect(self.parser.close())
+        if self._batch:
+            batches.append(self._batch)
+            self._batch = []
+        return batches
+
+    def write(self, batch: List[dict]):
+        """Store one batch; a failed write rejects the whole batch."""
+        try:
+            self.imported += self.storage.import_tasks_batch(batch)
+            print(f"[IMPORT] ✓ Stored batch of {len(batch)} tasks ({self.imported} so far)")
+        except Exception as e:
+            print(f"[IMPORT] ✗ Batch write failed: {e}")
+            self._reject(self.rows, f"batch write failed: {e}", count=len(batch))
+
+    def import_file(self, f: BinaryIO) -> dict:
+        """Import a whole binary file object, chunk by chunk."""
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            for batch in self.feed(chunk):
+                self.write(batch)
+        for batch in self.finish():
+            self.write(batch)
+        return self.report()
+
+    def report(self) -> dict:
+        elapsed = time.perf_counter() - self._started
+        return {
+            "format": self.parser.format,
+            "rows": self.rows,
+            "imported": self.imported,
+            "rejected": self.rejected,
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(self.rows / elapsed) if elapsed else 0,
+            "errors": self.errors,
+            "errors_truncated": self.rejected > len(self.errors)
+        }
+
+
+if __name__ == "__main__":
+    # Usage: python -m app.services.task_importer history.jsonl [--batch-size 5000]
+    # Writes to the backend configured for the app (STORAGE_BACKEND etc. / .env).
+    import argparse
+    from app.config import get_settings
+    from app.services.storage_factory import create_storage
+
+    parser = argparse.ArgumentParser(description="Bulk import historical tasks (JSONL or JSON array).")
+    parser.add_argument("file")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    importer = TaskImporter(create_storage(get_settings()), args.batch_size)
+    with open(args.file, "rb") as f:
+        result = importer.import_file(f)
+
+    for error in result["errors"]:
+        print(f"[IMPORT] Row {error['row']}: {error['error']}")
+    print(
+        f"[IMPORT] {result['imported']} imported, {result['rejected']} rejected "
+        f"out of {result['rows']} rows in {result['elapsed_seconds']}s ({result['rows_per_second']} rows/s)"
+    )
\ No newline at end of file
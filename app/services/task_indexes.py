@@ -0,0 +1,90 @@
+"""
+Secondary hash indexes over stored tasks.
+Maps field values to task ids so filtered reads don't scan the store.
+"""
+from typing import Dict, Iterable, Optional, Set
+
+
+class SecondaryIndexes:
+    """
+    One hash index per filterable field: value → set of task ids.
+    Lookups are case-insensitive for string values, except note ids,
+    which match exactly like the SQLite backend does.
+    """
+
+    # Query parameter name → stored field
+    FIELDS = {
+        "note_id": "source_note_id",
+        "owner": "owner_mapped",
+        "priority": "priority",
+        "category": "category",
+        "risk_level": "risk_level",
+        "status": "status",
+    }
+
+    # Fields whose values are compared as given, not casefolded
+    EXACT = frozenset({"source_note_id"})
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self._indexes: Dict[str, Dict[object, Set[int]]] = {field: {} for field in self.FIELDS.values()}
+
+    @classmethod
+    def from_tasks(cls, tasks: Iterable[dict]) -> "SecondaryIndexes":
+        indexes = cls()
+        for task in tasks:
+            indexes.add(task)
+        return indexes
+
+    @classmethod
+    def _key(cls, field: str, value):
+        if field in cls.EXACT or not isinstance(value, str):
+            return value
+        return value.casefold()
+
+    def add(self, task: dict):
+        task_id = task["id"]
+        for field, index in self._indexes.items():
+            index.setdefault(self._key(field, task.get(field)), set()).add(task_id)
+
+    def remove(self, task: dict):
+        task_id = task["id"]
+        for field, index in self._indexes.items():
+            key = self._key(field, task.get(field))
+            ids = index.get(key)
+            if ids is None:
+                continue
+            ids.discard(task_id)
+            if not ids:
+                del index[key]
+
+    def lookup(self, **filters) -> Optional[Set[int]]:
+        """
+        Ids matching every given filter (None values are ignored).
+        Intersects smallest set first. Returns None when no filter applies,
+        meaning "everything".
+        """
+        candidates = []
+        for name, value in filters.items():
+            if value is None:
+                continue
+            if name not in self.FIELDS:
+                raise ValueError(f"Unknown filter: {name}")
+            field = self.FIELDS[name]
+            ids = self._indexes[field].get(self._key(field, value))
+            if not ids:
+                return set()
+            candidates.append(ids)
+
+        if not candidates:
+            return None
+
+        candidates.sort(key=len)
+        result = set(candidates[0])
+        for ids in candidates[1:]:
+            result &= ids
+            if not result:
+                break
+        return result
\ No newline at end of file
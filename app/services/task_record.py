@@ -0,0 +1,151 @@
+"""
+Compact in-memory task records.
+A TaskRecord holds one stored task in __slots__ instead of a dict.
+Low-cardinality fields (priority, category, ...) are kept as small
+integer codes into shared codebooks and repeated strings are interned,
+so a large store costs a fraction of the memory of plain dicts.
+Records read like dicts (record["id"], record.get(...)), so counters and
+indexes work on them unchanged; they only become dicts or StoredTask
+models at the API edge.
+"""
+import sys
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List
+from app.models import StoredTask
+from app.services.task_aggregates import TaskAggregates
+
+
+class Codebook:
+    """Interns the values of one low-cardinality field as small integer codes."""
+
+    def __init__(self):
+        self.values: List[Any] = []
+        self.codes: Dict[Any, int] = {}
+        self._lock = threading.Lock()
+
+    def code(self, value) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            with self._lock:
+                code = self.codes.get(value)
+                if code is None:
+                    code = len(self.values)
+                    self.values.append(value)
+                    self.codes[value] = code
+        return code
+
+
+# Stored field order (matches StoredTask)
+FIELDS = tuple(StoredTask.model_fields)
+
+CODEBOOKS = {
+    field: Codebook()
+    for field in ("priority", "difficulty", "category", "risk_level", "progress_estimate", "status")
+}
+
+# Values for fields missing from older records (the EnhancedTask/StoredTask
+# defaults); only "id" is required. owner_mapped falls back to owner.
+DEFAULTS = {
+    "created_at": "",
+    "task_name": "",
+    "owner": "Self",
+    "due_date": "Needs Review",
+    "predicted_deadline": None,
+    "priority": "Medium",
+    "priority_reason": "",
+    "confidence_score": 1.0,
+    "difficulty": "Medium",
+    "category": "General",
+    "has_dependency": False,
+    "dependency_info": None,
+    "risk_level": "Low",
+    "risk_description": None,
+    "progress_estimate": "Not Started",
+    "source_note_id": "",
+    "status": StoredTask.model_fields["status"].default,
+}
+
+# Repeated free-text values worth sharing between records
+INTERNED = ("owner", "owner_mapped", "due_date", "predicted_deadline", "source_note_id")
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class TaskRecord:
+    """One stored task; see the module docstring."""
+
+    __slots__ = FIELDS
+
+    def __init__(self, data: dict):
+        data = {**DEFAULTS, **data}
+        self.id = data["id"]
+        self.created_at = data["created_at"]
+        self.task_name = data["task_name"]
+        self.owner = _intern(data["owner"])
+        self.owner_mapped = _intern(data.get("owner_mapped", self.owner))
+        self.due_date = _intern(data["due_date"])
+        self.predicted_deadline = _intern(data["predicted_deadline"])
+        self.priority = CODEBOOKS["priority"].code(data["priority"])
+        self.priority_reason = data["priority_reason"]
+        self.confidence_score = data["confidence_score"]
+        self.difficulty = CODEBOOKS["difficulty"].code(data["difficulty"])
+        self.category = CODEBOOKS["category"].code(data["category"])
+        self.has_dependency = data["has_dependency"]
+        self.dependency_info = data["dependency_info"]
+        self.risk_level = CODEBOOKS["risk_level"].code(data["risk_level"])
+        self.risk_description = data["risk_description"]
+        self.progress_estimate = CODEBOOKS["progress_estimate"].code(data["progress_estimate"])
+        self.source_note_id = _intern(data["source_note_id"])
+        self.status = CODEBOOKS["status"].code(data["status"])
+
+    def __getitem__(self, field: str):
+        try:
+            value = getattr(self, field)
+        except AttributeError:
+            raise KeyError(field) from None
+        codebook = CODEBOOKS.get(field)
+        return codebook.values[value] if codebook else value
+
+    def get(self, field: str, default=None):
+        try:
+            return self[field]
+        except KeyError:
+            return default
+
+    def to_dict(self) -> dict:
+        """Plain dict in stored-field order, as written to disk and returned by the API."""
+        return {field: self[field] for field in FIELDS}
+
+    def to_model(self) -> StoredTask:
+        return StoredTask(**self.to_dict())
+
+    def __repr__(self) -> str:
+        return f"TaskRecord(id={self.id}, task_name={self.task_name!r})"
+
+
+def aggregate(records: Iterable[TaskRecord]) -> TaskAggregates:
+    """
+    Full recount of TaskAggregates over records.
+    Counts integer codes and decodes each distinct value once, instead of
+    going through record.get() per field per task.
+    """
+    records = list(records)
+    aggregates = TaskAggregates()
+    aggregates.total = len(records)
+
+    for name, (field, _) in TaskAggregates.COUNTERS.items():
+        values = CODEBOOKS[field].values
+        codes = Counter(getattr(record, field) for record in records)
+        bucket = aggregates.counts[name]
+        for code, count in codes.items():
+            value = values[code]
+            bucket[value] = bucket.get(value, 0) + count
+
+    high = CODEBOOKS["risk_level"].codes.get("High")
+    aggregates.high_risk = sum(1 for record in records if record.risk_level == high)
+    aggregates.with_dependencies = sum(1 for record in records if record.has_dependency)
+    aggregates.confidence_micros = sum(round(record.confidence_score * 1_000_000) for record in records)
+    return aggregates
\ No newline at end of file
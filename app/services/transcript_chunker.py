@@ -0,0 +1,92 @@
+"""
+Transcript chunking for long meetings.
+FEATURE: Map-reduce extraction
+Splits a transcript into chunks on speaker turns and paragraphs, with
+a little trailing context repeated at the start of the next chunk so a
+task stated across a boundary is still seen whole by one call.
+"""
+import re
+from typing import List
+
+# "Riya:", "Dr. Mehta -", "[10:32] Arjun Rao:" at the start of a line
+SPEAKER_LINE = re.compile(r"^\s*(?:\[[^\]]{1,12}\]\s*)?[A-Z][\w.' ]{0,40}\s*[:\-]\s")
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def split_segments(text: str) -> List[str]:
+    """Speaker turns and paragraphs, in order, without blank lines."""
+    segments: List[str] = []
+    current: List[str] = []
+    for line in text.splitlines():
+        if not line.strip():
+            if current:
+                segments.append("\n".join(current))
+                current = []
+            continue
+        if current and SPEAKER_LINE.match(line):
+            segments.append("\n".join(current))
+            current = []
+        current.append(line.rstrip())
+    if current:
+        segments.append("\n".join(current))
+    return segments
+
+
+def _split_oversized(segment: str, max_chars: int) -> List[str]:
+    """Break one over-long turn on sentence ends, then hard at max_chars."""
+    pieces: List[str] = []
+    current = ""
+    for sentence in SENTENCE_END.split(segment):
+        while len(sentence) > max_chars:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(sentence[:max_chars])
+            sentence = sentence[max_chars:]
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def chunk_transcript(text: str, max_chars: int, overlap_chars: int = 0) -> List[str]:
+    """
+    Pack whole segments into chunks of at most about `max_chars`.
+    Each chunk after the first starts with the last segments of the
+    previous one, up to `overlap_chars` of them. A transcript that fits
+    comes back as a single chunk.
+    """
+    if len(text) <= max_chars:
+        return [text]
+
+    segments: List[str] = []
+    for segment in split_segments(text):
+        if len(segment) > max_chars:
+            segments.extend(_split_oversized(segment, max_chars))
+        else:
+            segments.append(segment)
+
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for segment in segments:
+        if current and size + len(segment) + 2 > max_chars:
+            chunks.append("\n\n".join(current))
+            # Carry trailing context, but never a whole chunk's worth
+            carried: List[str] = []
+            carried_size = 0
+            for previous in reversed(current[1:]):
+                if carried_size + len(previous) + 2 > overlap_chars:
+                    break
+                carried.insert(0, previous)
+                carried_size += len(previous) + 2
+            current, size = carried, carried_size
+        current.append(segment)
+        size += len(segment) + 2
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
@@ -0,0 +1,176 @@
+"""
+Transcript pre-compaction before extraction.
+FEATURE: Input token reduction
+One compiled pattern strips line timestamps, bracketed annotations,
+vocal fillers, fillers set off by commas ("you know," "I mean,"),
+stutters of short function words and false starts in a single pass
+per line; a second look at each sentence drops backchannel
+boilerplate ("Okay.", "You're on mute.") and sentences the same
+speaker already said. Only real disfluencies go: "I mean it" and
+"had had" stay, another speaker repeating a sentence (often taking on
+a task) is kept, and so is a "Sure." answering a question or request.
+Speaker labels and line breaks are kept, so chunking and the rule
+engine see the same structure.
+"""
+import re
+import time
+from typing import NamedTuple
+from app.services.llm_scheduler import estimate_tokens
+
+# Rough prompt-processing cost used to estimate the latency saved per
+# removed input token, per call that receives the transcript
+PREFILL_MS_PER_1K_TOKENS = 25.0
+
+SPEAKER = re.compile(r"^[A-Z][\w.']*(?: [A-Z][\w.']*){0,2}\s*:\s+")
+# "[10:32]", "00:12:05", or a bare "10:32" only when a speaker label follows
+TIMESTAMP = re.compile(
+    r"^\s*(?:[\[(]\d{1,2}:\d{2}(?::\d{2})?(?:\.\d+)?[\])]|\d{1,2}:\d{2}:\d{2}(?:\.\d+)?"
+    r"|\d{1,2}:\d{2}(?=\s*-?\s*" + SPEAKER.pattern[1:] + r"))\s*-?\s*"
+)
+# Words that carry meaning elsewhere ("I mean it", "like this"), so only
+# removed when set off: ", you know," / "You know, ..." / "..., you know."
+SET_OFF_FILLERS = ("you know", "i mean", "basically", "literally", "actually", "kind of", "sort of", "like")
+# Short function words whose repeats are stutters; "had had" or "that that" are grammar
+STUTTER_WORDS = (
+    "i", "i'm", "i'll", "i've", "i'd", "we", "we'll", "we're", "you", "you'll", "he", "she",
+    "they", "it", "it's", "the", "a", "an", "to", "and", "but", "so"
+)
+VOCAL_FILLERS = r"u+m+|u+h+|e+r+m+|h+m+|a+h+|mm+"
+FILLERS = VOCAL_FILLERS + "|" + "|".join(SET_OFF_FILLERS)
+NOISE = re.compile(
+    r"[\[(](?i:inaudible|crosstalk|laughs?|laughter|silence|pause|music|background noise|unintelligible)[\])]"
+    # Fillers: a trailing one takes its leading comma, any other its trailing one
+    r"|(?i:,\s*(?:" + FILLERS + r")(?=\s*[.!?]|\s*$))"
+    r"|(?i:(?<![\w-])(?:" + VOCAL_FILLERS + r")(?![\w-])\s*,?)"                      # "um", "uh"
+    r"|(?i:(?:^|(?<=[.!?,]))\s*(?:" + "|".join(SET_OFF_FILLERS) + r")\s*(?:,|(?=[.!?]|$)))"
+    r"|(?i:(?<![\w-])(?P<stutter>\w{1,6})-\s+(?=(?P=stutter)))"                       # "th- the" false start
+    r"|(?i:(?<![\w'])(?P<word>" + "|".join(sorted(STUTTER_WORDS, key=len, reverse=True))
+    + r")(?:,?\s+(?P=word)(?![\w']))+)"                                                # "I I I", "the, the"
+)
+# A turn that asks something of others; a bare "Sure." answering it may be taking on a task
+REQUEST = re.compile(
+    r"\?\s*$|(?i:\b(?:can|could|would|will) (?:you|someone|somebody|anyone)\b|\bplease\b"
+    r"|\bwho(?:'s| is| can| will| wants)\b)"
+)
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+SPACES = re.compile(r"\s+(?=[,.!?])|(?<=\s)\s+")
+BOILERPLATE = re.compile(
+    r"^(?i:(?:ok(?:ay)?|yeah|yes|yep|right|sure|cool|great|got it|sounds good|mm-hmm|uh-huh|alright|all right|"
+    r"thanks?(?: you)?(?: (?:everyone|all|guys))?|hi(?: everyone| all)?|hello(?: everyone)?|"
+    r"good (?:morning|afternoon|evening)(?: everyone)?|can you (?:all )?hear me|"
+    r"(?:you're|you are) on mute|let me share my screen|can you see my screen|"
+    r"recording (?:started|stopped)|i think that's it)[\s,.!?]*)+$"
+)
+
+
+class CompactionReport(NamedTuple):
+    chars_before: int
+    chars_after: int
+    tokens_before: int
+    tokens_after: int
+    compaction_ms: float
+    est_latency_saved_ms: float
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+    def as_dict(self) -> dict:
+        return {**self._asdict(), "tokens_saved": self.tokens_saved}
+
+
+def _replace_noise(match: re.Match) -> str:
+    # A repeated word keeps one copy; anything else leaves a space
+    return match.group("word") or " "
+
+
+def compact_text(text: str) -> str:
+    """Noise, fillers and disfluencies removed from one line's text."""
+    return SPACES.sub("", NOISE.sub(_replace_noise, text)).strip(" ,")
+
+
+class TranscriptCompactor:
+    """
+    Compacts transcripts and keeps running totals for /health.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.notes = 0
+        self.tokens_before = 0
+        self.tokens_after = 0
+        self.seconds = 0.0
+        self.est_latency_saved_ms = 0.0
+
+    @staticmethod
+    def compact(text: str) -> str:
+        lines = []
+        seen = set()
+        speaker = ""  # unlabeled lines continue the last speaker
+        previous = ("", "")  # speaker and text of the last line kept
+        for raw_line in text.splitlines():
+            line = TIMESTAMP.sub("", raw_line)
+            match = SPEAKER.match(line)
+            label, body = (match.group(), line[match.end():]) if match else ("", line)
+            if label:
+                speaker = label.rstrip(": \t").lower()
+            answers_request = speaker != previous[0] and REQUEST.search(previous[1])
+            sentences = []
+            for sentence in SENTENCE_END.split(compact_text(body)):
+                sentence = sentence.strip(" ,")
+                if not sentence.strip(".!?"):
+                    continue
+                if BOILERPLATE.match(sentence) and not (answers_request and not sentences):
+                    continue
+                fingerprint = (speaker, sentence.lower().rstrip(".!?"))
+                if len(fingerprint[1].split()) >= 3:
+                    if fingerprint in seen:
+                        continue
+                    seen.add(fingerprint)
+                sentences.append(sentence[0].upper() + sentence[1:])
+            if sentences:
+                lines.append(label + " ".join(sentences))
+                previous = (speaker, lines[-1])
+            elif not raw_line.strip() and lines and lines[-1]:
+                lines.append("")  # keep paragraph breaks for chunking
+        return "\n".join(lines).strip()
+
+    def run(self, text: str, calls_per_note: int = 2):
+        """
+        (compacted text, CompactionReport); the text is unchanged when disabled.
+        `calls_per_note` is how many LLM calls receive the transcript, used
+        only for the latency estimate.
+        """
+        started = time.perf_counter()
+        compacted = self.compact(text) if self.enabled else text
+        # Never hand the LLM an empty note because everything looked like noise
+        if not compacted:
+            compacted = text
+        seconds = time.perf_counter() - started
+        tokens_before, tokens_after = estimate_tokens(text), estimate_tokens(compacted)
+        saved_ms = (tokens_before - tokens_after) * calls_per_note * PREFILL_MS_PER_1K_TOKENS / 1000
+        report = CompactionReport(
+            chars_before=len(text),
+            chars_after=len(compacted),
+            tokens_before=tokens_before,
+            tokens_after=tokens_after,
+            compaction_ms=round(seconds * 1000, 3),
+            est_latency_saved_ms=round(saved_ms - seconds * 1000, 1)
+        )
+        self.notes += 1
+        self.tokens_before += tokens_before
+        self.tokens_after += tokens_after
+        self.seconds += seconds
+        self.est_latency_saved_ms += report.est_latency_saved_ms
+        return compacted, report
+
+    def stats(self) -> dict:
+        saved = self.tokens_before - self.tokens_after
+        return {
+            "enabled": self.enabled,
+            "notes": self.notes,
+            "tokens_saved": saved,
+            "token_reduction": round(saved / self.tokens_before, 3) if self.tokens_before else None,
+            "avg_compaction_ms": round(self.seconds / self.notes * 1000, 3) if self.notes else None,
+            "est_latency_saved_ms": round(self.est_latency_saved_ms, 1)
+        }
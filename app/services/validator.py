@@ -5,10 +5,26 @@ FEATURES: Data validation, auto-correction, cleanup
 from app.models import ExtractedTask
 import re
 
+# "kind of"/"sort of" only as hedges ("we kind of need"): not after a
+# determiner ("what kind of database", "the sort of chart") and not at
+# the start, where "Sort of ..." is more likely the verb
+HEDGE_PATTERN = (
+    r"(?<!\bwhat )(?<!\bthe )(?<!\ba )(?<!\bany )(?<!\bsome )(?<!\bthis )(?<!\bthat )"
+    r"(?<=[\w,] )(?:kind|sort) of(?![\w-])"
+)
+
 class TaskValidator:
     
     VALID_PRIORITIES = ["High", "Medium", "Low"]
-    FILLER_WORDS = ["um", "uh", "like", "so", "basically", "actually", "you know", "kind of", "sort of"]
+    FILLER_WORDS = ["um", "uh", "like", "so", "basically", "actually", "you know"]
+    # Longest first, so "you know" wins over any shorter overlap; hedges need their guards.
+    # Hyphens count as part of the word, so "like-for-like" and "so-called" stay intact
+    FILLER_PATTERN = re.compile(
+        r"(?:,\s*)?(?<![\w-])(?:" + "|".join(re.escape(w) for w in sorted(FILLER_WORDS, key=len, reverse=True))
+        + r")(?![\w-]),?"
+        r"|" + HEDGE_PATTERN,
+        re.IGNORECASE
+    )
     
     # Common name misspellings
     NAME_CORRECTIONS = {
@@ -28,16 +44,10 @@ class TaskValidator:
         if not text:
             return ""
         
-        words = text.split()
-        cleaned_words = [
-            word for word in words 
-            if word.lower() not in TaskValidator.FILLER_WORDS
-        ]
-        
-        result = " ".join(cleaned_words).strip()
+        result = TaskValidator.FILLER_PATTERN.sub(" ", text)
         
         # Remove extra spaces
-        result = re.sub(r'\s+', ' ', result)
+        result = re.sub(r'\s+', ' ', result).strip(" ,")
         
         return result if result else text
     
@@ -0,0 +1,77 @@
+"""
+JSON codec shared by storage and API responses.
+Uses orjson or msgspec when installed and falls back to the stdlib
+json module, so nothing extra is required to run the service.
+Every codec encodes to UTF-8 bytes and raises ValueError on bad input.
+"""
+import json
+from typing import Any, Callable, Dict, NamedTuple, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+class Codec(NamedTuple):
+    name: str
+    dumps: Callable[[Any], bytes]           # compact
+    dumps_pretty: Callable[[Any], bytes]    # 2-space indent, same layout as json.dumps(indent=2)
+    loads: Callable[[Union[bytes, str]], Any]
+
+
+def _stdlib_codec() -> Codec:
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def dumps_pretty(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+    return Codec("json", dumps, dumps_pretty, json.loads)
+
+
+def _orjson_codec() -> Codec:
+    def dumps_pretty(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    # orjson.JSONDecodeError already subclasses ValueError
+    return Codec("orjson", orjson.dumps, dumps_pretty, orjson.loads)
+
+
+def _msgspec_codec() -> Codec:
+    encoder = msgspec.json.Encoder()
+    decoder = msgspec.json.Decoder()
+
+    def dumps_pretty(obj: Any) -> bytes:
+        return msgspec.json.format(encoder.encode(obj), indent=2)
+
+    def loads(data: Union[bytes, str]) -> Any:
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    return Codec("msgspec", encoder.encode, dumps_pretty, loads)
+
+
+def available_codecs() -> Dict[str, Codec]:
+    """All usable codecs, fastest first."""
+    codecs = {}
+    if orjson:
+        codecs["orjson"] = _orjson_codec()
+    if msgspec:
+        codecs["msgspec"] = _msgspec_codec()
+    codecs["json"] = _stdlib_codec()
+    return codecs
+
+
+codec = next(iter(available_codecs().values()))
+
+dumps = codec.dumps
+dumps_pretty = codec.dumps_pretty
+loads = codec.loads
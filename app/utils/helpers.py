@@ -2,26 +2,24 @@
 Utility helper functions
 """
 from typing import List
-from app.models import StoredTask
 
-def format_task_timeline(tasks: List[StoredTask]) -> dict:
+def format_task_timeline(tasks: List[dict]) -> dict:
     """
     Format tasks into timeline structure.
     FEATURE: Task Timeline Visualizer
+    Expects stored task dicts already in deadline order (storage keeps a
+    deadline index, see get_timeline()), so nothing is sorted here.
     """
-    timeline = []
-    
-    for task in tasks:
-        if task.predicted_deadline:
-            timeline.append({
-                "task": task.task_name,
-                "due": task.predicted_deadline,
-                "priority": task.priority,
-                "owner": task.owner_mapped
-            })
-    
-    # Sort by date
-    timeline.sort(key=lambda x: x["due"])
+    timeline = [
+        {
+            "task": task["task_name"],
+            "due": task["predicted_deadline"],
+            "priority": task["priority"],
+            "owner": task["owner_mapped"]
+        }
+        for task in tasks
+        if task["predicted_deadline"]
+    ]
     
     return {
         "timeline": timeline,
@@ -0,0 +1,138 @@
+"""
+Idempotent processing of meeting notes.
+Results are keyed by note_id plus a hash of the note text: an exact
+replay gets the stored result back, and concurrent requests for the
+same note share one in-flight run instead of each starting their own.
+State is per process, so replays are recognised by the worker that
+handled the original request. SingleFlight on its own (no stored
+results) coalesces identical in-flight LLM calls.
+"""
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Generic, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def idempotency_key(note_id: str, content: str) -> str:
+    """note_id plus a content hash, so an edited note is processed again."""
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    return f"{note_id}:{digest}"
+
+
+class SingleFlight(Generic[T]):
+    """
+    At most one run per key at a time: callers arriving while a run is in
+    flight await the same task instead of starting their own.
+    Only used from the event loop, so no locking is needed.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[str, "asyncio.Task[T]"] = {}
+        self.runs = 0
+        self.coalesced = 0
+
+    def _finished(self, key: str, task: "asyncio.Task[T]"):
+        self._in_flight.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # retrieved, even if every caller has gone
+
+    async def run(self, key: str, factory: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """
+        Result for `key` and whether it came from another caller's run.
+        A new run is a separate task awaited through asyncio.shield, so a
+        caller that is cancelled doesn't cancel it for the others.
+        """
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task), True
+
+        self.runs += 1
+        task = asyncio.ensure_future(factory())
+        self._in_flight[key] = task
+        task.add_done_callback(lambda done: self._finished(key, done))
+        return await asyncio.shield(task), False
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._in_flight),
+            "runs": self.runs,
+            "coalesced": self.coalesced
+        }
+
+
+class IdempotencyCache(SingleFlight[T]):
+    """
+    SingleFlight that also keeps completed results (bounded LRU with a
+    TTL), so a later replay gets the same result without a run.
+    Failed runs are not stored, and neither are results `keep` rejects
+    (partial or degraded ones), so a retry after either runs again.
+    Stats are exposed on /health.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: int = 86400,
+        keep: Optional[Callable[[T], bool]] = None
+    ):
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.keep = keep
+        self._results: "OrderedDict[str, Tuple[float, T]]" = OrderedDict()
+        self.replays = 0
+        self.not_kept = 0
+
+    def _stored(self, key: str):
+        entry = self._results.get(key)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if self.ttl_seconds > 0 and time.time() - stored_at >= self.ttl_seconds:
+            del self._results[key]
+            return None
+        self._results.move_to_end(key)
+        return entry
+
+    def _store(self, key: str, result: T):
+        if self.max_entries <= 0:
+            return
+        self._results[key] = (time.time(), result)
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+    def _finished(self, key: str, task: "asyncio.Task[T]"):
+        super()._finished(key, task)
+        if task.cancelled() or task.exception() is not None:
+            return
+        result = task.result()
+        if self.keep is not None and not self.keep(result):
+            self.not_kept += 1
+            return
+        self._store(key, result)
+
+    async def run(self, key: str, factory: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """
+        Result for `key` and whether it was reused rather than computed.
+        A run whose callers all disconnect still finishes, and its result
+        is stored for the next retry (if kept).
+        """
+        entry = self._stored(key)
+        if entry is not None:
+            self.replays += 1
+            return entry[1], True
+        return await super().run(key, factory)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._results),
+            "max_entries": self.max_entries,
+            **super().stats(),
+            "replays": self.replays,
+            "not_kept": self.not_kept
+        }
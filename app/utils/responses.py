@@ -0,0 +1,16 @@
+"""
+API response classes built on the shared JSON codec (app.utils.codec).
+Kept apart from the codec so storage code does not import FastAPI.
+"""
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from app.utils import codec
+
+
+class CodecJSONResponse(JSONResponse):
+    """JSONResponse rendered with the fastest available codec."""
+
+    def render(self, content: Any) -> bytes:
+        return codec.dumps(content)
@@ -0,0 +1,91 @@
+"""
+Encode/decode throughput of the JSON codecs on synthetic task stores.
+
+Usage:
+    python scripts/bench_codec.py                    # 10k, 100k and 1M tasks
+    python scripts/bench_codec.py --sizes 10000 50000
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.utils.codec import available_codecs  # noqa: E402
+
+PRIORITIES = ["High", "Medium", "Low"]
+CATEGORIES = ["Engineering", "Design", "Marketing", "Sales", "Operations", "General"]
+DIFFICULTIES = ["Easy", "Medium", "Hard"]
+RISKS = ["Low", "Medium", "High"]
+
+
+def make_tasks(count: int) -> list:
+    """Records shaped like the ones JSONStorage writes."""
+    rng = random.Random(42)
+    tasks = []
+    for task_id in range(1, count + 1):
+        has_dependency = rng.random() < 0.2
+        tasks.append({
+            "id": task_id,
+            "created_at": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T10:{rng.randint(0, 59):02d}:00.000000",
+            "task_name": f"Follow up on item {task_id} with the team",
+            "owner": rng.choice(["Riya Kumar", "Arjun Patel", "Sara Lee", "Unassigned"]),
+            "owner_mapped": rng.choice(["Riya Kumar", "Arjun Patel", "Sara Lee", "Unassigned"]),
+            "due_date": rng.choice(["Friday", "Next week", "Not specified", "EOD"]),
+            "predicted_deadline": f"2025-12-{rng.randint(1, 28):02d}",
+            "priority": rng.choice(PRIORITIES),
+            "priority_reason": f"Confidence: {rng.random():.2f}",
+            "confidence_score": round(rng.random(), 2),
+            "difficulty": rng.choice(DIFFICULTIES),
+            "category": rng.choice(CATEGORIES),
+            "has_dependency": has_dependency,
+            "dependency_info": "Waiting on design review" if has_dependency else None,
+            "risk_level": rng.choice(RISKS),
+            "risk_description": None,
+            "progress_estimate": "0%",
+            "source_note_id": f"note_{task_id // 5}",
+            "status": "pending"
+        })
+    return tasks
+
+
+def best_of(runs: int, fn) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--runs", type=int, default=3, help="best of N runs per measurement")
+    args = parser.parse_args()
+
+    codecs = available_codecs()
+    print(f"Codecs available: {', '.join(codecs)}\n")
+    print(f"{'tasks':>9}  {'codec':<8} {'format':<7} {'size MB':>8} {'encode ms':>10} {'decode ms':>10} {'enc MB/s':>9} {'dec MB/s':>9}")
+
+    for size in args.sizes:
+        tasks = make_tasks(size)
+        for codec in codecs.values():
+            for label, encode in (("pretty", codec.dumps_pretty), ("compact", codec.dumps)):
+                data = encode(tasks)
+                assert codec.loads(data) == tasks
+                encode_s = best_of(args.runs, lambda: encode(tasks))
+                decode_s = best_of(args.runs, lambda: codec.loads(data))
+                megabytes = len(data) / 1_000_000
+                print(
+                    f"{size:>9}  {codec.name:<8} {label:<7} {megabytes:>8.1f} "
+                    f"{encode_s * 1000:>10.1f} {decode_s * 1000:>10.1f} "
+                    f"{megabytes / encode_s:>9.0f} {megabytes / decode_s:>9.0f}"
+                )
+        print()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
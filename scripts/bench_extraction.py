@@ -0,0 +1,68 @@
+"""
+Per-note latency of the offline rule-based extractor on synthetic meetings.
+Hermetic: no API key or network needed.
+
+Usage:
+    python scripts/bench_extraction.py                   # 5, 20 and 100 turns per note
+    python scripts/bench_extraction.py --turns 10 50 --notes 2000
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.rule_extractor import RuleBasedExtractor  # noqa: E402
+
+SPEAKERS = ["Riya", "Arjun", "Sarah", "Mike", "John"]
+ACTIONS = [
+    "{owner} will send the client deck by {when}.",
+    "I'll update the release notes {when}.",
+    "{owner}, can you review the API changes before {when}?",
+    "We need to fix the login bug {when}, it's urgent.",
+    "Action item: schedule the design review for {when}",
+]
+CHATTER = [
+    "We decided to go with Postgres for the new service.",
+    "The analytics migration is blocked on the data team.",
+    "There is a risk the launch might slip a week.",
+    "Overall the sprint went well and the demo landed.",
+]
+WHEN = ["Friday", "tomorrow", "next week", "EOD", "Dec 15", "Monday"]
+
+
+def make_note(rng: random.Random, turns: int) -> str:
+    lines = []
+    for _ in range(turns):
+        template = rng.choice(ACTIONS) if rng.random() < 0.5 else rng.choice(CHATTER)
+        text = template.format(owner=rng.choice(SPEAKERS), when=rng.choice(WHEN))
+        lines.append(f"{rng.choice(SPEAKERS)}: {text}")
+    return "\n".join(lines)
+
+
+def bench(turns: int, notes: int):
+    rng = random.Random(42)
+    corpus = [make_note(rng, turns) for _ in range(100)]
+    tasks = 0
+    started = time.perf_counter()
+    for i in range(notes):
+        found, _ = RuleBasedExtractor.analyze(corpus[i % len(corpus)])
+        tasks += len(found)
+    elapsed = time.perf_counter() - started
+    chars = sum(len(note) for note in corpus) // len(corpus)
+    print(f"{turns:>5} turns (~{chars:>6} chars): {elapsed / notes * 1000:8.3f} ms/note, {tasks / notes:5.1f} tasks/note")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--turns", type=int, nargs="+", default=[5, 20, 100])
+    parser.add_argument("--notes", type=int, default=1000, help="notes extracted per size")
+    args = parser.parse_args()
+    for turns in args.turns:
+        bench(turns, args.notes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Exercise LLMScheduler against a local stub of the OpenAI chat API.
+The stub answers 429 (with Retry-After) on request, so retries, the
+shared pause, the concurrency cap and the circuit breaker can be
+checked without an API key or network access. Exits non-zero on failure.
+
+Usage:
+    python scripts/check_llm_scheduler.py
+"""
+import asyncio
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from openai import AsyncOpenAI  # noqa: E402
+from app.services.llm_scheduler import LLMScheduler, LLMUnavailableError, with_deadline  # noqa: E402
+
+COMPLETION = {
+    "id": "chatcmpl-stub",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4o-mini",
+    "choices": [{
+        "index": 0,
+        "finish_reason": "stop",
+        "message": {"role": "assistant", "content": "{\"tasks\": []}"}
+    }],
+    "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}
+}
+
+
+class StubState:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset(fail_first=0)
+
+    def reset(self, fail_first: int, retry_after: str = "0.2", delay: float = 0.0):
+        with self.lock:
+            self.fail_first = fail_first   # -1 answers 429 forever
+            self.retry_after = retry_after
+            self.delay = delay
+            self.requests = 0
+            self.active = 0
+            self.max_active = 0
+
+
+state = StubState()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with state.lock:
+            state.requests += 1
+            limited = state.fail_first < 0 or state.requests <= state.fail_first
+            state.active += 1
+            state.max_active = max(state.max_active, state.active)
+        try:
+            time.sleep(state.delay)
+            if limited:
+                body = json.dumps({"error": {"message": "Rate limit reached", "type": "requests"}}).encode()
+                self.send_response(429)
+                self.send_header("Retry-After", state.retry_after)
+            else:
+                body = json.dumps(COMPLETION).encode()
+                self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with state.lock:
+                state.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+def complete(client: AsyncOpenAI):
+    return lambda: client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[{"role": "user", "content": "hi"}]
+    )
+
+
+async def check_retries_honor_retry_after(client: AsyncOpenAI):
+    state.reset(fail_first=2, retry_after="0.3")
+    scheduler = LLMScheduler(max_retries=4, backoff_max_seconds=5)
+    started = time.monotonic()
+    await scheduler.run(10, complete(client))
+    elapsed = time.monotonic() - started
+    assert state.requests == 3, state.requests
+    assert scheduler.retries == 2 and scheduler.rate_limited == 2, scheduler.stats()
+    assert elapsed >= 0.6, f"Retry-After not honored ({elapsed:.2f}s)"
+    print(f"  retries honor Retry-After: 2 retries in {elapsed:.2f}s")
+
+
+async def check_gives_up_and_breaker_opens(client: AsyncOpenAI):
+    state.reset(fail_first=-1, retry_after="0.05")
+    scheduler = LLMScheduler(max_retries=2, breaker_threshold=3, breaker_reset_seconds=60)
+    try:
+        await scheduler.run(10, complete(client))
+        raise AssertionError("expected LLMUnavailableError")
+    except LLMUnavailableError:
+        pass
+    assert state.requests == 3, state.requests
+    assert scheduler.breaker.state == "open", scheduler.stats()
+
+    try:
+        await scheduler.run(10, complete(client))
+        raise AssertionError("expected the open breaker to fail fast")
+    except LLMUnavailableError as e:
+        assert e.retry_after and e.retry_after > 0
+    assert state.requests == 3, "open breaker still sent a request"
+    print("  gives up after max_retries, then the open breaker fails fast")
+
+
+async def check_deadline_bounds_retries(client: AsyncOpenAI):
+    state.reset(fail_first=-1, retry_after="1")
+    scheduler = LLMScheduler(max_retries=10, backoff_max_seconds=30)
+    started = time.monotonic()
+    try:
+        await with_deadline(started + 1.5, scheduler.run(10, complete(client)))
+        raise AssertionError("expected LLMUnavailableError")
+    except LLMUnavailableError as e:
+        assert e.retry_after == 1.0, e.retry_after
+    elapsed = time.monotonic() - started
+    assert elapsed < 1.5, f"retried past the deadline ({elapsed:.2f}s)"
+    assert state.requests == 2, state.requests
+    print(f"  deadline bounds retries: gave up after {state.requests} attempts in {elapsed:.2f}s")
+
+
+async def check_deadline_bounds_budget_wait(client: AsyncOpenAI):
+    state.reset(fail_first=0)
+    scheduler = LLMScheduler(requests_per_minute=60)  # 1 per second
+    scheduler.requests.available = 0.0
+    started = time.monotonic()
+    try:
+        await with_deadline(started + 0.5, scheduler.run(10, complete(client)))
+        raise AssertionError("expected LLMUnavailableError")
+    except LLMUnavailableError as e:
+        assert e.retry_after and e.retry_after > 0.5, e.retry_after
+    elapsed = time.monotonic() - started
+    assert elapsed < 0.1, f"waited for budget past the deadline ({elapsed:.2f}s)"
+    assert state.requests == 0, state.requests
+    print(f"  deadline bounds budget waits: failed fast in {elapsed:.3f}s")
+
+
+async def check_concurrency_cap(client: AsyncOpenAI):
+    state.reset(fail_first=0, delay=0.1)
+    scheduler = LLMScheduler(max_concurrency=3)
+    await asyncio.gather(*(scheduler.run(10, complete(client)) for _ in range(12)))
+    assert state.requests == 12, state.requests
+    assert state.max_active <= 3, f"{state.max_active} requests in flight"
+    print(f"  concurrency cap holds: at most {state.max_active} in flight")
+
+
+async def check_request_budget(client: AsyncOpenAI):
+    state.reset(fail_first=0)
+    scheduler = LLMScheduler(requests_per_minute=120)  # 2 per second, burst of 120
+    scheduler.requests.available = 1.0
+    started = time.monotonic()
+    await asyncio.gather(*(scheduler.run(10, complete(client)) for _ in range(3)))
+    elapsed = time.monotonic() - started
+    assert elapsed >= 0.9, f"request budget not enforced ({elapsed:.2f}s)"
+    print(f"  request bucket throttles: 3 calls with 1 in budget took {elapsed:.2f}s")
+
+
+async def main() -> int:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = AsyncOpenAI(
+        api_key="stub",
+        base_url=f"http://127.0.0.1:{server.server_port}/v1",
+        max_retries=0
+    )
+    checks = [
+        check_retries_honor_retry_after,
+        check_gives_up_and_breaker_opens,
+        check_deadline_bounds_retries,
+        check_deadline_bounds_budget_wait,
+        check_concurrency_cap,
+        check_request_budget,
+    ]
+    failed = 0
+    try:
+        for check in checks:
+            try:
+                await check(client)
+            except AssertionError as e:
+                failed += 1
+                print(f"  FAILED {check.__name__}: {e}")
+    finally:
+        await client.close()
+        server.shutdown()
+    print(f"{len(checks) - failed}/{len(checks)} checks passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
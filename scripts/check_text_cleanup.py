@@ -0,0 +1,136 @@
+"""
+Check the text cleanup rules: TaskValidator.clean_text on task names,
+and transcript compaction, which must only drop real disfluencies and
+so leave the extracted tasks unchanged.
+Hermetic: no API key or network needed. Exits non-zero on failure.
+
+Usage:
+    python scripts/check_text_cleanup.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.rule_extractor import RuleBasedExtractor  # noqa: E402
+from app.services.transcript_compactor import TranscriptCompactor, compact_text  # noqa: E402
+from app.services.validator import TaskValidator  # noqa: E402
+
+# (task name, expected after clean_text)
+CLEAN_TEXT_CASES = [
+    ("Um, like, update the onboarding doc", "update the onboarding doc"),
+    ("So, basically, send the deck, you know", "send the deck"),
+    ("We kind of need to fix the build", "We need to fix the build"),
+    # Hyphenated words are not fillers
+    ("Like-for-like comparison of costs", "Like-for-like comparison of costs"),
+    ("Review the so-called quick wins", "Review the so-called quick wins"),
+    ("Check the kind-of-done items", "Check the kind-of-done items"),
+    ("Ship the uh-oh fix", "Ship the uh-oh fix"),
+    # "kind of"/"sort of" after a determiner or leading the name
+    ("Decide what kind of database to use", "Decide what kind of database to use"),
+    ("Pick the kind of chart for the deck", "Pick the kind of chart for the deck"),
+    ("Sort of the list by date", "Sort of the list by date"),
+]
+
+# (line, expected after compact_text)
+COMPACT_TEXT_CASES = [
+    ("Okay, um, can everyone hear me?", "Okay, can everyone hear me?"),
+    ("I'll I'll update the notes", "I'll update the notes"),
+    ("I I I think the the build is red", "I think the build is red"),
+    ("Check the th- the budget sheet", "Check the the budget sheet"),
+    ("So, basically, we ship Friday, you know.", "So, we ship Friday."),
+    # Not disfluencies: emphasis, grammatical repeats, hyphenated words
+    ("I mean it, so do so now.", "I mean it, so do so now."),
+    ("We had had enough delays.", "We had had enough delays."),
+    ("That that is the plan.", "That that is the plan."),
+    ("Mm-hmm, uh-huh, like-for-like numbers.", "Mm-hmm, uh-huh, like-for-like numbers."),
+    ("Decide what kind of database to use.", "Decide what kind of database to use."),
+]
+
+# (transcript, expected after TranscriptCompactor.compact)
+COMPACT_CASES = [
+    # "Sure." accepting a request is kept; a later "Thanks." is not
+    (
+        "Riya: Can you take the client deck, Arjun?\nArjun: Sure.\nRiya: Thanks.",
+        "Riya: Can you take the client deck, Arjun?\nArjun: Sure.",
+    ),
+    (
+        "Arjun: I'll send the deck.\nRiya: Okay.\nMike: Sounds good.",
+        "Arjun: I'll send the deck.",
+    ),
+]
+
+# Notes whose rule-extracted tasks must be the same with and without compaction
+EQUIVALENCE_NOTES = [
+    """[00:01] Riya: Okay, um, can everyone hear me?
+[00:02] Arjun: Yeah.
+[00:05] Riya: So, um, Arjun will send the client deck by Friday.
+[00:09] Sarah: I mean it, we need to fix the login bug today, it's urgent.
+[00:11] Mike: Uh, Mike will review the API changes by next week.
+[00:12] Mike: Mike will review the API changes by next week.
+[00:14] Riya: (crosstalk) Thanks, everyone.""",
+    """Riya: Can you schedule the design review for Monday, Sarah?
+Sarah: Sure.
+John: We had had enough delays, so John will book the venue by Dec 15.
+Mike: Basically, I'll draft the kind of report the board wants by Friday.
+Arjun: Uh-huh.
+Arjun: Action item: the budget sheet needs an update by EOD.""",
+]
+
+
+def check_compact_text() -> int:
+    failed = 0
+    for text, expected in COMPACT_TEXT_CASES:
+        compacted = compact_text(text)
+        if compacted != expected:
+            failed += 1
+            print(f"  FAILED compact_text({text!r}) = {compacted!r}, expected {expected!r}")
+    for text, expected in COMPACT_CASES:
+        compacted = TranscriptCompactor.compact(text)
+        if compacted != expected:
+            failed += 1
+            print(f"  FAILED compact({text!r}) = {compacted!r}, expected {expected!r}")
+    total = len(COMPACT_TEXT_CASES) + len(COMPACT_CASES)
+    print(f"  compaction: {total - failed}/{total} cases")
+    return failed
+
+
+def _extracted(text: str) -> list:
+    tasks, _ = RuleBasedExtractor.analyze(text)
+    return [
+        (task.task_name, task.owner, task.due_date, task.priority)
+        for task in TaskValidator.validate_and_filter(tasks)
+    ]
+
+
+def check_compaction_keeps_tasks() -> int:
+    failed = 0
+    for note in EQUIVALENCE_NOTES:
+        compacted = TranscriptCompactor.compact(note)
+        raw_tasks, compacted_tasks = _extracted(note), _extracted(compacted)
+        if not raw_tasks or raw_tasks != compacted_tasks:
+            failed += 1
+            print(f"  FAILED tasks differ after compaction:\n    raw:       {raw_tasks}\n    compacted: {compacted_tasks}")
+    print(f"  same tasks after compaction: {len(EQUIVALENCE_NOTES) - failed}/{len(EQUIVALENCE_NOTES)} notes")
+    return failed
+
+
+def check_clean_text() -> int:
+    failed = 0
+    for text, expected in CLEAN_TEXT_CASES:
+        cleaned = TaskValidator.clean_text(text)
+        if cleaned != expected:
+            failed += 1
+            print(f"  FAILED clean_text({text!r}) = {cleaned!r}, expected {expected!r}")
+    print(f"  clean_text: {len(CLEAN_TEXT_CASES) - failed}/{len(CLEAN_TEXT_CASES)} cases")
+    return failed
+
+
+def main() -> int:
+    failed = check_clean_text() + check_compact_text() + check_compaction_keeps_tasks()
+    print("all checks passed" if not failed else f"{failed} failures")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())